@@ -0,0 +1,115 @@
+"""
+Бенчмарк зашифрованного журнала финансов (LedgerJournal) на 100 тыс. операций:
+  - открытие: вывод ключа (scrypt) и проверка пароля;
+  - полное чтение: потоковая расшифровка всех блоков в Ledger —
+    для журнала из одиночных блоков (каждая операция добавлялась отдельно)
+    и после compact() (блоки по COMPACT_BLOCK_SIZE операций);
+  - FinanceBook.open() журнала из одиночных блоков: первое открытие сворачивает
+    его (needs_compaction), второе читает уже крупные блоки;
+  - добавление одной операции (блок + fsync) против перешифровки всего файла.
+Нужен пакет cryptography.
+
+Запуск из корня проекта:
+    python benchmarks/bench_finance_journal.py [--count 100000] [--appends 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.modules.finance.finance_journal import (
+    COMPACT_BLOCK_SIZE,
+    FinanceBook,
+    LedgerJournal,
+    _aead,
+    encode_transactions,
+)
+from src.modules.finance.finance_ledger import Ledger, Transaction
+
+PASSWORD = "benchmark password"
+_ACCOUNTS = ("Карта", "Наличные", "Вклад")
+_CATEGORIES = ("Продукты", "Транспорт", "Кафе", "Связь", "Зарплата", "Здоровье", "Дом", "Подарки")
+
+
+def _ledger(n: int) -> Ledger:
+    ledger = Ledger()
+    day0 = date(2020, 1, 1)
+    for i in range(n):
+        description = "" if i % 4 else f"Покупка №{i}"
+        ledger.add(day0 + timedelta(days=i // 40), -(i * 7919 % 500_000), _ACCOUNTS[i % 3],
+                   _CATEGORIES[i % len(_CATEGORIES)], description)
+    return ledger
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _scan(path: Path, label: str) -> None:
+    open_s, journal = _timed(lambda: LedgerJournal(path, PASSWORD))
+    ledger = Ledger()
+    scan_s, count = _timed(lambda: journal.read_into(ledger))
+    journal.close()
+    size = path.stat().st_size
+    print(f"  {label:<28} открытие {open_s * 1e3:7.1f} мс · чтение {scan_s * 1e3:7.1f} мс"
+          f" · {count:,} операций · {size / 2 ** 20:.1f} МиБ".replace(",", " "))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="LedgerJournal: открытие, добавление, полное чтение")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--appends", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    source = _ledger(args.count)
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "ledger.journal"
+        journal = LedgerJournal(path, PASSWORD)
+        print(f"операций: {args.count:,}".replace(",", " "))
+
+        # Журнал из одиночных блоков — как после добавления операций по одной
+        journal.compact(source, block_size=1)
+        journal.close()
+        _scan(path, "одиночные блоки")
+
+        for label in ("FinanceBook.open: 1-е", "FinanceBook.open: 2-е"):
+            book = FinanceBook(path.parent)
+            seconds, count = _timed(lambda: book.open(PASSWORD))
+            book.close()
+            print(f"  {label:<28} {seconds * 1e3:8.1f} мс · {count:,} операций".replace(",", " "))
+
+        journal = LedgerJournal(path, PASSWORD)
+        journal.compact(source, block_size=COMPACT_BLOCK_SIZE)
+        journal.close()
+        _scan(path, f"блоки по {COMPACT_BLOCK_SIZE}")
+
+        journal = LedgerJournal(path, PASSWORD)
+        journal.read_into(Ledger())
+        tx = Transaction(date(2024, 5, 1), -35_000, "Карта", "Кафе", "Обед")
+        latencies = []
+        for _ in range(args.appends):
+            seconds, _ = _timed(lambda: journal.append([tx]))
+            latencies.append(seconds)
+        journal.close()
+        print(f"  добавление 1 операции:      медиана {statistics.median(latencies) * 1e3:.2f} мс,"
+              f" макс. {max(latencies) * 1e3:.2f} мс (с fsync)")
+
+        # Для сравнения: шифрование всего содержимого заново при каждом сохранении
+        payload = encode_transactions(source)
+        aead = _aead(os.urandom(32))
+        seconds, _ = _timed(lambda: aead.encrypt(os.urandom(12), payload, None))
+        print(f"  перешифровка всего файла:   {seconds * 1e3:.2f} мс (без записи на диск)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+"""
+Бенчмарк движка учёта финансов (Ledger) без интерфейса:
+добавление операций, остатки по счетам и суммы по категориям за месяц и за всё время,
+остаток на дату в середине истории, изменение операции, ряд остатков за год,
+память столбцов на операцию.
+
+Запуск из корня проекта:
+    python benchmarks/bench_ledger.py [--sizes 100000 1000000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.modules.finance.finance_ledger import Ledger, Transaction
+
+_ACCOUNTS = ("Карта", "Наличные", "Вклад")
+_CATEGORIES = ("Продукты", "Транспорт", "Кафе", "Связь", "Зарплата", "Здоровье", "Дом", "Подарки")
+
+
+def _fill(n: int) -> Ledger:
+    ledger = Ledger()
+    day0 = date(2020, 1, 1)
+    for i in range(n):
+        category = _CATEGORIES[i % len(_CATEGORIES)]
+        amount = 8_000_000 if category == "Зарплата" else -(i * 7919 % 500_000)
+        ledger.add(day0 + timedelta(days=i // 40), amount, _ACCOUNTS[i % 3], category)
+    return ledger
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Ledger: добавление и агрегаты")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for n in args.sizes:
+        start = time.perf_counter()
+        ledger = _fill(n)
+        fill_s = time.perf_counter() - start
+        last = date(2020, 1, 1) + timedelta(days=(n - 1) // 40)
+        month = last.replace(day=1)
+        columns = (ledger.days, ledger.amounts, ledger.account_ids, ledger.category_ids)
+        nbytes = sum(a.itemsize * len(a) for a in columns)
+        print(f"\nопераций: {n:,}".replace(",", " "))
+        print(f"  добавление:               {fill_s / n * 1e6:8.2f} мкс/операция")
+        print(f"  остатки по счетам:        {_best(ledger.account_balances, args.repeat) * 1e3:8.2f} мс")
+        print(f"  категории, всё время:     {_best(ledger.category_totals, args.repeat) * 1e3:8.2f} мс")
+        print(f"  категории, месяц:         "
+              f"{_best(lambda: ledger.category_totals(month, last + timedelta(days=1)), args.repeat) * 1e3:8.2f} мс")
+        middle = date(2020, 1, 1) + timedelta(days=n // 80)
+        print(f"  остаток на дату:          "
+              f"{_best(lambda: ledger.balance('Карта', middle), args.repeat) * 1e6:8.2f} мкс")
+        print(f"  ряд остатков за год:      "
+              f"{_best(lambda: ledger.balance_series(last - timedelta(days=365), last), args.repeat) * 1e3:8.2f} мс")
+        rnd = random.Random(1)
+        edits = 1000
+        start = time.perf_counter()
+        for _ in range(edits):
+            tx = Transaction(middle + timedelta(days=rnd.randint(-30, 30)), -150_00, "Наличные", "Кафе")
+            ledger.update(rnd.randrange(n), tx)
+        print(f"  изменение операции:       {(time.perf_counter() - start) / edits * 1e6:8.2f} мкс")
+        print(f"  столбцы:                  {nbytes / n:8.1f} байт/операция")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+"""
+Бенчмарк представлений истории Pomodoro: время построения и память
+для 100 тыс. и 1 млн записей.
+  - прежний dataclass без __slots__ (по объекту и dict атрибутов на запись);
+  - PomodoroRecord со __slots__;
+  - RecordColumns — столбцы array, время в int64, режимы и задачи кодами.
+Исходные записи — словари, как их отдаёт хранилище; генерируются на лету,
+чтобы в замер памяти попадало только само представление.
+
+Запуск из корня проекта:
+    python benchmarks/bench_records.py [--sizes 100000 1000000]
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.modules.pomodoro.pomodoro_records import PomodoroRecord, RecordColumns
+
+
+@dataclass
+class LegacyRecord:
+    """Прежний PomodoroRecord: обычный dataclass."""
+
+    started_at: str
+    finished_at: str
+    duration_seconds: int
+    mode: str
+    task_name: str = ""
+
+
+_MODES = ("work", "short_break", "work", "short_break", "work", "long_break")
+_TASKS = ("", "Отчёт", "Код-ревью", "Почта", "Планирование")
+
+
+def _records(n: int) -> Iterator[dict]:
+    """Несколько лет истории: интервалы подряд по 30 минут, с микросекундами, как datetime.now()."""
+    t = datetime(2021, 1, 1, 9, 0, 0, 125000)
+    step = timedelta(minutes=30, microseconds=1001)
+    length = timedelta(minutes=25)
+    for i in range(n):
+        yield {
+            "started_at": t.isoformat(),
+            "finished_at": (t + length).isoformat(),
+            "duration_seconds": 1500,
+            "mode": _MODES[i % len(_MODES)],
+            "task_name": _TASKS[i % len(_TASKS)],
+        }
+        t += step
+
+
+def _legacy(n: int):
+    return [
+        LegacyRecord(
+            started_at=r["started_at"],
+            finished_at=r["finished_at"],
+            duration_seconds=r["duration_seconds"],
+            mode=r.get("mode", "work"),
+            task_name=r.get("task_name", ""),
+        )
+        for r in _records(n)
+    ]
+
+
+def _slots(n: int):
+    return [
+        PomodoroRecord(
+            started_at=r["started_at"],
+            finished_at=r["finished_at"],
+            duration_seconds=r["duration_seconds"],
+            mode=r.get("mode", "work"),
+            task_name=r.get("task_name", ""),
+        )
+        for r in _records(n)
+    ]
+
+
+def _columns(n: int):
+    return RecordColumns(_records(n))
+
+
+def _generate_only(n: int):
+    for _ in _records(n):
+        pass
+
+
+def _measure(build: Callable[[int], object], n: int) -> tuple[float, float]:
+    """
+    (секунды построения, МиБ, удерживаемые результатом). Время и память меряются
+    разными прогонами: tracemalloc сильно замедляет разбор строк времени.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = build(n)
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build(n)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, held / 2 ** 20
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="PomodoroRecord: dataclass, __slots__ и столбцы")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args(argv)
+
+    variants = (
+        ("dataclass (прежний)", _legacy),
+        ("dataclass со __slots__", _slots),
+        ("RecordColumns", _columns),
+    )
+    for n in args.sizes:
+        # Время генерации исходных словарей вычитается из времени построения
+        base_s, _ = _measure(_generate_only, n)
+        print(f"\nзаписей: {n:,}".replace(",", " "))
+        print(f"{'представление':<26} {'построение, с':>14} {'память, МиБ':>12} {'байт/запись':>12}")
+        for name, build in variants:
+            seconds, mib = _measure(build, n)
+            print(f"{name:<26} {max(0.0, seconds - base_s):14.2f} {mib:12.1f} {mib * 2 ** 20 / n:12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+"""
+Бенчмарк холодного запуска: time-to-first-frame, time-to-interactive и время
+до восстановления последнего модуля (поэтапный запуск).
+Запускает src/main.py N раз в отдельных процессах на QPA-платформе offscreen
+с профилировщиком запуска и выходом сразу после готовности окна, затем
+сводит отчёты профилировщика.
+
+Запуск из корня проекта:
+    python benchmarks/bench_startup.py [--runs 10] [--keep-config] [--json out.json]
+
+По умолчанию каждый запуск получает пустую папку настроек (XDG_CONFIG_HOME/APPDATA),
+то есть измеряется первый запуск; --keep-config — запуск с настройками пользователя.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MAIN = ROOT / "src" / "main.py"
+
+
+def _run_once(report_path: Path, config_dir: Path | None, timeout: float) -> dict:
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    env.pop("DASHBOARD_PROFILE_STARTUP", None)
+    if config_dir is not None:
+        env["XDG_CONFIG_HOME"] = str(config_dir)
+        env["APPDATA"] = str(config_dir)
+    subprocess.run(
+        [sys.executable, str(MAIN), f"--profile-startup={report_path}", "--exit-after-startup"],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        timeout=timeout,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return json.loads(report_path.read_text(encoding="utf-8"))
+
+
+def _summary(values: list[float]) -> dict:
+    return {
+        "min": min(values),
+        "median": statistics.median(values),
+        "mean": statistics.fmean(values),
+        "max": max(values),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Холодный запуск Personal Dashboard (offscreen)")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--keep-config", action="store_true", help="не подменять папку настроек")
+    parser.add_argument("--timeout", type=float, default=60.0, help="таймаут одного запуска, с")
+    parser.add_argument("--json", type=Path, help="куда сохранить сводку")
+    args = parser.parse_args(argv)
+
+    first_frame: list[float] = []
+    interactive: list[float] = []
+    restored: list[float] = []
+    phases: dict[str, list[float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.runs):
+            config_dir = None if args.keep_config else Path(tmp) / f"config_{i}"
+            report = _run_once(Path(tmp) / f"run_{i}.json", config_dir, args.timeout)
+            first_frame.append(report["marks"]["first_frame"])
+            interactive.append(report["marks"]["interactive"])
+            if "module_restored" in report["marks"]:
+                restored.append(report["marks"]["module_restored"])
+            for p in report["phases"]:
+                phases.setdefault(p["name"], []).append(p["duration_ms"])
+
+    summary = {
+        "runs": args.runs,
+        "time_to_first_frame_ms": _summary(first_frame),
+        "time_to_interactive_ms": _summary(interactive),
+        "time_to_module_restored_ms": _summary(restored) if restored else None,
+        "phases_ms": {name: _summary(v) for name, v in phases.items()},
+    }
+
+    print(f"запусков: {args.runs}, мс: {'min':>9} {'median':>9} {'mean':>9} {'max':>9}")
+    rows = [("time-to-first-frame", summary["time_to_first_frame_ms"]),
+            ("time-to-interactive", summary["time_to_interactive_ms"])]
+    if restored:
+        rows.append(("time-to-module-restored", summary["time_to_module_restored_ms"]))
+    rows += list(summary["phases_ms"].items())
+    for name, s in rows:
+        print(f"{name:<40} {s['min']:9.1f} {s['median']:9.1f} {s['mean']:9.1f} {s['max']:9.1f}")
+    if args.json:
+        args.json.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+"""
+Микробенчмарк смены состояния PomodoroWidget: работа ↔ перерыв ↔ пауза.
+Сравнивает прежний способ (setStyleSheet всей таблицы на каждую смену — разбор
+и перепроверка всего поддерева) с текущим (динамическое свойство state и
+перепроверка только затронутых виджетов).
+
+Запуск из корня проекта:
+    python benchmarks/bench_state_style.py [--switches 500]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QStandardPaths
+from PySide6.QtWidgets import QApplication
+
+# Прежние стили состояний: дописывались к базовой таблице при каждой смене
+_LEGACY_STATE_STYLES = (
+    "#pomodoroWidget { background-color: #1b3d1f; border-color: #2e7d32; }\n#modeLabel { color: #81c784; }",
+    "#pomodoroWidget { background-color: #0d2137; border-color: #1565c0; }\n#modeLabel { color: #64b5f6; }",
+    "#pomodoroWidget { background-color: #3d3d00; border-color: #ffc107; }\n#modeLabel { color: #ffc107; }",
+)
+
+_STATES = ((False, True), (False, False), (True, True))  # (paused, work)
+
+
+def _bench(app: QApplication, switches: int, step) -> float:
+    start = time.perf_counter()
+    for i in range(switches):
+        step(i)
+        app.processEvents()
+    return (time.perf_counter() - start) / switches * 1e6
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--switches", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    # Не трогаем настройки и историю пользователя
+    QStandardPaths.setTestModeEnabled(True)
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from src.modules.pomodoro.pomodoro_widget import PomodoroWidget
+
+    widget = PomodoroWidget()
+    widget.resize(420, 640)
+    widget.show()
+    app.processEvents()
+
+    def legacy(i: int) -> None:
+        widget.setStyleSheet(widget._base_styles + _LEGACY_STATE_STYLES[i % 3])
+
+    def current(i: int) -> None:
+        widget._is_paused, widget._is_work_mode = _STATES[i % 3]
+        widget._apply_state_style()
+
+    legacy_us = _bench(app, args.switches, legacy)
+    widget._set_styles()
+    current_us = _bench(app, args.switches, current)
+
+    print(f"смен состояния: {args.switches}")
+    print(f"setStyleSheet на каждую смену: {legacy_us:9.1f} мкс/смена")
+    print(f"свойство state + repolish:     {current_us:9.1f} мкс/смена")
+    if current_us > 0:
+        print(f"ускорение: x{legacy_us / current_us:.1f}")
+    widget.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""
+Проверка бюджета времени импорта (для CI): python -X importtime в отдельном
+процессе для каждого модуля из списка. Проверка падает (код возврата 1), если
+импорт дороже бюджета или тянет запрещённые модули — например, Qt в ядре
+или QtMultimedia при загрузке виджета Pomodoro.
+
+Запуск из корня проекта:
+    python benchmarks/check_import_time.py [--scale 1.0] [--runs 3]
+
+--scale умножает все бюджеты (медленные CI-машины); берётся лучший из --runs замеров.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass(frozen=True)
+class ImportBudget:
+    """Модуль, бюджет его импорта (мс) и префиксы модулей, которые он не должен загружать."""
+
+    module: str
+    budget_ms: float
+    forbidden: tuple[str, ...] = ()
+
+
+BUDGETS = (
+    # Ядро: менеджер модулей, манифесты, профилировщик — без Qt
+    ImportBudget("src.core", 60, ("PySide6",)),
+    ImportBudget("src.core.module_manager", 60, ("PySide6",)),
+    # Данные Pomodoro используются без интерфейса (CLI итогов, прогрев)
+    ImportBudget("src.modules.pomodoro.pomodoro_stats", 100, ("PySide6",)),
+    ImportBudget("src.modules.pomodoro.pomodoro_rollup", 100, ("PySide6",)),
+    # Виджет: QtWidgets нужен, QtMultimedia — только при первом звуке
+    ImportBudget("src.modules.pomodoro.pomodoro_widget", 600, ("PySide6.QtMultimedia",)),
+)
+
+
+def measure(module: str) -> tuple[float, list[str]]:
+    """Время импорта module (мс, cumulative верхнего уровня) и список загруженных модулей."""
+    env = dict(os.environ)
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+
+    total_us = 0
+    imported: list[str] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # заголовок таблицы
+        raw_name = parts[2][1:]
+        name = raw_name.strip()
+        imported.append(name)
+        # Верхний уровень: сам модуль и его родительские пакеты (src, src.core, ...)
+        is_top = raw_name == name
+        if is_top and (module == name or module.startswith(name + ".")):
+            total_us += int(parts[1])
+    return total_us / 1000, imported
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Бюджет времени импорта")
+    parser.add_argument("--scale", type=float, default=1.0, help="множитель бюджетов")
+    parser.add_argument("--runs", type=int, default=3, help="замеров на модуль (берётся лучший)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'модуль':<45} {'мс':>8} {'бюджет':>8}  результат")
+    for b in BUDGETS:
+        budget = b.budget_ms * args.scale
+        try:
+            results = [measure(b.module) for _ in range(max(1, args.runs))]
+        except RuntimeError as e:
+            print(f"{b.module:<45} {'—':>8} {budget:8.0f}  ОШИБКА: {e}")
+            failed = True
+            continue
+        best_ms = min(ms for ms, _ in results)
+        leaked = sorted({
+            name for name in results[0][1]
+            for prefix in b.forbidden
+            if name == prefix or name.startswith(prefix + ".")
+        })
+        problems = []
+        if best_ms > budget:
+            problems.append("превышен бюджет")
+        if leaked:
+            problems.append("загружены: " + ", ".join(leaked[:5]) + (" …" if len(leaked) > 5 else ""))
+        failed = failed or bool(problems)
+        print(f"{b.module:<45} {best_ms:8.1f} {budget:8.0f}  {'; '.join(problems) or 'ok'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
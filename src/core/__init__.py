@@ -1,7 +1,30 @@
 # Core module — ядро приложения Personal Dashboard
+# Классы импортируются лениво (PEP 562): "import src.core" не загружает Qt,
+# DashboardApp и PySide6.QtWidgets подтягиваются при первом обращении.
 
-from .base_module import BaseModule
-from .dashboard_app import DashboardApp
-from .module_manager import ModuleManager
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-__all__ = ["BaseModule", "DashboardApp", "ModuleManager"]
+if TYPE_CHECKING:
+    from .base_module import BaseModule
+    from .dashboard_app import DashboardApp
+    from .module_manager import ModuleManager
+    from .state_store import StateStore, shared_state
+
+_LAZY = {
+    "BaseModule": ".base_module",
+    "DashboardApp": ".dashboard_app",
+    "ModuleManager": ".module_manager",
+    "StateStore": ".state_store",
+    "shared_state": ".state_store",
+}
+
+__all__ = ["BaseModule", "DashboardApp", "ModuleManager", "StateStore", "shared_state"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,80 @@
+"""
+Файлы приложения: папка настроек и данных (общая для ядра и модулей)
+и атомарная запись файлов — временный файл рядом + fsync + os.replace.
+Qt импортируется только при первом обращении к папке настроек.
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+APP_FOLDER = "Personal_Dashboard"
+
+
+def config_dir(*parts: str) -> Path:
+    """Папка настроек приложения (AppConfigLocation/Personal_Dashboard[/parts...]); создаётся."""
+    from PySide6.QtCore import QStandardPaths
+    loc = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppConfigLocation)
+    folder = Path(loc, APP_FOLDER, *parts)
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder
+
+
+def fsync_dir(folder: Path) -> None:
+    """fsync каталога, чтобы переименование пережило сбой питания (только POSIX)."""
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_file(path: Path, binary: bool = False) -> Iterator[IO]:
+    """
+    Файл для записи, который атомарно заменит path после выхода из блока без ошибки.
+    При исключении path не меняется, временный файл удаляется.
+    """
+    import tempfile  # ~5 мс импорта (random, shutil) — только при первой записи
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Уникальный временный файл: параллельные записи не портят чужой
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        f = os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding="utf-8", newline="\n")
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    fsync_dir(path.parent)
+
+
+def write_lines_atomic(path: Path, lines: Iterable[str]) -> None:
+    """Атомарная запись текста (UTF-8) по строкам, без склейки в одну строку."""
+    with atomic_file(path) as f:
+        f.writelines(lines)
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Атомарная запись текстового файла (UTF-8)."""
+    with atomic_file(path) as f:
+        f.write(text)
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Атомарная запись двоичного файла."""
+    with atomic_file(path, binary=True) as f:
+        f.write(data)
@@ -4,7 +4,13 @@
 """
 
 from abc import ABC, abstractmethod
-from PySide6.QtWidgets import QWidget
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    # Только для аннотаций: импорт ядра не тянет за собой Qt
+    from PySide6.QtWidgets import QWidget
+
+    from .module_manifest import ModuleManifest
 
 
 class BaseModule(ABC):
@@ -16,6 +22,16 @@ class BaseModule(ABC):
         self._author: str = ""
         self._description: str = ""
         self._requires_confirmation: bool = False
+        self._manifest: Optional["ModuleManifest"] = None
+
+    def apply_manifest(self, manifest: "ModuleManifest") -> None:
+        """
+        Метаданные из MANIFEST файла-загрузчика (задаёт ModuleManager при загрузке):
+        id, версия, имя, короткое имя и иконка объявляются только там.
+        """
+        self._manifest = manifest
+        self._module_id = manifest.module_id
+        self._version = manifest.version
 
     @property
     def module_id(self) -> str:
@@ -42,21 +58,31 @@ class BaseModule(ABC):
         """Нужно ли подтверждение перед закрытием приложения при активном модуле."""
         return self._requires_confirmation
 
+    def get_name(self) -> str:
+        """Отображаемое имя модуля: из манифеста, без него — module_id."""
+        return self._manifest.name if self._manifest is not None else self._module_id
+
     def get_icon(self) -> str:
-        """Возвращает иконку модуля (эмодзи или путь). По умолчанию пустая строка."""
-        return ""
+        """Возвращает иконку модуля (эмодзи или путь): из манифеста, иначе пустая строка."""
+        return self._manifest.icon if self._manifest is not None else ""
 
     def get_short_name(self) -> str:
         """Короткое название для кнопки в панели навигации. По умолчанию — get_name()."""
+        if self._manifest is not None and self._manifest.short_name:
+            return self._manifest.short_name
         return self.get_name()
 
-    @abstractmethod
-    def get_name(self) -> str:
-        """Возвращает отображаемое имя модуля."""
+    @classmethod
+    def warm_up(cls) -> None:
+        """
+        Фоновый прогрев перед первым открытием: чтение файлов, разбор данных.
+        Вызывается из рабочего потока до создания экземпляра, поэтому не должен
+        создавать виджеты и QObject. По умолчанию ничего не делает.
+        """
         pass
 
     @abstractmethod
-    def get_widget(self) -> QWidget:
+    def get_widget(self) -> "QWidget":
         """Возвращает виджет модуля для отображения в дашборде."""
         pass
 
@@ -1,13 +1,15 @@
 """
 Главный класс приложения Personal Dashboard.
 Панель навигации с кнопками модулей, QStackedWidget для активного модуля,
-сохранение последнего модуля в JSON.
+сохранение последнего модуля и частоты открытия модулей в JSON,
+восстановление последнего модуля после первой отрисовки окна,
+фоновый прогрев модулей после показа окна.
 """
 
-import json
 from pathlib import Path
 from typing import Optional
 
+from PySide6.QtCore import QTimer, Qt
 from PySide6.QtGui import QAction, QKeySequence
 from PySide6.QtWidgets import (
     QApplication,
@@ -18,20 +20,19 @@ from PySide6.QtWidgets import (
     QSizePolicy,
     QStackedWidget,
     QHBoxLayout,
+    QLabel,
     QVBoxLayout,
     QWidget,
 )
 
 from .base_module import BaseModule
 from .module_manager import ModuleManager
+from .module_prefetch import ModulePrefetcher, prefetch_order
+from .startup_profiler import profiler
+from .state_store import StateStore, default_state_path, shared_state
 
-
-def _config_path() -> Path:
-    from PySide6.QtCore import QStandardPaths
-    loc = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppConfigLocation)
-    folder = Path(loc) / "Personal_Dashboard"
-    folder.mkdir(parents=True, exist_ok=True)
-    return folder / "dashboard_state.json"
+# Пауза после показа окна перед фоновым прогревом: первый кадр успевает отрисоваться
+PREFETCH_DELAY_MS = 500
 
 
 class DashboardApp(QMainWindow):
@@ -42,7 +43,13 @@ class DashboardApp(QMainWindow):
         title: str = "Personal Dashboard",
         version: str = "0.1",
         modules_path: Optional[Path] = None,
+        deferred_restore: bool = True,
     ):
+        """
+        deferred_restore — поэтапный запуск: сначала отрисовывается оболочка
+        (панель навигации и заглушка), последний модуль создаётся на следующем
+        обороте цикла событий после первого кадра. False — сразу в конструкторе.
+        """
         super().__init__()
         self._app_title = title
         self._app_version = version
@@ -50,15 +57,44 @@ class DashboardApp(QMainWindow):
         self.setMinimumSize(600, 400)
         self.resize(900, 600)
 
-        self._module_manager = ModuleManager(modules_path)
+        with profiler.phase("default_state_path"):
+            self._config_file = default_state_path()
+        with profiler.phase("ModuleManager"):
+            self._module_manager = ModuleManager(
+                modules_path,
+                manifest_cache_path=self._config_file.parent / "module_manifests.json",
+            )
         self._stacked = QStackedWidget()
         self._module_name_to_index: dict[str, int] = {}
         self._nav_buttons: list[tuple[str, QPushButton]] = []
         self._current_module_name: Optional[str] = None
-        self._config_file = _config_path()
-
-        self.setup_ui()
-        self._restore_last_module()
+        self._active_nav_name: Optional[str] = None
+        # Состояние пишется на диск из фонового потока с задержкой-склейкой
+        self._state_store: StateStore = shared_state()
+        self._state = {
+            "last_module": self._state_store.get("last_module"),
+            "usage": self._state_store.get("usage", {}),
+        }
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._state_store.flush)
+        usage = self._state.get("usage", {})
+        self._module_usage: dict[str, int] = (
+            {str(k): int(v) for k, v in usage.items()} if isinstance(usage, dict) else {}
+        )
+        self._prefetcher = ModulePrefetcher(self._module_manager)
+        self._prefetch_started = False
+        self._first_frame_painted = False
+        self._deferred_restore = deferred_restore
+        self._placeholder: Optional[QLabel] = None
+
+        with profiler.phase("setup_ui"):
+            self.setup_ui()
+        if deferred_restore:
+            self._show_restore_placeholder()
+        else:
+            with profiler.phase("_restore_last_module"):
+                self._restore_last_module()
 
     def setup_ui(self) -> None:
         """Панель навигации слева + QStackedWidget по центру + меню."""
@@ -74,7 +110,8 @@ class DashboardApp(QMainWindow):
         content_layout.setSpacing(0)
 
         # Панель навигации слева
-        nav_panel = self._create_nav_panel()
+        with profiler.phase("_create_nav_panel"):
+            nav_panel = self._create_nav_panel()
         content_layout.addWidget(nav_panel)
 
         # Центральная область: QStackedWidget
@@ -92,7 +129,8 @@ class DashboardApp(QMainWindow):
         exit_action.triggered.connect(self._on_quit)
         file_menu.addAction(exit_action)
 
-        self._apply_global_styles()
+        with profiler.phase("_apply_global_styles"):
+            self._apply_global_styles()
 
     def _create_nav_panel(self) -> QWidget:
         """Панель навигации с кнопками модулей (слева по вертикали)."""
@@ -120,13 +158,10 @@ class DashboardApp(QMainWindow):
         return panel
 
     def _display_name_for_module_file(self, module_name: str) -> str:
-        """Отображаемое имя до загрузки модуля (по имени файла)."""
-        if module_name == "welcome_module":
-            return "👋 Привет"
-        if module_name == "pomodoro":
-            return "🍅 Pomodoro"
-        if module_name == "finance":
-            return "💰 Финансы"
+        """Отображаемое имя до загрузки модуля: из манифеста, иначе по имени файла."""
+        manifest = self._module_manager.get_manifest(module_name)
+        if manifest is not None:
+            return manifest.nav_label()
         return module_name.replace("_", " ").title()
 
     def _on_nav_click(self, module_name: str) -> None:
@@ -141,6 +176,8 @@ class DashboardApp(QMainWindow):
             widget = mod.get_widget()
             if widget is None:
                 return
+            # До добавления: индексы модулей в стеке не сдвинутся
+            self._drop_placeholder()
             idx = self._stacked.addWidget(widget)
             self._module_name_to_index[module_name] = idx
             self._stacked.setCurrentIndex(idx)
@@ -163,9 +200,17 @@ class DashboardApp(QMainWindow):
         self._stacked.currentWidget().setGraphicsEffect(None)
 
     def _update_nav_active(self, active_name: str) -> None:
+        """Подсветка активной кнопки: перепроверяются только кнопки, сменившие состояние."""
+        previous = self._active_nav_name
+        self._active_nav_name = active_name
         for name, btn in self._nav_buttons:
-            btn.setProperty("active", name == active_name)
             btn.setChecked(name == active_name)
+            if name == previous and name != active_name:
+                btn.setProperty("active", False)
+            elif name == active_name and name != previous:
+                btn.setProperty("active", True)
+            else:
+                continue
             btn.style().unpolish(btn)
             btn.style().polish(btn)
 
@@ -195,35 +240,105 @@ class DashboardApp(QMainWindow):
             #stackedWidget {
                 background-color: #1e1e1e;
             }
+            #modulePlaceholder {
+                color: #808080;
+                font-size: 14px;
+            }
         """)
 
+    def paintEvent(self, event) -> None:
+        super().paintEvent(event)
+        if not self._first_frame_painted:
+            self._first_frame_painted = True
+            profiler.mark("first_frame")
+            # Следующий свободный оборот цикла событий — окно готово к вводу
+            QTimer.singleShot(0, self._on_startup_idle)
+
+    def _on_startup_idle(self) -> None:
+        profiler.mark("interactive")
+        if self._deferred_restore:
+            # Отдельный оборот цикла: кадр с заглушкой уже на экране
+            QTimer.singleShot(0, self._on_deferred_restore)
+        else:
+            profiler.finish()
+
+    def _show_restore_placeholder(self) -> None:
+        """Лёгкая заглушка на месте модуля, который будет восстановлен после первого кадра."""
+        target = self._restore_target()
+        label = self._display_name_for_module_file(target) if target else ""
+        self._placeholder = QLabel(f"Загрузка: {label}…" if label else "")
+        self._placeholder.setObjectName("modulePlaceholder")
+        self._placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._stacked.addWidget(self._placeholder)
+        self._stacked.setCurrentWidget(self._placeholder)
+        if target:
+            self._update_nav_active(target)
+
+    def _drop_placeholder(self) -> None:
+        """Убирает заглушку восстановления из стека (при первом показе модуля)."""
+        if self._placeholder is None:
+            return
+        self._stacked.removeWidget(self._placeholder)
+        self._placeholder.deleteLater()
+        self._placeholder = None
+
+    def _on_deferred_restore(self) -> None:
+        # Пользователь мог уже выбрать модуль сам — тогда восстанавливать нечего
+        if self._current_module_name is None:
+            with profiler.phase("_restore_last_module"):
+                self._restore_last_module()
+            profiler.mark("module_restored")
+        # Модуль не открылся — заглушка «Загрузка…» тоже не нужна
+        self._drop_placeholder()
+        profiler.finish()
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if not self._prefetch_started:
+            self._prefetch_started = True
+            QTimer.singleShot(PREFETCH_DELAY_MS, self._start_prefetch)
+
+    def _start_prefetch(self) -> None:
+        """Прогрев ещё не открытых модулей: сначала самые используемые."""
+        order = prefetch_order(
+            self._module_manager.get_available_modules(),
+            self._module_usage,
+            exclude=self._module_name_to_index.keys(),
+        )
+        self._prefetcher.schedule(order)
+
     def _save_last_module(self, module_name: str) -> None:
-        try:
-            data = {"last_module": module_name}
-            self._config_file.parent.mkdir(parents=True, exist_ok=True)
-            self._config_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
-        except Exception:
-            pass
+        """Запоминает модуль в памяти; запись на диск — в фоне, без задержки клика."""
+        self._module_usage[module_name] = self._module_usage.get(module_name, 0) + 1
+        self._state_store.update({"last_module": module_name, "usage": self._module_usage})
+
+    def _restore_target(self) -> Optional[str]:
+        """Модуль, который откроется при запуске: последний открытый или первый доступный."""
+        last = self._state.get("last_module")
+        if last and last in [n for n, _ in self._nav_buttons]:
+            return last
+        return self._first_available()
 
     def _restore_last_module(self) -> None:
-        try:
-            if not self._config_file.exists():
-                self._open_first_available()
-                return
-            data = json.loads(self._config_file.read_text(encoding="utf-8"))
-            last = data.get("last_module")
-            if last and last in [n for n, _ in self._nav_buttons]:
+        last = self._state.get("last_module")
+        if last and last in [n for n, _ in self._nav_buttons]:
+            try:
                 self._on_nav_click(last)
                 return
-        except Exception:
-            pass
+            except Exception:
+                pass
         self._open_first_available()
 
+    def _first_available(self) -> Optional[str]:
+        """Welcome, если есть, иначе первый модуль в списке."""
+        names = self._module_manager.get_available_modules()
+        if "welcome_module" in names:
+            return "welcome_module"
+        return names[0] if names else None
+
     def _open_first_available(self) -> None:
         """Открыть первый доступный модуль (Welcome или первый в списке)."""
-        preferred = "welcome_module" if "welcome_module" in self._module_manager.get_available_modules() else None
-        names = self._module_manager.get_available_modules()
-        to_open = preferred if preferred and preferred in names else (names[0] if names else None)
+        to_open = self._first_available()
         if to_open:
             self._on_nav_click(to_open)
         else:
@@ -242,6 +357,8 @@ class DashboardApp(QMainWindow):
                 )
                 if reply != QMessageBox.StandardButton.Yes:
                     return
+        self._prefetcher.cancel()
+        self._state_store.flush()
         QApplication.quit()
 
     def register_module(self, module: BaseModule) -> None:
@@ -250,3 +367,7 @@ class DashboardApp(QMainWindow):
 
     def get_module_manager(self) -> ModuleManager:
         return self._module_manager
+
+    def get_state_store(self) -> StateStore:
+        """Общее хранилище состояния; модули пишут в свой раздел (state.section(module_id))."""
+        return self._state_store
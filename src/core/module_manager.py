@@ -1,23 +1,32 @@
 """
 Менеджер модулей — загрузка и выгрузка модулей из папки modules/.
-Поддержка ленивой загрузки и поиска по module_id.
+Поддержка ленивой загрузки, поиска по module_id и манифестов модулей
+(метаданные без импорта кода модуля).
 """
 
 import importlib.util
 import sys
+import threading
 from pathlib import Path
+from types import ModuleType
 from typing import Optional
 
 from .base_module import BaseModule
+from .module_manifest import MANIFEST_VARIABLE, ManifestCache, ModuleManifest
 
 
 class ModuleManager:
     """Управляет загрузкой и выгрузкой модулей дашборда."""
 
-    def __init__(self, modules_path: Optional[Path] = None):
+    def __init__(self, modules_path: Optional[Path] = None, manifest_cache_path: Optional[Path] = None):
         if modules_path is None:
             modules_path = Path(__file__).resolve().parent.parent / "modules"
         self._modules_path = Path(modules_path)
+        self._manifest_cache = ManifestCache(manifest_cache_path)
+        self._manifests: dict[str, Optional[ModuleManifest]] = {}
+        # Импортированный код модулей; импорт может идти из фонового потока (prefetch)
+        self._code: dict[str, ModuleType] = {}
+        self._import_lock = threading.Lock()
         self._loaded_modules: dict[str, BaseModule] = {}
         self._loaded_by_id: dict[str, BaseModule] = {}
         self._module_id_to_name: dict[str, str] = {}
@@ -35,15 +44,49 @@ class ModuleManager:
                 names.append(p.stem)
         return names
 
+    def _read_manifest(self, module_name: str) -> Optional[ModuleManifest]:
+        if module_name not in self._manifests:
+            module_file = self._modules_path / f"{module_name}.py"
+            self._manifests[module_name] = self._manifest_cache.get(module_name, module_file)
+        return self._manifests[module_name]
+
+    def get_manifest(self, module_name: str) -> Optional[ModuleManifest]:
+        """
+        Манифест модуля (MANIFEST в файле-загрузчике) без импорта модуля.
+        None, если файл не объявляет манифест.
+        """
+        manifest = self._read_manifest(module_name)
+        self._manifest_cache.save()
+        return manifest
+
+    def get_manifests(self) -> dict[str, ModuleManifest]:
+        """Манифесты всех доступных модулей: имя файла -> манифест."""
+        out: dict[str, ModuleManifest] = {}
+        for name in self.get_available_modules():
+            manifest = self._read_manifest(name)
+            if manifest is not None:
+                out[name] = manifest
+        self._manifest_cache.save()
+        return out
+
     def get_module_by_id(self, module_id: str) -> Optional[BaseModule]:
         """
         Возвращает модуль по его module_id. Ленивая загрузка: загружает при первом обращении.
+        Нужный файл ищется по манифестам; импортируются только модули без манифеста.
         """
         if module_id in self._loaded_by_id:
             return self._loaded_by_id[module_id]
         if module_id in self._module_id_to_name:
             return self.load_module(self._module_id_to_name[module_id])
+        manifests = self.get_manifests()
+        for name, manifest in manifests.items():
+            if manifest.module_id == module_id:
+                mod = self.load_module(name)
+                if mod is not None and mod.module_id == module_id:
+                    return mod
         for name in self.get_available_modules():
+            if name in manifests:
+                continue
             mod = self.load_module(name)
             if mod is not None and mod.module_id == module_id:
                 return mod
@@ -58,21 +101,67 @@ class ModuleManager:
         if module_name in self._loaded_modules:
             return self._loaded_modules[module_name]
 
-        module_file = self._modules_path / f"{module_name}.py"
-        if not module_file.exists():
+        module = self._import_code(module_name)
+        if module is None:
             return None
-
-        spec = importlib.util.spec_from_file_location(
-            f"modules.{module_name}",
-            module_file,
-        )
-        if spec is None or spec.loader is None:
+        module_class = self._find_module_class(module)
+        if module_class is None:
             return None
 
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[spec.name] = module
-        spec.loader.exec_module(module)
+        instance = module_class()
+        data = getattr(module, MANIFEST_VARIABLE, None)
+        if isinstance(data, dict):
+            instance.apply_manifest(ModuleManifest.from_dict(data))
+        instance.on_load()
+        self._loaded_modules[module_name] = instance
+        self._loaded_by_id[instance.module_id] = instance
+        self._module_id_to_name[instance.module_id] = module_name
+        return instance
+
+    def prefetch_module(self, module_name: str) -> bool:
+        """
+        Импортирует код модуля и выполняет его фоновый прогрев (BaseModule.warm_up)
+        без создания экземпляра и виджетов. Можно вызывать из рабочего потока.
+        Возвращает True, если модуль найден и прогрет.
+        """
+        module = self._import_code(module_name)
+        if module is None:
+            return False
+        module_class = self._find_module_class(module)
+        if module_class is None:
+            return False
+        module_class.warm_up()
+        return True
 
+    def _import_code(self, module_name: str) -> Optional[ModuleType]:
+        """Импорт файла модуля (один раз, потокобезопасно)."""
+        with self._import_lock:
+            if module_name in self._code:
+                return self._code[module_name]
+
+            module_file = self._modules_path / f"{module_name}.py"
+            if not module_file.exists():
+                return None
+
+            spec = importlib.util.spec_from_file_location(
+                f"modules.{module_name}",
+                module_file,
+            )
+            if spec is None or spec.loader is None:
+                return None
+
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[spec.name]
+                raise
+            self._code[module_name] = module
+            return module
+
+    @staticmethod
+    def _find_module_class(module: ModuleType) -> Optional[type[BaseModule]]:
         for attr_name in dir(module):
             attr = getattr(module, attr_name)
             if (
@@ -80,13 +169,7 @@ class ModuleManager:
                 and issubclass(attr, BaseModule)
                 and attr is not BaseModule
             ):
-                instance = attr()
-                instance.on_load()
-                self._loaded_modules[module_name] = instance
-                self._loaded_by_id[instance.module_id] = instance
-                self._module_id_to_name[instance.module_id] = module_name
-                return instance
-
+                return attr
         return None
 
     def unload_module(self, module_name: str) -> bool:
@@ -104,8 +187,10 @@ class ModuleManager:
             del self._module_id_to_name[mid]
 
         spec_name = f"modules.{module_name}"
-        if spec_name in sys.modules:
-            del sys.modules[spec_name]
+        with self._import_lock:
+            self._code.pop(module_name, None)
+            if spec_name in sys.modules:
+                del sys.modules[spec_name]
 
         return True
 
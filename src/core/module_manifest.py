@@ -0,0 +1,129 @@
+"""
+Манифест модуля — метаданные для панели навигации без импорта кода модуля.
+Файл-загрузчик модуля (modules/<имя>.py) объявляет словарь-литерал MANIFEST;
+он читается разбором AST, без выполнения файла и без импорта PySide6.
+Результаты кэшируются на диске по mtime/размеру и хэшу файла.
+"""
+
+import ast
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+MANIFEST_VARIABLE = "MANIFEST"
+CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ModuleManifest:
+    """Метаданные модуля, доступные до его загрузки."""
+
+    module_id: str
+    name: str
+    short_name: str = ""
+    icon: str = ""
+    version: str = "0.1.0"
+
+    def nav_label(self) -> str:
+        """Текст кнопки в панели навигации: иконка + короткое имя."""
+        short = self.short_name or self.name
+        return f"{self.icon} {short}".strip() if self.icon else short
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ModuleManifest":
+        return cls(
+            module_id=str(data["module_id"]),
+            name=str(data.get("name", data["module_id"])),
+            short_name=str(data.get("short_name", "")),
+            icon=str(data.get("icon", "")),
+            version=str(data.get("version", "0.1.0")),
+        )
+
+
+def read_manifest(source: bytes) -> Optional[ModuleManifest]:
+    """Находит MANIFEST = {...} на верхнем уровне файла и разбирает литерал."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    for node in tree.body:
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+            continue
+        target = node.targets[0]
+        if isinstance(target, ast.Name) and target.id == MANIFEST_VARIABLE:
+            try:
+                data = ast.literal_eval(node.value)
+                return ModuleManifest.from_dict(data) if isinstance(data, dict) else None
+            except (ValueError, KeyError, TypeError):
+                return None
+    return None
+
+
+class ManifestCache:
+    """
+    Кэш манифестов: имя модуля → (mtime_ns, размер, sha256, манифест).
+    Совпали mtime и размер — берём из кэша без чтения файла; иначе сверяем хэш
+    и разбираем файл только если содержимое действительно изменилось.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self._cache_path = Path(cache_path) if cache_path is not None else None
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if self._cache_path is None or not self._cache_path.exists():
+            return
+        try:
+            data = json.loads(self._cache_path.read_text(encoding="utf-8"))
+            if data.get("version") == CACHE_VERSION:
+                self._entries = dict(data.get("modules", {}))
+        except Exception:
+            self._entries = {}
+
+    def save(self) -> None:
+        """Сохраняет кэш, если он изменился. Ошибки записи не критичны."""
+        if self._cache_path is None or not self._dirty:
+            return
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            data = {"version": CACHE_VERSION, "modules": self._entries}
+            self._cache_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            self._dirty = False
+        except OSError:
+            pass
+
+    def get(self, module_name: str, module_file: Path) -> Optional[ModuleManifest]:
+        try:
+            st = module_file.stat()
+        except OSError:
+            return None
+        entry = self._entries.get(module_name)
+        if entry and entry.get("mtime_ns") == st.st_mtime_ns and entry.get("size") == st.st_size:
+            return self._manifest_from_entry(entry)
+
+        source = module_file.read_bytes()
+        digest = hashlib.sha256(source).hexdigest()
+        if entry and entry.get("sha256") == digest:
+            manifest = self._manifest_from_entry(entry)
+        else:
+            manifest = read_manifest(source)
+        self._entries[module_name] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": digest,
+            "manifest": asdict(manifest) if manifest is not None else None,
+        }
+        self._dirty = True
+        return manifest
+
+    @staticmethod
+    def _manifest_from_entry(entry: dict) -> Optional[ModuleManifest]:
+        data = entry.get("manifest")
+        try:
+            return ModuleManifest.from_dict(data) if data else None
+        except (KeyError, TypeError):
+            return None
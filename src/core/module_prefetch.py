@@ -0,0 +1,75 @@
+"""
+Фоновая предзагрузка модулей, которые вероятно откроют следующими.
+Один рабочий поток по очереди импортирует код модулей и вызывает их warm_up()
+(файлы, разбор данных). Виджеты по-прежнему создаются в GUI-потоке при клике.
+"""
+
+import threading
+from typing import Iterable, Mapping
+
+from .module_manager import ModuleManager
+
+
+def prefetch_order(
+    available: Iterable[str],
+    usage: Mapping[str, int],
+    exclude: Iterable[str] = (),
+) -> list[str]:
+    """
+    Порядок прогрева: сначала чаще открываемые модули, затем остальные
+    в порядке панели навигации. exclude — уже загруженные модули.
+    """
+    skip = set(exclude)
+    names = [n for n in available if n not in skip]
+    position = {name: i for i, name in enumerate(names)}
+    return sorted(names, key=lambda n: (-usage.get(n, 0), position[n]))
+
+
+class ModulePrefetcher:
+    """Очередь прогрева модулей в одном фоновом потоке (daemon)."""
+
+    def __init__(self, manager: ModuleManager):
+        self._manager = manager
+        self._queue: list[str] = []
+        self._done: set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._cancelled = False
+
+    def schedule(self, module_names: Iterable[str]) -> None:
+        """Добавляет модули в очередь (по порядку приоритета) и запускает поток."""
+        with self._lock:
+            for name in module_names:
+                if name not in self._done and name not in self._queue:
+                    self._queue.append(name)
+            self._cancelled = False
+            if self._queue and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(
+                    target=self._run, name="module-prefetch", daemon=True
+                )
+                self._thread.start()
+
+    def cancel(self) -> None:
+        """Очищает очередь; модуль, который уже прогревается, доработает."""
+        with self._lock:
+            self._queue.clear()
+            self._cancelled = True
+
+    def is_prefetched(self, module_name: str) -> bool:
+        with self._lock:
+            return module_name in self._done
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if self._cancelled or not self._queue:
+                    self._thread = None
+                    return
+                name = self._queue.pop(0)
+            try:
+                self._manager.prefetch_module(name)
+            except Exception:
+                # Прогрев — только оптимизация: при ошибке модуль загрузится обычным путём
+                pass
+            with self._lock:
+                self._done.add(name)
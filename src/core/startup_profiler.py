@@ -0,0 +1,128 @@
+"""
+Профилировщик запуска: именованные фазы с метками времени time.monotonic().
+Включается флагом командной строки --profile-startup[=путь.json] или переменной
+окружения DASHBOARD_PROFILE_STARTUP (1 или путь к JSON). Отчёт — JSON-файл
+и таблица в stderr — пишется, когда окно отрисовано и цикл событий свободен.
+Выключенный профилировщик ничего не измеряет и ничего не пишет.
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, ContextManager, Iterator, Optional
+
+ENV_VAR = "DASHBOARD_PROFILE_STARTUP"
+FLAG = "--profile-startup"
+EXIT_FLAG = "--exit-after-startup"
+REPORT_NAME = "startup_profile.json"
+
+
+def _default_report_path() -> Path:
+    from .app_files import config_dir
+    return config_dir() / REPORT_NAME
+
+
+class StartupProfiler:
+    """Фазы запуска: (имя, начало, конец) относительно начала процесса."""
+
+    def __init__(self):
+        self.enabled = False
+        self.exit_after_startup = False
+        self._origin = time.monotonic()
+        self._report_path: Optional[Path] = None
+        self._phases: list[tuple[str, float, float]] = []
+        self._marks: list[tuple[str, float]] = []
+        self._finished = False
+        self._finish_callbacks: list[Callable[[], None]] = []
+
+    def configure(self, argv: list[str], origin: Optional[float] = None) -> None:
+        """
+        Читает флаги из argv (и удаляет их, чтобы не мешали QApplication)
+        и переменную окружения. origin — момент начала отсчёта (начало main.py).
+        """
+        if origin is not None:
+            self._origin = origin
+        value = os.environ.get(ENV_VAR, "").strip()
+        for arg in list(argv[1:]):
+            if arg == FLAG or arg.startswith(FLAG + "="):
+                value = arg.partition("=")[2] or "1"
+                argv.remove(arg)
+            elif arg == EXIT_FLAG:
+                self.exit_after_startup = True
+                argv.remove(arg)
+        if value and value != "0":
+            self.enabled = True
+            self._report_path = None if value == "1" else Path(value)
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """Фаза с уже известными границами (например, импорты до включения профилировщика)."""
+        if self.enabled:
+            self._phases.append((name, start, end))
+
+    def phase(self, name: str) -> ContextManager[None]:
+        """Контекстный менеджер фазы; при выключенном профилировщике — пустой."""
+        if not self.enabled:
+            return nullcontext()
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._phases.append((name, start, time.monotonic()))
+
+    def mark(self, name: str) -> None:
+        """Точечное событие (первый кадр, готовность к вводу)."""
+        if self.enabled:
+            self._marks.append((name, time.monotonic()))
+
+    def add_finish_callback(self, callback: Callable[[], None]) -> None:
+        self._finish_callbacks.append(callback)
+
+    def finish(self) -> None:
+        """Пишет отчёт (один раз) и вызывает подписчиков finish."""
+        if self._finished:
+            return
+        self._finished = True
+        if self.enabled:
+            report = self.report()
+            try:
+                path = self._report_path or _default_report_path()
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+            except OSError:
+                pass
+            print(self.format_table(report), file=sys.stderr)
+        for callback in self._finish_callbacks:
+            callback()
+
+    def report(self) -> dict:
+        """Отчёт в миллисекундах от начала отсчёта."""
+
+        def ms(t: float) -> float:
+            return round((t - self._origin) * 1000, 3)
+
+        return {
+            "phases": [
+                {"name": name, "start_ms": ms(start), "duration_ms": round((end - start) * 1000, 3)}
+                for name, start, end in self._phases
+            ],
+            "marks": {name: ms(t) for name, t in self._marks},
+        }
+
+    @staticmethod
+    def format_table(report: dict) -> str:
+        rows = [f"{'фаза':<40} {'старт, мс':>10} {'длит., мс':>10}"]
+        for p in sorted(report["phases"], key=lambda p: p["start_ms"]):
+            rows.append(f"{p['name']:<40} {p['start_ms']:>10.1f} {p['duration_ms']:>10.1f}")
+        for name, at in report["marks"].items():
+            rows.append(f"{'* ' + name:<40} {at:>10.1f}")
+        return "\n".join(rows)
+
+
+profiler = StartupProfiler()
@@ -0,0 +1,177 @@
+"""
+Сохранение состояния приложения (последний модуль, частота открытия, позже —
+геометрия окна и состояние модулей) в один JSON-файл.
+Изменения применяются в памяти сразу, а на диск уходят из фонового потока:
+серия изменений подряд склеивается в одну запись (debounce), файл заменяется
+атомарно (временный файл + os.replace). flush() — синхронная запись перед выходом.
+"""
+
+import atexit
+import copy
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from .app_files import config_dir, write_text_atomic
+
+STATE_NAME = "dashboard_state.json"
+DEBOUNCE_SECONDS = 0.3
+
+
+class StateSection:
+    """Раздел состояния одного владельца (модуля): ключи внутри state[name]."""
+
+    def __init__(self, store: "StateStore", name: str):
+        self._store = store
+        self._name = name
+
+    def get(self, key: str, default: Any = None) -> Any:
+        section = self._store.get(self._name, {})
+        return section.get(key, default) if isinstance(section, dict) else default
+
+    def set(self, key: str, value: Any) -> None:
+        self.update({key: value})
+
+    def update(self, values: dict) -> None:
+        self._store.update_section(self._name, values)
+
+
+class StateStore:
+    """
+    Состояние в памяти + фоновая отложенная запись. Методы потокобезопасны;
+    get() возвращает копии, чтобы изменения снаружи не обходили запись.
+    """
+
+    def __init__(self, path: Path, debounce: float = DEBOUNCE_SECONDS):
+        self._path = Path(path)
+        self._debounce = debounce
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._data = self._read()
+        self._version = 0  # номер последнего изменения
+        self._saved_version = 0  # номер изменения, запись которого уже выполнена
+        self._write_lock = threading.Lock()
+        self._disk_version = 0  # номер изменения в файле на диске (под _write_lock)
+        self._last_change = 0.0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.last_error: Optional[Exception] = None
+        atexit.register(self.flush)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _read(self) -> dict:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return copy.deepcopy(self._data.get(key, default))
+
+    def set(self, key: str, value: Any) -> None:
+        self.update({key: value})
+
+    def update(self, values: dict) -> None:
+        """Меняет ключи верхнего уровня и планирует запись."""
+        values = copy.deepcopy(values)
+        with self._lock:
+            self._data.update(values)
+            self._touch()
+
+    def update_section(self, name: str, values: dict) -> None:
+        values = copy.deepcopy(values)
+        with self._lock:
+            section = self._data.get(name)
+            if not isinstance(section, dict):
+                section = self._data[name] = {}
+            section.update(values)
+            self._touch()
+
+    def section(self, name: str) -> StateSection:
+        return StateSection(self, name)
+
+    def _touch(self) -> None:
+        # Вызывается под self._lock
+        self._version += 1
+        self._last_change = time.monotonic()
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name="state-writer", daemon=True)
+            self._thread.start()
+        self._changed.notify()
+
+    def _run(self) -> None:
+        with self._lock:
+            while not self._closed:
+                if self._version == self._saved_version:
+                    self._changed.wait()
+                    continue
+                # Ждём паузы в изменениях: новые изменения продлевают ожидание
+                delay = self._last_change + self._debounce - time.monotonic()
+                if delay > 0:
+                    self._changed.wait(delay)
+                    continue
+                self._write_locked()
+
+    def _write_locked(self) -> None:
+        """
+        Запись снимка; вызывается под self._lock. Файл пишется без неё (изменения
+        не ждут диска), но под _write_lock: фоновая запись и flush() не пересекаются,
+        и более старый снимок не перезапишет уже записанный новый.
+        """
+        version = self._version
+        snapshot = copy.deepcopy(self._data)
+        self._lock.release()
+        error = None
+        try:
+            with self._write_lock:
+                if version > self._disk_version:
+                    try:
+                        write_text_atomic(self._path, json.dumps(snapshot, ensure_ascii=False))
+                        self._disk_version = version
+                    except OSError as e:
+                        error = e
+        finally:
+            self._lock.acquire()
+        self.last_error = error
+        # При ошибке следующая попытка — после следующего изменения или flush()
+        self._saved_version = max(self._saved_version, version)
+
+    def flush(self) -> None:
+        """Синхронно записывает несохранённые изменения (выход из приложения)."""
+        with self._lock:
+            # Сравнение с версией на диске: flush() повторяет и неудавшуюся запись
+            if self._version > self._disk_version:
+                self._write_locked()
+
+    def close(self) -> None:
+        """flush() и остановка фонового потока."""
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._changed.notify_all()
+        atexit.unregister(self.flush)
+
+
+_shared: Optional[StateStore] = None
+_shared_lock = threading.Lock()
+
+
+def default_state_path() -> Path:
+    """Файл состояния приложения в папке настроек."""
+    return config_dir() / STATE_NAME
+
+
+def shared_state() -> StateStore:
+    """Общее хранилище состояния приложения: ядро и модули пишут в свои разделы."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = StateStore(default_state_path())
+        return _shared
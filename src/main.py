@@ -1,28 +1,51 @@
 """
 Personal Dashboard — точка входа.
 Создаёт экземпляр DashboardApp и подключает модули.
+Профилирование запуска: --profile-startup[=путь.json] или DASHBOARD_PROFILE_STARTUP=1.
 """
 
+import time
+
+_START = time.monotonic()
+
 import sys
 from pathlib import Path
 
 # Корень проекта в path для импорта src.* при запуске python src/main.py
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from src.core.startup_profiler import profiler
+
+_PROFILER_IMPORTED = time.monotonic()
+
 from PySide6.QtWidgets import QApplication
 
+_PYSIDE_IMPORTED = time.monotonic()
+
 from src.core import DashboardApp
 
+_CORE_IMPORTED = time.monotonic()
+
 
 def main():
-    app = QApplication(sys.argv)
+    profiler.configure(sys.argv, origin=_START)
+    profiler.record("import src.core.startup_profiler", _START, _PROFILER_IMPORTED)
+    profiler.record("import PySide6.QtWidgets", _PROFILER_IMPORTED, _PYSIDE_IMPORTED)
+    profiler.record("import src.core.dashboard_app", _PYSIDE_IMPORTED, _CORE_IMPORTED)
+
+    with profiler.phase("QApplication"):
+        app = QApplication(sys.argv)
+    if profiler.exit_after_startup:
+        profiler.add_finish_callback(app.quit)
 
     # Главное окно: панель модулей слева, активный модуль по клику
-    window = DashboardApp(title="Personal Dashboard", version="0.1")
+    with profiler.phase("DashboardApp.__init__"):
+        window = DashboardApp(title="Personal Dashboard", version="0.1")
     # Модули загружаются лениво при нажатии на кнопку в панели.
     # Последний открытый модуль восстанавливается из конфига при следующем запуске.
 
-    window.show()
+    with profiler.phase("window.show"):
+        window.show()
     sys.exit(app.exec())
 
 
@@ -3,6 +3,16 @@
 load_module("finance") загружает этот файл и находит класс FinanceModule.
 """
 
+# Метаданные модуля (единственный источник): панель навигации читает их без импорта
+# модуля, ModuleManager передаёт их экземпляру через apply_manifest()
+MANIFEST = {
+    "module_id": "finance",
+    "name": "💰 Финансовый трекер",
+    "short_name": "Финансы",
+    "icon": "💰",
+    "version": "0.1.0",
+}
+
 try:
     from src.modules.finance.finance_module import FinanceModule
 except ImportError:
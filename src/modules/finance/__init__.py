@@ -1,6 +1,30 @@
 # Модуль Финансовый трекер для Personal Dashboard
+# Ленивый экспорт: движок учёта и журнал (finance_ledger, finance_journal) импортируются без Qt
 
-from .finance_module import FinanceModule
-from .finance_widget import FinanceWidget
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-__all__ = ["FinanceModule", "FinanceWidget"]
+if TYPE_CHECKING:
+    from .finance_journal import FinanceBook, LedgerJournal
+    from .finance_ledger import Ledger, Transaction
+    from .finance_module import FinanceModule
+    from .finance_widget import FinanceWidget
+
+_LAZY = {
+    "FinanceBook": ".finance_journal",
+    "LedgerJournal": ".finance_journal",
+    "Ledger": ".finance_ledger",
+    "Transaction": ".finance_ledger",
+    "FinanceModule": ".finance_module",
+    "FinanceWidget": ".finance_widget",
+}
+
+__all__ = ["FinanceBook", "FinanceModule", "FinanceWidget", "Ledger", "LedgerJournal", "Transaction"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
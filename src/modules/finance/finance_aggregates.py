@@ -0,0 +1,219 @@
+"""
+Материализованные итоги журнала операций: суммы по дням для каждого счёта
+и для доходов/расходов каждой категории. Суммы по дням хранятся разреженно —
+кусками по CHUNK_DAYS дней, только там, где есть операции ряда, — а поверх
+сумм кусков стоит дерево Фенвика. Добавление, изменение и удаление операции —
+O(1) плюс O(log K) (K — кусков ряда); остаток на дату и сумма за период —
+O(log K) плюс сумма не больше CHUNK_DAYS чисел внутри куска, без прохода по операциям.
+Массовая загрузка (импорт, открытие журнала) только копит суммы, а деревья
+строятся за O(K) при первом запросе.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+# Дней в куске ряда: ~8,5 месяца, 2 КиБ на кусок
+CHUNK_DAYS = 256
+
+
+class FenwickTree:
+    """Префиксные суммы int64 с точечным изменением; позиции — с 0."""
+
+    __slots__ = ("_tree",)
+
+    def __init__(self, values: Iterable[int]):
+        # Построение за O(n): каждый узел передаёт свою сумму родителю
+        tree = array("q", [0])
+        tree.extend(values)
+        n = len(tree) - 1
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def add(self, position: int, delta: int) -> None:
+        tree = self._tree
+        n = len(tree)
+        i = position + 1
+        while i < n:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, end: int) -> int:
+        """Сумма позиций [0, end)."""
+        tree = self._tree
+        total = 0
+        i = min(end, len(tree) - 1)
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+
+class _Series:
+    """Суммы по дням одного счёта или одной категории (доходы либо расходы)."""
+
+    __slots__ = ("chunks", "sums", "total", "_keys", "_tree")
+
+    def __init__(self):
+        self.chunks: dict[int, array] = {}  # номер куска → суммы по дням куска
+        self.sums: dict[int, int] = {}  # номер куска → сумма куска
+        self.total = 0
+        self._keys: list[int] = []  # номера кусков по возрастанию — позиции в дереве
+        self._tree: Optional[FenwickTree] = None  # None — нужно перестроить
+
+    def chunk(self, key: int) -> array:
+        daily = self.chunks.get(key)
+        if daily is None:
+            daily = self.chunks[key] = array("q", bytes(8 * CHUNK_DAYS))
+            self.sums[key] = 0
+            self._tree = None
+        return daily
+
+    def add(self, day: int, amount: int) -> None:
+        key, position = divmod(day, CHUNK_DAYS)
+        self.chunk(key)[position] += amount
+        self.sums[key] += amount
+        self.total += amount
+        if self._tree is not None:
+            self._tree.add(bisect_left(self._keys, key), amount)
+
+    def invalidate(self) -> None:
+        """После массового добавления в chunks: суммы кусков и дерево — заново."""
+        self.sums = {key: sum(daily) for key, daily in self.chunks.items()}
+        self.total = sum(self.sums.values())
+        self._tree = None
+
+    def prefix(self, end: int) -> int:
+        """Сумма за дни < end."""
+        if self._tree is None:
+            self._keys = sorted(self.sums)
+            self._tree = FenwickTree(self.sums[key] for key in self._keys)
+        key, position = divmod(end, CHUNK_DAYS)
+        total = self._tree.prefix(bisect_left(self._keys, key))
+        daily = self.chunks.get(key)
+        if daily is not None and position:
+            # Внутри куска — более короткая из двух половин
+            if position <= CHUNK_DAYS // 2:
+                total += sum(daily[:position])
+            else:
+                total += self.sums[key] - sum(daily[position:])
+        return total
+
+    def value(self, day: int) -> int:
+        key, position = divmod(day, CHUNK_DAYS)
+        daily = self.chunks.get(key)
+        return daily[position] if daily is not None else 0
+
+
+class LedgerAggregates:
+    """
+    Итоги по кодам словарей Ledger; дни — номера от 1970-01-01. Память — по кускам
+    с операциями у каждого ряда: далёкая дата добавляет один кусок одному счёту
+    и одной категории, а не растягивает все ряды. Не потокобезопасен — Ledger
+    вызывает его под своей блокировкой.
+    """
+
+    def __init__(self):
+        self._accounts: dict[int, _Series] = {}
+        # Доходы и расходы категории — раздельно: «траты по категориям» без доходов
+        self._income: dict[int, _Series] = {}
+        self._expense: dict[int, _Series] = {}
+
+    @staticmethod
+    def _series(table: dict[int, _Series], code: int) -> _Series:
+        series = table.get(code)
+        if series is None:
+            series = table[code] = _Series()
+        return series
+
+    def add(self, day: int, amount: int, account: int, category: int) -> None:
+        """Учитывает операцию (amount < 0 — отменяет её вклад, см. remove)."""
+        if not amount:
+            return
+        self._series(self._accounts, account).add(day, amount)
+        self._series(self._income if amount > 0 else self._expense, category).add(day, amount)
+
+    def extend(self, days, amounts, account_ids, category_ids) -> None:
+        """Массовое добавление из столбцов Ledger: суммы кусков и деревья — один раз в конце."""
+        touched: dict[int, _Series] = {}  # id ряда → ряд
+        # (код, кусок) → суммы по дням, отдельно для счетов, доходов и расходов категорий
+        caches: tuple[dict, dict, dict] = ({}, {}, {})
+        tables = (self._accounts, self._income, self._expense)
+
+        def chunk(table: int, code: int, key: int) -> array:
+            series = self._series(tables[table], code)
+            touched[id(series)] = series
+            daily = caches[table][(code, key)] = series.chunk(key)
+            return daily
+
+        accounts, income, expense = caches
+        for day, amount, account, category in zip(days, amounts, account_ids, category_ids):
+            if not amount:
+                continue
+            key, position = divmod(day, CHUNK_DAYS)
+            daily = accounts.get((account, key)) or chunk(0, account, key)
+            daily[position] += amount
+            if amount > 0:
+                daily = income.get((category, key)) or chunk(1, category, key)
+            else:
+                daily = expense.get((category, key)) or chunk(2, category, key)
+            daily[position] += amount
+        for series in touched.values():
+            series.invalidate()
+
+    def remove(self, day: int, amount: int, account: int, category: int) -> None:
+        """Отменяет вклад операции (при изменении или удалении)."""
+        if not amount:
+            return
+        self._series(self._accounts, account).add(day, -amount)
+        self._series(self._income if amount > 0 else self._expense, category).add(day, -amount)
+
+    @staticmethod
+    def _prefix(series: _Series, end: Optional[int]) -> int:
+        """Сумма ряда за дни < end (None — за всё время, O(1))."""
+        if end is None:
+            return series.total
+        return series.prefix(end)
+
+    def _range(self, series: _Series, start: Optional[int], end: Optional[int]) -> int:
+        return self._prefix(series, end) - (self._prefix(series, start) if start is not None else 0)
+
+    def account_balances(self, until: Optional[int] = None) -> dict[int, int]:
+        """Код счёта → остаток на начало дня until."""
+        return {code: self._prefix(s, until) for code, s in self._accounts.items()}
+
+    def category_totals(self, start: Optional[int], end: Optional[int], sign: int = 0) -> dict[int, int]:
+        """Код категории → сумма за start <= день < end (sign: 1 — доходы, -1 — расходы)."""
+        totals: dict[int, int] = {}
+        if sign >= 0:
+            for code, series in self._income.items():
+                totals[code] = self._range(series, start, end)
+        if sign <= 0:
+            for code, series in self._expense.items():
+                totals[code] = totals.get(code, 0) + self._range(series, start, end)
+        return totals
+
+    def balance_series(self, start: int, end: int, account: Optional[int] = None) -> list[int]:
+        """Остаток на конец каждого дня start <= день < end: O(log K) + O(дней)."""
+        if account is not None:
+            series = [self._accounts[account]] if account in self._accounts else []
+        else:
+            series = list(self._accounts.values())
+        balance = sum(self._prefix(s, start) for s in series)
+        result = []
+        for day in range(start, end):
+            balance += sum(s.value(day) for s in series)
+            result.append(balance)
+        return result
+
+    def memory_bytes(self) -> int:
+        """Байт под суммы по дням во всех рядах (для проверок и бенчмарка)."""
+        return sum(
+            daily.itemsize * len(daily)
+            for table in (self._accounts, self._income, self._expense)
+            for s in table.values()
+            for daily in s.chunks.values()
+        )
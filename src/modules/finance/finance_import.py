@@ -0,0 +1,453 @@
+"""
+Потоковый импорт банковских выписок в журнал финансов: CSV и OFX.
+Файл читается построчно (OFX — кусками), строки разбираются пачками, и каждая
+пачка добавляется в FinanceBook одним блоком журнала — в памяти не больше
+одной пачки, сколько бы ни весил файл. Дубли отсеиваются по хэш-индексу уже
+записанных операций, так что повторный импорт той же выписки ничего не добавит.
+Прогресс — по прочитанным байтам; отмена оставляет уже добавленные пачки.
+"""
+
+import csv
+import html
+import io
+import os
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from .finance_journal import FinanceBook
+from .finance_ledger import MINOR_UNITS, Ledger, Transaction, to_epoch_day
+
+# Строк выписки в пачке: одна пачка — один блок журнала
+IMPORT_BATCH_SIZE = 5000
+DEFAULT_CATEGORY = "Без категории"
+DEFAULT_ACCOUNT = "Импорт"
+# Форматы дат после быстрых путей (ДД.ММ.ГГГГ и «15 марта 2024»)
+DATE_FORMATS = ("%d.%m.%Y", "%d.%m.%y", "%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y")
+# Даты операций в выписке: раньше — почти наверняка ошибка разбора или колонки
+MIN_STATEMENT_DATE = date(1990, 1, 1)
+# Позже сегодняшнего дня плюс столько — тоже
+MAX_STATEMENT_AHEAD = timedelta(days=366)
+
+_MONTHS = {
+    "янв": 1, "фев": 2, "мар": 3, "апр": 4, "май": 5, "мая": 5, "июн": 6,
+    "июл": 7, "авг": 8, "сен": 9, "окт": 10, "ноя": 11, "дек": 12,
+}
+_RU_DATE = re.compile(r"(\d{1,2})\s+([а-яё]+)\.?\s+(\d{4})", re.IGNORECASE)
+# Всё, кроме цифр, знаков и разделителей: пробелы, валюта («₽», «руб.»)
+_AMOUNT_JUNK = re.compile(r"[^0-9.,+\-()]")
+# Быстрый путь для обычной записи: «-1234,56» (или «-1234.56» без десятичной запятой)
+_PLAIN_AMOUNT = {
+    True: re.compile(r"(-?)(\d+)(?:,(\d\d?))?"),
+    False: re.compile(r"(-?)(\d+)(?:\.(\d\d?))?"),
+}
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)[^>]*>([^<]*)")
+# Синонимы заголовков для автоподбора колонок CSV
+_COLUMN_HINTS = {
+    "date": ("дата операции", "дата", "date", "дата платежа", "дата проводки"),
+    "amount": ("сумма операции", "сумма", "amount", "сумма в валюте счёта", "сумма в валюте счета"),
+    "credit": ("приход", "поступление", "зачисление", "кредит"),
+    "debit": ("расход", "списание", "дебет"),
+    "description": ("описание", "назначение платежа", "комментарий", "description", "наименование"),
+    "category": ("категория", "category"),
+    "account": ("счёт", "счет", "карта", "номер карты", "account"),
+}
+
+
+class StatementError(Exception):
+    """Файл не удалось разобрать как выписку (неизвестный формат, нет нужных колонок)."""
+
+
+Column = Union[str, int, None]
+
+
+@dataclass(frozen=True)
+class CsvOptions:
+    """
+    Настройки разбора CSV. Колонки — имя из заголовка или номер (с 0).
+    Сумма — из amount или, если он не задан, как credit − debit.
+    """
+
+    delimiter: str = ";"
+    encoding: str = "utf-8-sig"
+    decimal_comma: bool = True
+    has_header: bool = True
+    date: Column = "Дата операции"
+    amount: Column = "Сумма"
+    credit: Column = None
+    debit: Column = None
+    description: Column = "Описание"
+    category: Column = None
+    account: Column = None
+    default_account: str = DEFAULT_ACCOUNT
+    default_category: str = DEFAULT_CATEGORY
+    date_formats: tuple[str, ...] = DATE_FORMATS
+
+
+@dataclass
+class ImportResult:
+    read: int = 0  # разобранных строк
+    added: int = 0
+    duplicates: int = 0
+    errors: int = 0  # строк, которые не удалось разобрать
+    first_error: str = ""
+    cancelled: bool = False
+
+
+def check_statement_date(day: date) -> date:
+    """ValueError, если дата вне MIN_STATEMENT_DATE .. сегодня + MAX_STATEMENT_AHEAD."""
+    latest = date.today() + MAX_STATEMENT_AHEAD
+    if not MIN_STATEMENT_DATE <= day <= latest:
+        raise ValueError(
+            f"Дата вне {MIN_STATEMENT_DATE:%d.%m.%Y}–{latest:%d.%m.%Y}: {day.day:02d}.{day.month:02d}.{day.year:04d}"
+        )
+    return day
+
+
+def parse_date(text: str, formats: Iterable[str] = DATE_FORMATS) -> date:
+    """
+    «15.03.2024», «15.03.2024 14:22», «15 марта 2024», «2024-03-15» → date.
+    Дата вне допустимого окна (check_statement_date) — ValueError, как и нераспознанная.
+    """
+    text = text.strip()
+    if len(text) >= 10 and text[2] == "." and text[5] == "." and text[6:10].isdigit():
+        return check_statement_date(date(int(text[6:10]), int(text[3:5]), int(text[:2])))
+    m = _RU_DATE.match(text)
+    if m is not None:
+        month = _MONTHS.get(m.group(2).lower()[:3])
+        if month is not None:
+            return check_statement_date(date(int(m.group(3)), month, int(m.group(1))))
+    head = text.split(" ", 1)[0].split("T", 1)[0]
+    for fmt in formats:
+        try:
+            day = datetime.strptime(head, fmt).date()
+        except ValueError:
+            continue
+        return check_statement_date(day)
+    raise ValueError(f"Неизвестный формат даты: {text!r}")
+
+
+def parse_amount(text: str, decimal_comma: bool = True) -> int:
+    """
+    Сумма выписки → копейки: «−1 234,56 ₽», «(1,234.56)», «+500».
+    decimal_comma=False — запятая разделяет тысячи, точка — дробную часть.
+    Больше двух знаков после разделителя — ValueError, а не округление: так выглядит
+    сумма с разделителем тысяч при неверной настройке («1.234» в режиме точки).
+    """
+    m = _PLAIN_AMOUNT[decimal_comma].fullmatch(text)
+    if m is not None:
+        sign, units, fraction = m.groups()
+        minor = int(units) * MINOR_UNITS + (int(fraction.ljust(2, "0")) if fraction else 0)
+        return -minor if sign else minor
+    text = text.replace("−", "-")
+    cleaned = _AMOUNT_JUNK.sub("", text)
+    negative = cleaned.startswith("(") and cleaned.endswith(")")
+    cleaned = cleaned.strip("()")
+    if decimal_comma:
+        if "," in cleaned:
+            cleaned = cleaned.replace(".", "").replace(",", ".")
+    else:
+        cleaned = cleaned.replace(",", "")
+    if cleaned.startswith("+"):
+        cleaned = cleaned[1:]
+    if cleaned.startswith("-"):
+        negative = not negative
+        cleaned = cleaned[1:]
+    units, _, fraction = cleaned.partition(".")
+    if not units.isdigit() and not (units == "" and fraction.isdigit()):
+        raise ValueError(f"Некорректная сумма: {text!r}")
+    if fraction and not fraction.isdigit():
+        raise ValueError(f"Некорректная сумма: {text!r}")
+    if len(fraction) > 2:
+        raise ValueError(f"Больше двух знаков после разделителя: {text!r}")
+    minor = int(units or "0") * MINOR_UNITS + int(fraction.ljust(2, "0") or "0")
+    return -minor if negative else minor
+
+
+def guess_columns(header: list[str]) -> dict[str, str]:
+    """Поле CsvOptions → колонка заголовка, подобранная по синонимам."""
+    normalized = {name.strip().lower(): name for name in header}
+    guessed: dict[str, str] = {}
+    for fieldname, hints in _COLUMN_HINTS.items():
+        for hint in hints:
+            if hint in normalized:
+                guessed[fieldname] = normalized[hint]
+                break
+    return guessed
+
+
+def read_csv_header(path: Path, options: CsvOptions = CsvOptions()) -> list[str]:
+    """Первая строка CSV (для выбора колонок в интерфейсе)."""
+    with open(path, "r", encoding=options.encoding, errors="replace", newline="") as f:
+        return next(csv.reader(f, delimiter=options.delimiter), [])
+
+
+def sniff_delimiter(path: Path, encoding: str = "utf-8-sig") -> str:
+    """Разделитель по первым строкам файла: «;», «,» или табуляция."""
+    with open(path, "r", encoding=encoding, errors="replace", newline="") as f:
+        sample = f.read(16384)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=";,\t").delimiter
+    except csv.Error:
+        return ";"
+
+
+class _Rows:
+    """Разобранные строки и ошибки разбора одного файла."""
+
+    def __init__(self, raw: io.BufferedReader):
+        self.raw = raw
+        self.errors = 0
+        self.first_error = ""
+
+    @property
+    def position(self) -> int:
+        """Сколько байт файла уже прочитано (с точностью до буфера)."""
+        return self.raw.tell()
+
+    def error(self, message: str) -> None:
+        self.errors += 1
+        if not self.first_error:
+            self.first_error = message
+
+
+def _column_index(column: Column, header: Optional[list[str]], required: bool, name: str) -> Optional[int]:
+    if column is None or column == "":
+        if required:
+            raise StatementError(f"Не задана колонка «{name}»")
+        return None
+    if isinstance(column, int):
+        return column
+    if header is None:
+        raise StatementError(f"Колонка «{column}» задана по имени, но в файле нет заголовка")
+    try:
+        return header.index(column)
+    except ValueError:
+        stripped = [h.strip().lower() for h in header]
+        if column.strip().lower() in stripped:
+            return stripped.index(column.strip().lower())
+        raise StatementError(f"В файле нет колонки «{column}»") from None
+
+
+def _iter_csv(rows: _Rows, options: CsvOptions) -> Iterator[Transaction]:
+    text = io.TextIOWrapper(rows.raw, encoding=options.encoding, errors="replace", newline="")
+    try:
+        yield from _csv_transactions(rows, csv.reader(text, delimiter=options.delimiter), options)
+    finally:
+        text.detach()  # файл закрывает import_file, а не обёртка
+
+
+def _csv_transactions(rows: _Rows, reader: Iterator[list[str]], options: CsvOptions) -> Iterator[Transaction]:
+    header = next(reader, None) if options.has_header else None
+    i_date = _column_index(options.date, header, True, "дата")
+    i_amount = _column_index(options.amount, header, False, "сумма")
+    i_credit = _column_index(options.credit, header, False, "приход")
+    i_debit = _column_index(options.debit, header, False, "расход")
+    if i_amount is None and i_credit is None and i_debit is None:
+        raise StatementError("Не задана колонка суммы")
+    i_description = _column_index(options.description, header, False, "описание")
+    i_category = _column_index(options.category, header, False, "категория")
+    i_account = _column_index(options.account, header, False, "счёт")
+    decimal_comma, formats = options.decimal_comma, options.date_formats
+
+    def cell(row: list[str], index: Optional[int]) -> str:
+        return row[index].strip() if index is not None and index < len(row) else ""
+
+    for line, row in enumerate(reader, start=2 if header is not None else 1):
+        if not row or not any(row):
+            continue
+        try:
+            day = parse_date(cell(row, i_date), formats)
+            if i_amount is not None and cell(row, i_amount):
+                amount = parse_amount(cell(row, i_amount), decimal_comma)
+            else:
+                credit, debit = cell(row, i_credit), cell(row, i_debit)
+                amount = (parse_amount(credit, decimal_comma) if credit else 0) - (
+                    abs(parse_amount(debit, decimal_comma)) if debit else 0
+                )
+        except (ValueError, IndexError) as e:
+            rows.error(f"строка {line}: {e}")
+            continue
+        yield Transaction(
+            day=day,
+            amount=amount,
+            account=cell(row, i_account) or options.default_account,
+            category=cell(row, i_category) or options.default_category,
+            description=cell(row, i_description),
+        )
+
+
+def _ofx_encoding(head: bytes) -> str:
+    """Кодировка OFX по заголовку: OFX 1.x (CHARSET:1251) или XML (encoding=...)."""
+    text = head.decode("ascii", errors="replace").upper()
+    if "CHARSET:1251" in text or "WINDOWS-1251" in text:
+        return "cp1251"
+    return "utf-8-sig"
+
+
+def _ofx_tokens(text: io.TextIOBase) -> Iterator[tuple[bool, str, str]]:
+    """(закрывающий ли тег, имя, текст после тега) — по кускам файла."""
+    buffer = ""
+    while True:
+        chunk = text.read(65536)
+        if not chunk:
+            break
+        buffer += chunk
+        cut = buffer.rfind("<")
+        if cut <= 0:
+            continue
+        for m in _OFX_TAG.finditer(buffer, 0, cut):
+            yield m.group(1) == "/", m.group(2).upper(), m.group(3).strip()
+        buffer = buffer[cut:]
+    for m in _OFX_TAG.finditer(buffer):
+        yield m.group(1) == "/", m.group(2).upper(), m.group(3).strip()
+
+
+def _iter_ofx(rows: _Rows, options: CsvOptions) -> Iterator[Transaction]:
+    """
+    Операции STMTTRN из OFX 1.x (SGML, теги полей не закрываются) и OFX 2.x (XML).
+    Счёт — ACCTID выписки, описание — NAME и MEMO.
+    """
+    head = rows.raw.peek(1024)[:1024]
+    text = io.TextIOWrapper(rows.raw, encoding=_ofx_encoding(head), errors="replace")
+    try:
+        yield from _ofx_transactions(rows, _ofx_tokens(text), options)
+    finally:
+        text.detach()
+
+
+def _ofx_transactions(
+    rows: _Rows, tokens: Iterator[tuple[bool, str, str]], options: CsvOptions
+) -> Iterator[Transaction]:
+    account = options.default_account
+    current: Optional[dict[str, str]] = None
+    for closing, tag, value in tokens:
+        if tag == "STMTTRN":
+            if not closing:
+                current = {}
+                continue
+            fields, current = current, None
+            if fields is None:
+                continue
+            try:
+                posted = fields.get("DTPOSTED", "")
+                day = check_statement_date(date(int(posted[:4]), int(posted[4:6]), int(posted[6:8])))
+                amount = parse_amount(fields.get("TRNAMT", ""), decimal_comma=True)
+            except (ValueError, IndexError) as e:
+                rows.error(f"операция {fields.get('FITID', '?')}: {e}")
+                continue
+            description = " ".join(v for v in (fields.get("NAME", ""), fields.get("MEMO", "")) if v)
+            yield Transaction(day, amount, account, options.default_category, description)
+        elif not closing and value:
+            if "&" in value:
+                value = html.unescape(value)
+            if current is not None:
+                current[tag] = value
+            elif tag == "ACCTID":
+                account = value
+
+
+# Формат → функция разбора
+FORMATS: dict[str, Callable[[_Rows, CsvOptions], Iterator[Transaction]]] = {
+    "csv": _iter_csv,
+    "ofx": _iter_ofx,
+}
+
+
+def format_for_path(path: Path) -> str:
+    return "ofx" if Path(path).suffix.lower() in (".ofx", ".qfx") else "csv"
+
+
+_Key = tuple[int, int, str, str]
+
+
+def _key(day: int, amount: int, account: str, description: str) -> _Key:
+    # Сам кортеж, а не hash(): операции с совпавшим хэшем не должны делить счётчик
+    return (day, amount, account, description)
+
+
+class DedupIndex:
+    """
+    Хэш-индекс операций: ключ (день, сумма, счёт, описание) → сколько таких уже есть.
+    Категория в ключ не входит — её меняют вручную после импорта.
+    Счётчики, а не множество: две одинаковые покупки в один день из одной выписки
+    обе добавятся, а при повторном импорте той же выписки — ни одна.
+    """
+
+    def __init__(self, ledger: Ledger):
+        counts: dict[_Key, int] = {}
+        accounts, descriptions, deleted = ledger.accounts.values, ledger.descriptions, ledger.deleted
+        for i in range(len(ledger)):
+            if i in deleted:
+                continue
+            key = _key(ledger.days[i], ledger.amounts[i], accounts[ledger.account_ids[i]], descriptions[i])
+            counts[key] = counts.get(key, 0) + 1
+        self._existing = counts
+        self._seen: dict[_Key, int] = {}
+
+    def is_new(self, tx: Transaction) -> bool:
+        """Учитывает операцию из файла; True — её ещё нет в журнале."""
+        key = _key(to_epoch_day(tx.day), tx.amount, tx.account, tx.description)
+        seen = self._seen[key] = self._seen.get(key, 0) + 1
+        if seen > self._existing.get(key, 0):
+            self._existing[key] = seen
+            return True
+        return False
+
+
+def import_file(
+    book: FinanceBook,
+    file_path: Path,
+    options: CsvOptions = CsvOptions(),
+    fmt: Optional[str] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportResult:
+    """
+    Импортирует выписку в book; новые операции из каждых batch_size строк — одним блоком.
+    fmt — "csv" или "ofx" (по умолчанию — по расширению), options — разбор CSV
+    (для OFX — только счёт и категория по умолчанию).
+    progress(байт прочитано, размер файла) — после каждой пачки (из потока импорта);
+    установленный cancel останавливает импорт после текущей пачки.
+    """
+    file_path = Path(file_path)
+    fmt = fmt or format_for_path(file_path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат выписки: {fmt}")
+    total = os.path.getsize(file_path)
+    result = ImportResult()
+    index = DedupIndex(book.ledger)
+    with open(file_path, "rb") as raw:
+        rows = _Rows(raw)
+        batch: list[Transaction] = []
+
+        def commit() -> None:
+            if batch:
+                book.add_many(batch)
+                result.added += len(batch)
+                batch.clear()
+            if progress is not None:
+                progress(min(rows.position, total), total)
+
+        if progress is not None:
+            progress(0, total)
+        for tx in FORMATS[fmt](rows, options):
+            result.read += 1
+            if index.is_new(tx):
+                batch.append(tx)
+            else:
+                result.duplicates += 1
+            if result.read % batch_size == 0:
+                commit()
+                if cancel is not None and cancel.is_set():
+                    result.cancelled = True
+                    break
+        commit()
+    result.errors, result.first_error = rows.errors, rows.first_error
+    if progress is not None and not result.cancelled:
+        progress(total, total)
+    return result
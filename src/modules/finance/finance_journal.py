@@ -0,0 +1,501 @@
+"""
+Зашифрованный журнал операций: файл только на добавление из независимых блоков.
+Каждый блок — AES-GCM (шифрование с проверкой подлинности) над пачкой операций;
+ключ выводится из пароля (scrypt) один раз при открытии и живёт до close().
+Новая операция — один небольшой блок в конце файла с fsync, без перешифровки
+остального; изменение и удаление — тоже блок (номер операции и новые значения
+или только номера). При открытии блоки читаются и воспроизводятся по одному прямо
+в Ledger; накопившиеся изменения сворачиваются перезаписью файла (compact) изредка.
+
+Формат файла:
+    заголовок  "PDFL", версия, параметры scrypt (log2 N, r, p), соль 16 байт;
+    проверка   nonce 12 байт + тег 16 байт (AES-GCM пустого текста с заголовком
+               как AAD) — неверный пароль виден сразу, а не на первом блоке;
+    блоки      длина (uint32) + nonce 12 байт + шифртекст с тегом; открытый
+               текст — тип блока (1 байт: добавление, изменение, удаление) и записи.
+AAD блока — соль и порядковый номер блока: блоки нельзя переставить или подменить
+блоками другого файла. Недописанный хвост (сбой во время записи) отбрасывается.
+"""
+
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .finance_ledger import Ledger, Transaction, to_epoch_day
+
+JOURNAL_NAME = "ledger.journal"
+FORMAT_VERSION = 2
+MAGIC = b"PDFL"
+# Параметры scrypt для новых файлов: ~0.1 с и 32 МиБ на вывод ключа
+SCRYPT_LOG2_N = 15
+SCRYPT_R = 8
+SCRYPT_P = 1
+# Операций в блоке при перезаписи журнала (compact)
+COMPACT_BLOCK_SIZE = 4096
+# Блоков изменений и удалений, после которых журнал сворачивается при открытии
+COMPACT_AFTER_EDITS = 256
+# ...и если блоков больше, чем операций / COMPACT_ROWS_PER_BLOCK (добавления по одной):
+# чтение тысяч мелких блоков в десятки раз медленнее, чем тех же операций крупными
+COMPACT_ROWS_PER_BLOCK = 64
+# Мелкий журнал читается быстро и так — не перезаписывается на каждом открытии
+COMPACT_MIN_BLOCKS = 256
+
+_HEADER = struct.Struct("<4sBBBB16s")
+_LENGTH = struct.Struct("<I")
+_SEQ = struct.Struct("<Q")
+# Операция в блоке: день, сумма, длины счёта, категории и описания (UTF-8), затем строки
+_TX = struct.Struct("<iqHHI")
+# Номер операции в блоках изменения и удаления
+_INDEX = struct.Struct("<I")
+# Тип блока — первый байт открытого текста
+_ADD = b"A"
+_UPDATE = b"U"
+_DELETE = b"D"
+_NONCE_SIZE = 12
+_TAG_SIZE = 16
+_CHECK_SIZE = _NONCE_SIZE + _TAG_SIZE
+# Защита от порчи поля длины: больше этого блоки не пишутся
+_MAX_BLOCK = 64 * 2 ** 20
+
+
+class JournalError(Exception):
+    """Файл журнала повреждён или не является журналом операций."""
+
+
+class WrongPassword(JournalError):
+    """Пароль не подходит к журналу."""
+
+
+class JournalUnavailable(Exception):
+    """Не установлен пакет cryptography."""
+
+
+def _aead(key: bytes):
+    try:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    except ImportError:
+        raise JournalUnavailable("Для журнала финансов нужен пакет cryptography") from None
+    return AESGCM(key)
+
+
+def derive_key(password: str, salt: bytes, log2_n: int = SCRYPT_LOG2_N, r: int = SCRYPT_R, p: int = SCRYPT_P) -> bytes:
+    """256-битный ключ из пароля (scrypt). Медленно намеренно — вызывается раз за сеанс."""
+    try:
+        from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+    except ImportError:
+        raise JournalUnavailable("Для журнала финансов нужен пакет cryptography") from None
+    return Scrypt(salt=salt, length=32, n=2 ** log2_n, r=r, p=p).derive(password.encode("utf-8"))
+
+
+def _pack_row(parts: list, day: int, amount: int, account: str, category: str, description: str) -> None:
+    account_raw = account.encode("utf-8")
+    category_raw = category.encode("utf-8")
+    description_raw = description.encode("utf-8")
+    parts.append(_TX.pack(day, amount, len(account_raw), len(category_raw), len(description_raw)))
+    parts.append(account_raw)
+    parts.append(category_raw)
+    parts.append(description_raw)
+
+
+def encode_rows(rows: Iterable[tuple[int, int, str, str, str]]) -> bytes:
+    """Строки (день, сумма, счёт, категория, описание) → открытый текст блока добавления."""
+    parts = [_ADD]
+    for row in rows:
+        _pack_row(parts, *row)
+    return b"".join(parts) if len(parts) > 1 else b""
+
+
+def encode_transactions(transactions: Iterable[Transaction]) -> bytes:
+    """Пачка операций → открытый текст блока добавления (пустой — b"")."""
+    return encode_rows(
+        (to_epoch_day(tx.day), tx.amount, tx.account, tx.category, tx.description) for tx in transactions
+    )
+
+
+def encode_update(index: int, tx: Transaction) -> bytes:
+    parts = [_UPDATE, _INDEX.pack(index)]
+    _pack_row(parts, to_epoch_day(tx.day), tx.amount, tx.account, tx.category, tx.description)
+    return b"".join(parts)
+
+
+def encode_deletes(indices: Iterable[int]) -> bytes:
+    """Номера удалённых операций → открытый текст блока удаления (пустой — b"")."""
+    indices = list(indices)
+    return _DELETE + struct.pack(f"<{len(indices)}I", *indices) if indices else b""
+
+
+def _decode_rows(payload: bytes, pos: int, names: dict[bytes, str], indexed: bool) -> list[tuple]:
+    """
+    Записи блока с позиции pos; indexed — перед каждой записью номер операции.
+    names — общий для всех блоков кэш декодированных счетов и категорий.
+    """
+    unpack_from, size = _TX.unpack_from, _TX.size
+    rows = []
+    end = len(payload)
+    try:
+        while pos < end:
+            if indexed:
+                (index,) = _INDEX.unpack_from(payload, pos)
+                pos += _INDEX.size
+            day, amount, n_account, n_category, n_description = unpack_from(payload, pos)
+            pos += size
+            raw = payload[pos:pos + n_account]
+            account = names.get(raw) or names.setdefault(raw, raw.decode("utf-8"))
+            pos += n_account
+            raw = payload[pos:pos + n_category]
+            category = names.get(raw) or names.setdefault(raw, raw.decode("utf-8"))
+            pos += n_category
+            description = payload[pos:pos + n_description].decode("utf-8") if n_description else ""
+            pos += n_description
+            row = (day, amount, account, category, description)
+            rows.append((index, *row) if indexed else row)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise JournalError(f"Некорректный блок журнала: {e}") from None
+    if pos != end:
+        raise JournalError("Некорректный блок журнала: лишние байты")
+    return rows
+
+
+def _decode_into(ledger: Ledger, payload: bytes, names: dict[bytes, str]) -> int:
+    """Открытый текст блока → изменения в ledger; возвращает число добавленных операций."""
+    kind = payload[:1]
+    if kind == _ADD:
+        rows = _decode_rows(payload, 1, names, indexed=False)
+        # Блок целиком: итоги Ledger пересчитаются один раз, при первом запросе
+        ledger.extend_epoch_days(rows)
+        return len(rows)
+    try:
+        if kind == _UPDATE:
+            for row in _decode_rows(payload, 1, names, indexed=True):
+                ledger.update_epoch_day(*row)
+        elif kind == _DELETE:
+            if (len(payload) - 1) % _INDEX.size:
+                raise JournalError("Некорректный блок удаления")
+            for (index,) in _INDEX.iter_unpack(payload[1:]):
+                ledger.delete(index)
+        else:
+            raise JournalError(f"Неизвестный тип блока: {kind!r}")
+    except (IndexError, KeyError) as e:
+        raise JournalError(f"Изменение несуществующей операции: {e}") from None
+    return 0
+
+
+def _fsync_dir(folder: Path) -> None:
+    """fsync каталога после переименования (только POSIX)."""
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class LedgerJournal:
+    """
+    Открытый журнал операций. Ключ выводится в конструкторе; append*() и compact()
+    потокобезопасны (импорт пишет из рабочего потока). edit_blocks — блоков изменений
+    и удалений после последнего compact(): по нему FinanceBook решает, когда сворачивать.
+    """
+
+    def __init__(self, path: Path, password: str):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+        self._blocks = 0  # блоков в файле (следующий номер для AAD)
+        self._valid_end: Optional[int] = None  # конец последнего целого блока
+        self.edit_blocks = 0
+        if self._path.exists() and self._path.stat().st_size > 0:
+            with open(self._path, "rb") as f:
+                header = f.read(_HEADER.size)
+                check = f.read(_CHECK_SIZE)
+            self._open_existing(header, check, password)
+        else:
+            self._create(password)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def block_count(self) -> int:
+        """Блоков в файле (после чтения или записи)."""
+        return self._blocks
+
+    def needs_compaction(self, rows: int) -> bool:
+        """Стоит ли свернуть журнал из rows операций: много изменений или мелких блоков."""
+        if self.edit_blocks >= COMPACT_AFTER_EDITS:
+            return True
+        return self._blocks >= COMPACT_MIN_BLOCKS and self._blocks * COMPACT_ROWS_PER_BLOCK > rows
+
+    def _open_existing(self, header: bytes, check: bytes, password: str) -> None:
+        if len(header) < _HEADER.size or len(check) < _CHECK_SIZE:
+            raise JournalError("Файл журнала обрезан")
+        magic, version, log2_n, r, p, salt = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise JournalError("Файл не является журналом операций")
+        if version != FORMAT_VERSION:
+            raise JournalError(f"Неподдерживаемая версия журнала: {version}")
+        self._header = header
+        self._salt = salt
+        self._aead = _aead(derive_key(password, salt, log2_n, r, p))
+        self._verify(check)
+
+    def _verify(self, check: bytes) -> None:
+        from cryptography.exceptions import InvalidTag
+
+        try:
+            self._aead.decrypt(check[:_NONCE_SIZE], check[_NONCE_SIZE:], self._header)
+        except InvalidTag:
+            raise WrongPassword("Неверный пароль журнала") from None
+
+    def _create(self, password: str) -> None:
+        salt = os.urandom(16)
+        self._header = _HEADER.pack(MAGIC, FORMAT_VERSION, SCRYPT_LOG2_N, SCRYPT_R, SCRYPT_P, salt)
+        self._salt = salt
+        self._aead = _aead(derive_key(password, salt, SCRYPT_LOG2_N, SCRYPT_R, SCRYPT_P))
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_file(self._path, ())
+        self._valid_end = self._path.stat().st_size
+
+    def _check_block(self) -> bytes:
+        nonce = os.urandom(_NONCE_SIZE)
+        return nonce + self._aead.encrypt(nonce, b"", self._header)
+
+    def _seal(self, payload: bytes, seq: int) -> bytes:
+        nonce = os.urandom(_NONCE_SIZE)
+        sealed = nonce + self._aead.encrypt(nonce, payload, self._salt + _SEQ.pack(seq))
+        if len(sealed) > _MAX_BLOCK:
+            raise ValueError("Слишком большой блок журнала")
+        return _LENGTH.pack(len(sealed)) + sealed
+
+    def _write_file(self, path: Path, payloads: Iterable[bytes]) -> int:
+        """Новый файл: заголовок, проверка пароля, блоки; возвращает число блоков."""
+        count = 0
+        with open(path, "wb") as f:
+            f.write(self._header)
+            f.write(self._check_block())
+            for payload in payloads:
+                f.write(self._seal(payload, count))
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        _fsync_dir(path.parent)
+        return count
+
+    def _iter_payloads(self) -> Iterator[bytes]:
+        """Расшифрованные блоки по одному; отмечает конец последнего целого блока."""
+        from cryptography.exceptions import InvalidTag
+
+        seq = edits = 0
+        with open(self._path, "rb") as f:
+            f.seek(_HEADER.size + _CHECK_SIZE)
+            offset = f.tell()
+            while True:
+                prefix = f.read(_LENGTH.size)
+                if len(prefix) < _LENGTH.size:
+                    break
+                (length,) = _LENGTH.unpack(prefix)
+                if length < _CHECK_SIZE or length > _MAX_BLOCK:
+                    raise JournalError(f"Повреждён блок {seq}: длина {length}")
+                sealed = f.read(length)
+                if len(sealed) < length:
+                    break  # недописанный хвост
+                try:
+                    payload = self._aead.decrypt(
+                        sealed[:_NONCE_SIZE], sealed[_NONCE_SIZE:], self._salt + _SEQ.pack(seq)
+                    )
+                except InvalidTag:
+                    raise JournalError(f"Повреждён блок {seq}: не прошла проверка подлинности") from None
+                offset += _LENGTH.size + length
+                seq += 1
+                if payload[:1] != _ADD:
+                    edits += 1
+                yield payload
+        with self._lock:
+            self._blocks, self._valid_end = seq, offset
+            self.edit_blocks = edits
+
+    def read_into(self, ledger: Ledger) -> int:
+        """
+        Потоково расшифровывает журнал в ledger (добавления, изменения, удаления);
+        возвращает число добавленных операций.
+        """
+        names: dict[bytes, str] = {}
+        return sum(_decode_into(ledger, payload, names) for payload in self._iter_payloads())
+
+    def _ensure_scanned(self) -> None:
+        # Вызывается под self._lock: дописывать можно только после целых блоков
+        if self._valid_end is None:
+            self._lock.release()
+            try:
+                for _ in self._iter_payloads():
+                    pass
+            finally:
+                self._lock.acquire()
+
+    def append(self, transactions: Iterable[Transaction]) -> None:
+        """Дописывает операции одним блоком (с fsync)."""
+        self._append_payload(encode_transactions(transactions))
+
+    def append_update(self, index: int, tx: Transaction) -> None:
+        """Дописывает блок изменения операции index (номер — как в Ledger)."""
+        self._append_payload(encode_update(index, tx))
+
+    def append_deletes(self, indices: Iterable[int]) -> None:
+        """Дописывает блок удаления операций."""
+        self._append_payload(encode_deletes(indices))
+
+    def _append_payload(self, payload: bytes) -> None:
+        if not payload:
+            return
+        with self._lock:
+            self._ensure_scanned()
+            if self._file is None:
+                self._file = open(self._path, "r+b")
+                # Отрезаем недописанный хвост прошлого сеанса
+                self._file.truncate(self._valid_end)
+                self._file.seek(self._valid_end)
+            block = self._seal(payload, self._blocks)
+            self._file.write(block)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._blocks += 1
+            self._valid_end += len(block)
+            if payload[:1] != _ADD:
+                self.edit_blocks += 1
+
+    def compact(self, ledger: Ledger, block_size: int = COMPACT_BLOCK_SIZE) -> None:
+        """
+        Перезаписывает журнал содержимым ledger крупными блоками: изменения сворачиваются,
+        открытие после множества одиночных добавлений быстрее. Номера операций
+        сохраняются — удалённые пишутся вместе с блоком удаления, так что дописывать
+        изменения к ledger можно и дальше. Содержимое берётся снимком под блокировкой
+        Ledger; ключ прежний, файл заменяется атомарно.
+        """
+        snapshot = ledger.snapshot()
+
+        def payloads() -> Iterator[bytes]:
+            for start in range(0, len(snapshot), block_size):
+                yield encode_rows(snapshot.rows(start, start + block_size))
+            if snapshot.deleted:
+                yield encode_deletes(snapshot.deleted)
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            tmp = self._path.with_name(self._path.name + ".tmp")
+            try:
+                blocks = self._write_file(tmp, payloads())
+                os.replace(tmp, self._path)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            _fsync_dir(self._path.parent)
+            self._blocks = blocks
+            self._valid_end = self._path.stat().st_size
+            self.edit_blocks = 1 if snapshot.deleted else 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def open_journal(folder: Path, password: str, ledger: Optional[Ledger] = None) -> tuple[LedgerJournal, Ledger]:
+    """Открывает (или создаёт) журнал в папке и загружает операции в ledger (по умолчанию — новый)."""
+    ledger = ledger if ledger is not None else Ledger()
+    journal = LedgerJournal(Path(folder) / JOURNAL_NAME, password)
+    journal.read_into(ledger)
+    return journal, ledger
+
+
+class FinanceBook:
+    """
+    Журнал операций сеанса: Ledger в памяти + зашифрованный файл.
+    До open() операции живут только в памяти; add(), update() и delete() пишут
+    сначала в файл, затем в Ledger — при ошибке записи изменение не появится в памяти.
+    Запись в файл и в Ledger идёт под одной блокировкой: импорт из рабочего потока
+    не перемешивается с правкой из интерфейса.
+    """
+
+    def __init__(self, folder: Path):
+        self._folder = Path(folder)
+        self._lock = threading.Lock()
+        self.ledger = Ledger()
+        self.journal: Optional[LedgerJournal] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.journal is not None
+
+    def open(self, password: str) -> int:
+        """
+        Выводит ключ и загружает журнал; возвращает число операций.
+        Можно вызывать из рабочего потока: ledger и journal заменяются в конце.
+        Если накопилось много изменений или мелких блоков (needs_compaction), журнал
+        сворачивается: удалённые операции выбрасываются, номера остальных сдвигаются.
+        Операции, добавленные до open(), дописываются в журнал.
+        """
+        journal, ledger = open_journal(self._folder, password)
+        if journal.needs_compaction(len(ledger)):
+            if ledger.deleted:
+                # Ledger ещё никому не отдан — можно перенумеровать операции
+                live = Ledger()
+                live.extend_epoch_days(ledger.snapshot().live_rows())
+                ledger = live
+            journal.compact(ledger)
+        with self._lock:
+            pending = list(self.ledger)
+            if pending:
+                journal.append(pending)
+                ledger.extend(pending)
+            self.ledger, self.journal = ledger, journal
+        return ledger.live_count()
+
+    def add(self, tx: Transaction) -> int:
+        return self.add_many((tx,))
+
+    def add_many(self, transactions: Iterable[Transaction]) -> int:
+        """Добавляет операции одним блоком журнала; возвращает номер последней."""
+        transactions = list(transactions)
+        with self._lock:
+            if self.journal is not None:
+                self.journal.append(transactions)
+            self.ledger.extend(transactions)
+            return len(self.ledger) - 1
+
+    def update(self, index: int, tx: Transaction) -> None:
+        """Изменяет операцию: блок изменения в журнал, итоги Ledger — на разницу."""
+        with self._lock:
+            index = self.ledger.live_index(index)
+            if self.journal is not None:
+                self.journal.append_update(index, tx)
+            self.ledger.update(index, tx)
+
+    def delete(self, index: int) -> None:
+        """Удаляет операцию (номера остальных не меняются до сворачивания при открытии)."""
+        with self._lock:
+            index = self.ledger.live_index(index)
+            if self.journal is not None:
+                self.journal.append_deletes((index,))
+            self.ledger.delete(index)
+
+    def compact(self) -> None:
+        """Сворачивает журнал (номера операций сохраняются)."""
+        with self._lock:
+            if self.journal is not None:
+                self.journal.compact(self.ledger)
+
+    def close(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
@@ -0,0 +1,351 @@
+"""
+Движок учёта финансов: журнал операций в памяти, хранимый столбцами.
+Сумма — int64 в минимальных единицах (копейки), дата — номер дня от 1970-01-01,
+счёт и категория — коды словарей строк. Добавление — O(1) (дописывание в массивы)
+плюс O(log K) на итоги: остатки и суммы по категориям берутся из
+материализованных префиксных сумм (finance_aggregates), а не проходом по операциям.
+Модуль не зависит от Qt: движок используется и тестируется без интерфейса.
+"""
+
+import threading
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Iterable, Iterator, Optional, Union
+
+from .finance_aggregates import LedgerAggregates
+
+MINOR_UNITS = 100  # копеек в рубле
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Допустимые даты операций: дата вне окна — почти всегда ошибка разбора
+MIN_DATE = date(1900, 1, 1)
+MAX_DATE = date(2199, 12, 31)
+
+
+def to_epoch_day(value: date) -> int:
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def from_epoch_day(value: int) -> date:
+    return date.fromordinal(value + _EPOCH_ORDINAL)
+
+
+_MIN_DAY = to_epoch_day(MIN_DATE)
+_MAX_DAY = to_epoch_day(MAX_DATE)
+
+
+def _check_day(day: int) -> None:
+    if not _MIN_DAY <= day <= _MAX_DAY:
+        raise ValueError(f"Дата операции вне {MIN_DATE:%d.%m.%Y}–{MAX_DATE:%d.%m.%Y}: день {day}")
+
+
+def to_minor(amount: Union[str, int, float, Decimal]) -> int:
+    """Сумма в рублях ("1 234,50", 1234.5, Decimal) → копейки, округление половины вверх."""
+    if isinstance(amount, int):
+        return amount * MINOR_UNITS
+    if isinstance(amount, str):
+        amount = amount.replace(" ", "").replace("\u00a0", "").replace(",", ".")
+    try:
+        value = Decimal(str(amount)) if isinstance(amount, float) else Decimal(amount)
+    except InvalidOperation:
+        raise ValueError(f"Некорректная сумма: {amount!r}") from None
+    return int((value * MINOR_UNITS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def format_minor(minor: int) -> str:
+    """Копейки → "-1 234,50"."""
+    sign = "-" if minor < 0 else ""
+    units, cents = divmod(abs(minor), MINOR_UNITS)
+    return f"{sign}{units:,}".replace(",", " ") + f",{cents:02d}"
+
+
+@dataclass(slots=True, frozen=True)
+class Transaction:
+    """Одна операция: доход (amount > 0) или расход (amount < 0), в копейках."""
+
+    day: date
+    amount: int
+    account: str
+    category: str
+    description: str = ""
+
+
+class StringDictionary:
+    """Словарь строк: значение ↔ код (номер в порядке появления)."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+        for v in values:
+            self.code(v)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: str) -> int:
+        """Код значения; новое значение добавляется в конец."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def find(self, value: str) -> int:
+        """Код или -1, если значения нет."""
+        return self._codes.get(value, -1)
+
+
+class Ledger:
+    """
+    Операции столбцами: days (int32), amounts (int64), account_ids/category_ids
+    (uint32, коды словарей accounts/categories), descriptions (строки).
+    Номер операции — её позиция и не меняется: удалённая операция остаётся на месте
+    с отметкой в deleted, изменение переписывает её столбцы.
+    Итоги (остатки, суммы по категориям) ведутся в LedgerAggregates при каждом
+    изменении и не требуют прохода по операциям.
+    Изменения и запросы идут под блокировкой: импорт дописывает операции из рабочего
+    потока, пока интерфейс читает итоги. Длина — по последнему дописываемому столбцу,
+    поэтому операция с номером < len() видна целиком во всех столбцах.
+    """
+
+    def __init__(self):
+        self.days = array("i")
+        self.amounts = array("q")
+        self.account_ids = array("I")
+        self.category_ids = array("I")
+        self.descriptions: list[str] = []
+        self.accounts = StringDictionary()
+        self.categories = StringDictionary()
+        self.deleted: set[int] = set()
+        # Растёт при изменении и удалении (не при добавлении): представления
+        # по нему понимают, что пересчитать сортировку
+        self.edit_version = 0
+        self._aggregates = LedgerAggregates()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Число строк, включая удалённые (номер следующей операции)."""
+        return len(self.descriptions)
+
+    def live_count(self) -> int:
+        return len(self.descriptions) - len(self.deleted)
+
+    def is_deleted(self, index: int) -> bool:
+        return index in self.deleted
+
+    def add(self, day: date, amount: int, account: str, category: str, description: str = "") -> int:
+        """Добавляет операцию (amount в копейках) и возвращает её номер."""
+        return self.add_epoch_day(to_epoch_day(day), amount, account, category, description)
+
+    def add_epoch_day(self, day: int, amount: int, account: str, category: str, description: str = "") -> int:
+        """add() с датой в виде номера дня — для загрузки из файла без перевода в date."""
+        with self._lock:
+            return self._append(day, amount, account, category, description, False)
+
+    def _append(self, day: int, amount: int, account: str, category: str, description: str, bulk: bool) -> int:
+        # Вызывается под self._lock; descriptions — последним (см. __len__)
+        _check_day(day)
+        amount = int(amount)
+        account_id = self.accounts.code(account)
+        category_id = self.categories.code(category)
+        self.days.append(day)
+        self.amounts.append(amount)
+        self.account_ids.append(account_id)
+        self.category_ids.append(category_id)
+        self.descriptions.append(description)
+        if not bulk:
+            self._aggregates.add(day, amount, account_id, category_id)
+        return len(self.descriptions) - 1
+
+    def add_transaction(self, tx: Transaction) -> int:
+        return self.add(tx.day, tx.amount, tx.account, tx.category, tx.description)
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        """Добавляет пачку операций под одной блокировкой; итоги пересчитаются при запросе."""
+        with self._lock:
+            start = len(self.descriptions)
+            try:
+                for tx in transactions:
+                    self._append(to_epoch_day(tx.day), tx.amount, tx.account, tx.category, tx.description, True)
+            finally:
+                # Строки до ошибочной остаются в журнале — и в итогах
+                self._aggregate_from(start)
+
+    def extend_epoch_days(self, rows: Iterable[tuple[int, int, str, str, str]]) -> None:
+        """extend() для строк (день, сумма, счёт, категория, описание) — загрузка из файла."""
+        with self._lock:
+            start = len(self.descriptions)
+            try:
+                for row in rows:
+                    self._append(*row, True)
+            finally:
+                self._aggregate_from(start)
+
+    def _aggregate_from(self, start: int) -> None:
+        # Под self._lock: итоги по строкам start.., добавленным с bulk
+        self._aggregates.extend(
+            self.days[start:], self.amounts[start:], self.account_ids[start:], self.category_ids[start:]
+        )
+
+    def live_index(self, index: int) -> int:
+        """Номер существующей операции (отрицательный — с конца); IndexError или KeyError (удалена)."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Ledger index out of range")
+        if index in self.deleted:
+            raise KeyError(f"Операция {index} удалена")
+        return index
+
+    def _forget(self, index: int) -> None:
+        # Под self._lock: убирает вклад операции из итогов
+        self._aggregates.remove(
+            self.days[index], self.amounts[index], self.account_ids[index], self.category_ids[index]
+        )
+
+    def update(self, index: int, tx: Transaction) -> None:
+        """Заменяет операцию index; итоги меняются на разницу — O(log K)."""
+        self.update_epoch_day(index, to_epoch_day(tx.day), tx.amount, tx.account, tx.category, tx.description)
+
+    def update_epoch_day(
+        self, index: int, day: int, amount: int, account: str, category: str, description: str = ""
+    ) -> None:
+        """update() с датой в виде номера дня — для воспроизведения журнала."""
+        with self._lock:
+            index = self.live_index(index)
+            _check_day(day)
+            self._forget(index)
+            amount = int(amount)
+            account_id = self.accounts.code(account)
+            category_id = self.categories.code(category)
+            self.days[index] = day
+            self.amounts[index] = amount
+            self.account_ids[index] = account_id
+            self.category_ids[index] = category_id
+            self.descriptions[index] = description
+            self._aggregates.add(day, amount, account_id, category_id)
+            self.edit_version += 1
+
+    def delete(self, index: int) -> None:
+        """Удаляет операцию index (номера остальных не меняются)."""
+        with self._lock:
+            index = self.live_index(index)
+            self._forget(index)
+            self.deleted.add(index)
+            self.edit_version += 1
+
+    def __getitem__(self, index: int) -> Transaction:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Ledger index out of range")
+        return Transaction(
+            day=from_epoch_day(self.days[index]),
+            amount=self.amounts[index],
+            account=self.accounts.values[self.account_ids[index]],
+            category=self.categories.values[self.category_ids[index]],
+            description=self.descriptions[index],
+        )
+
+    def __iter__(self) -> Iterator[Transaction]:
+        """Операции без удалённых."""
+        deleted = self.deleted
+        for i in range(len(self)):
+            if i not in deleted:
+                yield self[i]
+
+    def snapshot(self) -> "LedgerSnapshot":
+        """Копия столбцов под блокировкой — для записи на диск, пока журнал пополняется."""
+        with self._lock:
+            return LedgerSnapshot(
+                days=self.days[:],
+                amounts=self.amounts[:],
+                account_ids=self.account_ids[:],
+                category_ids=self.category_ids[:],
+                descriptions=self.descriptions[:],
+                accounts=self.accounts.values[:],
+                categories=self.categories.values[:],
+                deleted=sorted(self.deleted),
+            )
+
+    # --- Итоги ---
+
+    @staticmethod
+    def _day(value: Optional[date]) -> Optional[int]:
+        return to_epoch_day(value) if value is not None else None
+
+    def balance(self, account: Optional[str] = None, until: Optional[date] = None) -> int:
+        """Остаток (копейки) по счёту или по всем счетам на начало дня until."""
+        totals = self.account_balances(until)
+        if account is None:
+            return sum(totals.values())
+        return totals.get(account, 0)
+
+    def account_balances(self, until: Optional[date] = None) -> dict[str, int]:
+        with self._lock:
+            totals = self._aggregates.account_balances(self._day(until))
+            names = self.accounts.values
+            return {names[code]: total for code, total in totals.items()}
+
+    def category_totals(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        sign: int = 0,
+    ) -> dict[str, int]:
+        """
+        Суммы по категориям за start <= день < end (копейки; расходы — отрицательные).
+        sign: 1 — только доходы, -1 — только расходы, 0 — все операции.
+        Категории без операций в периоде не возвращаются.
+        """
+        with self._lock:
+            totals = self._aggregates.category_totals(self._day(start), self._day(end), sign)
+            names = self.categories.values
+            return {names[code]: total for code, total in totals.items() if total}
+
+    def balance_series(self, start: date, end: date, account: Optional[str] = None) -> list[int]:
+        """Остаток на конец каждого дня start <= день < end (для графика)."""
+        with self._lock:
+            code = None
+            if account is not None:
+                code = self.accounts.find(account)
+                if code < 0:
+                    return [0] * max(0, (end - start).days)
+            return self._aggregates.balance_series(to_epoch_day(start), to_epoch_day(end), code)
+
+
+@dataclass(frozen=True)
+class LedgerSnapshot:
+    """Неизменяемая копия столбцов Ledger (см. Ledger.snapshot)."""
+
+    days: array
+    amounts: array
+    account_ids: array
+    category_ids: array
+    descriptions: list[str]
+    accounts: list[str]
+    categories: list[str]
+    deleted: list[int]
+
+    def __len__(self) -> int:
+        return len(self.descriptions)
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[tuple[int, int, str, str, str]]:
+        """Строки (день, сумма, счёт, категория, описание) start..stop, включая удалённые."""
+        accounts, categories = self.accounts, self.categories
+        for i in range(start, len(self) if stop is None else min(stop, len(self))):
+            yield (
+                self.days[i],
+                self.amounts[i],
+                accounts[self.account_ids[i]],
+                categories[self.category_ids[i]],
+                self.descriptions[i],
+            )
+
+    def live_rows(self) -> Iterator[tuple[int, int, str, str, str]]:
+        """rows() без удалённых операций."""
+        deleted = set(self.deleted)
+        return (row for i, row in enumerate(self.rows()) if i not in deleted)
@@ -2,44 +2,57 @@
 Модуль Финансовый трекер для Personal Dashboard.
 """
 
+from pathlib import Path
+
 try:
+    from src.core.app_files import config_dir
     from src.core.base_module import BaseModule
 except ImportError:
+    from core.app_files import config_dir
     from core.base_module import BaseModule
 
 from PySide6.QtWidgets import QWidget
 
+from .finance_journal import FinanceBook
+from .finance_ledger import Ledger
 from .finance_widget import FinanceWidget
 
 
+def _data_dir() -> Path:
+    return config_dir("Finance")
+
+
 class FinanceModule(BaseModule):
     """Модуль финансового трекера."""
 
     def __init__(self):
         super().__init__()
-        self._module_id = "finance"
-        self._version = "0.1.0"
         self._author = "Personal Dashboard"
         self._description = "Трекер доходов и расходов"
         self._requires_confirmation = True
         self._widget: QWidget | None = None
+        # Журнал живёт весь сеанс: пароль спрашивается один раз, а не при каждом открытии модуля
+        self._book: FinanceBook | None = None
 
-    def get_name(self) -> str:
-        return "💰 Финансовый трекер"
-
-    def get_icon(self) -> str:
-        return "💰"
+    def get_book(self) -> FinanceBook:
+        """Операции модуля и их зашифрованный журнал (общие для виджета и фоновых задач)."""
+        if self._book is None:
+            self._book = FinanceBook(_data_dir())
+        return self._book
 
-    def get_short_name(self) -> str:
-        return "Финансы"
+    def get_ledger(self) -> Ledger:
+        return self.get_book().ledger
 
     def get_widget(self) -> QWidget:
         if self._widget is None:
-            self._widget = FinanceWidget()
+            self._widget = FinanceWidget(self.get_book())
         return self._widget
 
     def on_load(self) -> None:
         pass
 
     def on_unload(self) -> None:
+        if self._book is not None:
+            self._book.close()
+            self._book = None
         self._widget = None
@@ -0,0 +1,188 @@
+"""
+Представление журнала операций для таблицы: порядок строк как перестановка
+номеров операций (array uint32), без копирования самих операций.
+Сортировка — по ключу столбца (NumPy argsort, если установлен), фильтр — выбор
+из уже отсортированной перестановки; удалённые операции отфильтровываются всегда.
+Пока нет ни сортировки, ни фильтра, ни удалений, перестановка не строится:
+строка i — операция i.
+"""
+
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from .finance_ledger import Ledger, to_epoch_day
+
+# Столбцы представления (и таблицы) в порядке отображения
+COLUMNS = ("day", "amount", "account", "category", "description")
+
+
+@dataclass(frozen=True)
+class ViewFilter:
+    """Подстрока в счёте, категории или описании (без учёта регистра) и start <= день < end."""
+
+    text: str = ""
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+    def is_empty(self) -> bool:
+        return not self.text and self.start is None and self.end is None
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    return np
+
+
+def _ranks(values: list[str]) -> list[int]:
+    """Код строки словаря → место в алфавитном порядке (без учёта регистра)."""
+    order = sorted(range(len(values)), key=lambda i: values[i].casefold())
+    ranks = [0] * len(values)
+    for rank, code in enumerate(order):
+        ranks[code] = rank
+    return ranks
+
+
+class LedgerView:
+    """
+    Строки таблицы поверх Ledger. Операции, добавленные после rebuild(), видны
+    в конце без сортировки (sync()); отсортированный или отфильтрованный вид
+    пересчитывается явно — rebuild().
+    """
+
+    def __init__(self, ledger: Ledger):
+        self._ledger = ledger
+        self._sort: Optional[tuple[str, bool]] = None  # (столбец, по убыванию)
+        self._filter = ViewFilter()
+        self._order: Optional[array] = None  # None — порядок добавления
+        self._size = len(ledger)
+        # Отсортированная перестановка всех операций — для смены фильтра без пересортировки
+        self._sorted: Optional[array] = None
+        self._sorted_version = ledger.edit_version
+
+    @property
+    def ledger(self) -> Ledger:
+        return self._ledger
+
+    @property
+    def sort_key(self) -> Optional[tuple[str, bool]]:
+        return self._sort
+
+    @property
+    def filter(self) -> ViewFilter:
+        return self._filter
+
+    def is_identity(self) -> bool:
+        return self._order is None
+
+    def __len__(self) -> int:
+        return len(self._order) if self._order is not None else self._size
+
+    def row(self, index: int) -> int:
+        """Номер операции в строке index."""
+        return self._order[index] if self._order is not None else index
+
+    def set_sort(self, column: Optional[str], descending: bool = False) -> None:
+        if column is not None and column not in COLUMNS:
+            raise ValueError(f"Неизвестный столбец: {column}")
+        self._sort = (column, descending) if column is not None else None
+        self._sorted = None
+        self.rebuild()
+
+    def set_filter(self, flt: ViewFilter) -> None:
+        self._filter = flt
+        self.rebuild()
+
+    def sync(self) -> bool:
+        """Подхватывает добавленные операции в порядке добавления; True — строк стало больше."""
+        if self._order is not None or self._ledger.deleted:
+            return False
+        size = len(self._ledger)
+        grown, self._size = size > self._size, size
+        return grown
+
+    def rebuild(self) -> None:
+        """Пересчитывает перестановку под текущие сортировку и фильтр."""
+        ledger = self._ledger
+        n = len(ledger)
+        self._size = n
+        if self._sort is None and self._filter.is_empty() and not ledger.deleted:
+            self._order = None
+            self._sorted = None
+            return
+        if self._sort is not None and (
+            self._sorted is None or len(self._sorted) != n or self._sorted_version != ledger.edit_version
+        ):
+            self._sorted_version = ledger.edit_version
+            self._sorted = self._sorted_order(n)
+        base = self._sorted if self._sort is not None else None
+        if self._filter.is_empty() and not ledger.deleted:
+            self._order = base
+        else:
+            self._order = self._filtered(base, n)
+
+    # --- Сортировка ---
+
+    def _key_column(self, column: str, n: int):
+        """Целочисленный ключ сортировки столбца (список или array) для первых n операций."""
+        ledger = self._ledger
+        if column == "day":
+            return ledger.days[:n]
+        if column == "amount":
+            return ledger.amounts[:n]
+        if column in ("account", "category"):
+            codes = ledger.account_ids if column == "account" else ledger.category_ids
+            names = ledger.accounts if column == "account" else ledger.categories
+            ranks = _ranks(names.values)
+            return array("I", [ranks[c] for c in codes[:n]])
+        descriptions = ledger.descriptions[:n]
+        ranks = {text: rank for rank, text in enumerate(sorted(set(descriptions), key=str.casefold))}
+        return array("I", [ranks[text] for text in descriptions])
+
+    def _sorted_order(self, n: int) -> array:
+        column, descending = self._sort
+        keys = self._key_column(column, n)
+        np = _numpy()
+        if np is not None and n:
+            values = np.asarray(keys, dtype=np.int64)
+            # Устойчивая сортировка: равные ключи — в порядке добавления и при убывании
+            order = np.argsort(-values if descending else values, kind="stable")
+            result = array("I")
+            result.frombytes(order.astype(np.uint32).tobytes())
+            return result
+        return array("I", sorted(range(n), key=keys.__getitem__, reverse=descending))
+
+    # --- Фильтр ---
+
+    def _matches(self, n: int) -> list[bool]:
+        """Подходит ли операция под фильтр — для первых n операций."""
+        ledger, flt = self._ledger, self._filter
+        match = [True] * n
+        if flt.start is not None or flt.end is not None:
+            lo = to_epoch_day(flt.start) if flt.start is not None else -(2 ** 31)
+            hi = to_epoch_day(flt.end) if flt.end is not None else 2 ** 31
+            match = [lo <= d < hi for d in ledger.days[:n]]
+        text = flt.text.casefold()
+        if text:
+            # Счета и категории — словари: проверяются один раз на значение
+            accounts = [text in v.casefold() for v in ledger.accounts.values]
+            categories = [text in v.casefold() for v in ledger.categories.values]
+            account_ids, category_ids, descriptions = ledger.account_ids, ledger.category_ids, ledger.descriptions
+            match = [
+                ok and (accounts[account_ids[i]] or categories[category_ids[i]] or text in descriptions[i].casefold())
+                for i, ok in enumerate(match)
+            ]
+        for i in ledger.deleted:
+            if i < n:
+                match[i] = False
+        return match
+
+    def _filtered(self, base: Optional[array], n: int) -> array:
+        match = self._matches(n)
+        if base is None:
+            return array("I", [i for i, ok in enumerate(match) if ok])
+        return array("I", [i for i in base if match[i]])
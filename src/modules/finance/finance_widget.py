@@ -1,23 +1,241 @@
 """
-Главный виджет модуля Финансовый трекер.
-Пока — заглушка с текстом «в разработке».
+Главный виджет модуля Финансовый трекер: итог, таблица операций с поиском
+и сортировкой, открытие зашифрованного журнала и импорт банковских выписок.
 """
 
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+import threading
+from pathlib import Path
+
+from PySide6.QtCore import QTimer, Qt, Signal
+from PySide6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QInputDialog,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QProgressDialog,
+    QPushButton,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from .finance_import import CsvOptions, ImportResult, format_for_path, import_file
+from .finance_journal import FinanceBook, WrongPassword
+from .finance_ledger import Ledger, format_minor
+from .finance_view import ViewFilter
+from .import_panel import ImportPanel
+from .transaction_model import TransactionTableModel
 
 
 class FinanceWidget(QWidget):
-    """Виджет финансового трекера (заглушка)."""
+    """Виджет финансового трекера."""
+
+    # Журнал открыт в рабочем потоке: (число операций или -1, ошибка)
+    _journal_opened = Signal(int, str)
+    # Импорт из рабочего потока: (байт прочитано, размер файла) и (ImportResult или None, ошибка)
+    _import_progress = Signal(int, int)
+    _import_finished = Signal(object, str)
 
-    def __init__(self, parent: QWidget | None = None):
+    def __init__(self, book: FinanceBook, parent: QWidget | None = None):
         super().__init__(parent)
+        self._book = book
         self.setObjectName("financeWidget")
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
-        label = QLabel("Финансовый трекер (в разработке)")
-        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        label.setStyleSheet("font-size: 16px; padding: 20px; color: #e0e0e0;")
-        label.setObjectName("financePlaceholder")
-        layout.addWidget(label)
+        self._summary = QLabel()
+        self._summary.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._summary.setStyleSheet("font-size: 16px; padding: 8px; color: #e0e0e0;")
+        self._summary.setObjectName("financeSummary")
+        layout.addWidget(self._summary)
+
+        toolbar = QHBoxLayout()
+        self._search_edit = QLineEdit()
+        self._search_edit.setPlaceholderText("Поиск: счёт, категория, описание")
+        self._search_edit.setClearButtonEnabled(True)
+        toolbar.addWidget(self._search_edit, 1)
+        self._btn_open = QPushButton("🔒 Открыть журнал…")
+        self._btn_open.setObjectName("financeOpenJournal")
+        self._btn_open.clicked.connect(self._on_open_journal)
+        toolbar.addWidget(self._btn_open)
+        self._btn_import = QPushButton("📥 Импорт выписки…")
+        self._btn_import.setObjectName("financeImport")
+        self._btn_import.clicked.connect(self._on_import)
+        toolbar.addWidget(self._btn_import)
+        layout.addLayout(toolbar)
+
+        self._model = TransactionTableModel(self._book.ledger, self)
+        self._table = QTableView()
+        self._table.setObjectName("financeTable")
+        self._table.setModel(self._model)
+        # Без индикатора: сначала порядок добавления, перестановка не строится
+        self._table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self._table.setSortingEnabled(True)
+        self._table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self._table.setAlternatingRowColors(True)
+        self._table.setWordWrap(False)
+        # Фиксированные размеры: представлению не нужно измерять содержимое строк
+        rows = self._table.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(24)
+        rows.hide()
+        columns = self._table.horizontalHeader()
+        columns.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        for column, width in enumerate((90, 110, 120, 140)):
+            columns.resizeSection(column, width)
+        columns.setStretchLastSection(True)
+        layout.addWidget(self._table, 1)
+
+        # Фильтр — после паузы в наборе, а не на каждую букву
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(250)
+        self._search_timer.timeout.connect(self._apply_search)
+        self._search_edit.textChanged.connect(self._search_timer.start)
         self.setMinimumWidth(320)
+        self._import_cancel: threading.Event | None = None
+        self._import_progress_dialog: QProgressDialog | None = None
+        self._journal_opened.connect(self._on_journal_opened)
+        self._import_progress.connect(self._on_import_progress)
+        self._import_finished.connect(self._on_import_finished)
+        self.refresh()
+
+    def get_ledger(self) -> Ledger:
+        return self._book.ledger
+
+    def _apply_search(self) -> None:
+        self._model.set_filter(ViewFilter(text=self._search_edit.text().strip()))
+
+    def refresh(self) -> None:
+        """Обновляет итог: число операций и общий остаток."""
+        ledger = self._book.ledger
+        self._summary.setText(
+            f"Операций: {ledger.live_count()} · Остаток: {format_minor(ledger.balance())} ₽"
+        )
+        self._btn_open.setVisible(not self._book.is_open)
+
+    def _on_open_journal(self) -> None:
+        password, ok = QInputDialog.getText(
+            self, "Журнал финансов", "Пароль:", QLineEdit.EchoMode.Password
+        )
+        if not ok or not password:
+            return
+        self._btn_open.setEnabled(False)
+        self._btn_import.setEnabled(False)
+        self._summary.setText("Открытие журнала…")
+        # Вывод ключа (scrypt) и расшифровка — в фоне, интерфейс не замирает
+        threading.Thread(target=self._open_journal, args=(password,), daemon=True).start()
+
+    def _open_journal(self, password: str) -> None:
+        """Рабочий поток: интерфейс не трогает."""
+        try:
+            result = (self._book.open(password), "")
+        except WrongPassword:
+            result = (-1, "Неверный пароль.")
+        except Exception as e:
+            result = (-1, str(e) or e.__class__.__name__)
+        try:
+            self._journal_opened.emit(*result)
+        except RuntimeError:
+            pass
+
+    def _on_journal_opened(self, count: int, error: str) -> None:
+        self._btn_open.setEnabled(True)
+        self._btn_import.setEnabled(True)
+        if not error:
+            self._model.set_ledger(self._book.ledger)
+        self.refresh()
+        if error:
+            QMessageBox.warning(self, "Журнал финансов", f"Не удалось открыть журнал.\n{error}")
+
+    def _on_import(self) -> None:
+        if self._import_cancel is not None:
+            return  # импорт уже идёт
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Импорт выписки",
+            "",
+            "Выписки (*.csv *.txt *.ofx *.qfx);;CSV (*.csv *.txt);;OFX (*.ofx *.qfx)",
+        )
+        if not path:
+            return
+        fmt = format_for_path(Path(path))
+        options = CsvOptions()
+        if fmt == "csv":
+            dialog = QDialog(self)
+            dialog.setWindowTitle("Импорт выписки")
+            layout = QVBoxLayout(dialog)
+            panel = ImportPanel(Path(path))
+            layout.addWidget(panel)
+            buttons = QDialogButtonBox(
+                QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+            )
+            buttons.accepted.connect(dialog.accept)
+            buttons.rejected.connect(dialog.reject)
+            layout.addWidget(buttons)
+            if dialog.exec() != QDialog.DialogCode.Accepted:
+                return
+            options = panel.get_options()
+
+        # Разбор и запись в журнал — в рабочем потоке; прогресс и итог — через сигналы
+        self._import_cancel = threading.Event()
+        self._import_progress_dialog = QProgressDialog("Импорт выписки…", "Отмена", 0, 0, self)
+        self._import_progress_dialog.setWindowTitle("Импорт")
+        self._import_progress_dialog.setMinimumDuration(300)
+        self._import_progress_dialog.canceled.connect(self._import_cancel.set)
+        self._btn_import.setEnabled(False)
+        self._btn_open.setEnabled(False)
+        threading.Thread(
+            target=self._run_import,
+            args=(Path(path), fmt, options, self._import_cancel),
+            name="finance-import",
+            daemon=True,
+        ).start()
+
+    def _run_import(self, path: Path, fmt: str, options: CsvOptions, cancel: threading.Event) -> None:
+        """Рабочий поток импорта: интерфейс не трогает."""
+        try:
+            result = (
+                import_file(self._book, path, options, fmt, progress=self._import_progress.emit, cancel=cancel),
+                "",
+            )
+        except Exception as e:
+            result = (None, str(e) or e.__class__.__name__)
+        try:
+            self._import_finished.emit(*result)
+        except RuntimeError:
+            pass
+
+    def _on_import_progress(self, done: int, total: int) -> None:
+        dialog = self._import_progress_dialog
+        if dialog is not None and not dialog.wasCanceled():
+            # QProgressDialog считает в int: размер файла — в КиБ
+            dialog.setMaximum(max(total // 1024, 1))
+            dialog.setValue(done // 1024)
+        self._model.ledger_changed(reorder=False)
+        self.refresh()
+
+    def _on_import_finished(self, result: ImportResult | None, error: str) -> None:
+        if self._import_progress_dialog is not None:
+            self._import_progress_dialog.canceled.disconnect()
+            self._import_progress_dialog.close()
+            self._import_progress_dialog.deleteLater()
+            self._import_progress_dialog = None
+        self._import_cancel = None
+        self._btn_import.setEnabled(True)
+        self._btn_open.setEnabled(True)
+        self._model.ledger_changed()
+        self.refresh()
+        if error:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось импортировать выписку.\n{error}")
+            return
+        lines = [f"Добавлено операций: {result.added}", f"Пропущено дублей: {result.duplicates}"]
+        if result.errors:
+            lines.append(f"Строк с ошибками: {result.errors} (первая — {result.first_error})")
+        if result.cancelled:
+            lines.insert(0, "Импорт остановлен; уже добавленные операции сохранены.")
+        QMessageBox.information(self, "Импорт", "\n".join(lines))
@@ -0,0 +1,114 @@
+"""
+Панель параметров импорта CSV-выписки: разделитель, кодировка, десятичная запятая
+и соответствие колонок файла полям операции.
+"""
+
+from pathlib import Path
+
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QFormLayout,
+    QGroupBox,
+    QLineEdit,
+    QVBoxLayout,
+    QWidget,
+)
+
+from .finance_import import (
+    DEFAULT_ACCOUNT,
+    DEFAULT_CATEGORY,
+    CsvOptions,
+    guess_columns,
+    read_csv_header,
+    sniff_delimiter,
+)
+
+_DELIMITERS = (("Точка с запятой (;)", ";"), ("Запятая (,)", ","), ("Табуляция", "\t"))
+_ENCODINGS = (("UTF-8", "utf-8-sig"), ("Windows-1251", "cp1251"))
+# (поле CsvOptions, подпись, обязательное ли)
+_FIELDS = (
+    ("date", "Дата:", True),
+    ("amount", "Сумма:", False),
+    ("credit", "Приход:", False),
+    ("debit", "Расход:", False),
+    ("description", "Описание:", False),
+    ("category", "Категория:", False),
+    ("account", "Счёт:", False),
+)
+_NONE = "—"
+
+
+class ImportPanel(QWidget):
+    """Настройки разбора CSV; колонки подбираются по заголовку файла."""
+
+    def __init__(self, path: Path, parent: QWidget | None = None):
+        super().__init__(parent)
+        self._path = Path(path)
+        self._column_combos: dict[str, QComboBox] = {}
+        self._setup_ui()
+        self._reload_header()
+
+    def _setup_ui(self) -> None:
+        layout = QVBoxLayout(self)
+
+        fmt = QGroupBox("Формат файла")
+        form = QFormLayout(fmt)
+        self._delimiter_combo = QComboBox()
+        for label, value in _DELIMITERS:
+            self._delimiter_combo.addItem(label, value)
+        form.addRow("Разделитель:", self._delimiter_combo)
+        self._encoding_combo = QComboBox()
+        for label, value in _ENCODINGS:
+            self._encoding_combo.addItem(label, value)
+        form.addRow("Кодировка:", self._encoding_combo)
+        self._decimal_comma_check = QCheckBox("Десятичная запятая (1 234,56)")
+        self._decimal_comma_check.setChecked(True)
+        form.addRow(self._decimal_comma_check)
+        layout.addWidget(fmt)
+
+        columns = QGroupBox("Колонки")
+        form = QFormLayout(columns)
+        for name, label, _ in _FIELDS:
+            combo = QComboBox()
+            self._column_combos[name] = combo
+            form.addRow(label, combo)
+        self._account_edit = QLineEdit(DEFAULT_ACCOUNT)
+        form.addRow("Счёт, если нет колонки:", self._account_edit)
+        layout.addWidget(columns)
+
+        # Подбор разделителя до подключения сигналов: заголовок читается один раз
+        index = self._delimiter_combo.findData(sniff_delimiter(self._path))
+        self._delimiter_combo.setCurrentIndex(max(index, 0))
+        self._delimiter_combo.currentIndexChanged.connect(self._reload_header)
+        self._encoding_combo.currentIndexChanged.connect(self._reload_header)
+
+    def _reload_header(self) -> None:
+        try:
+            header = read_csv_header(
+                self._path,
+                CsvOptions(delimiter=self._delimiter_combo.currentData(), encoding=self._encoding_combo.currentData()),
+            )
+        except OSError:
+            header = []
+        guessed = guess_columns(header)
+        for name, _, required in _FIELDS:
+            combo = self._column_combos[name]
+            combo.clear()
+            if not required:
+                combo.addItem(_NONE, None)
+            for column in header:
+                combo.addItem(column, column)
+            index = combo.findData(guessed.get(name))
+            combo.setCurrentIndex(max(index, 0))
+
+    def get_options(self) -> CsvOptions:
+        columns = {name: self._column_combos[name].currentData() for name, _, _ in _FIELDS}
+        return CsvOptions(
+            delimiter=self._delimiter_combo.currentData(),
+            encoding=self._encoding_combo.currentData(),
+            decimal_comma=self._decimal_comma_check.isChecked(),
+            default_account=self._account_edit.text().strip() or DEFAULT_ACCOUNT,
+            default_category=DEFAULT_CATEGORY,
+            **columns,
+        )
@@ -0,0 +1,145 @@
+"""
+Модель таблицы операций поверх Ledger для QTableView.
+Строки подгружаются порциями (canFetchMore/fetchMore), порядок — перестановка
+из LedgerView, строки для отображения форматируются только для запрошенных
+(видимых) операций и хранятся в небольшом LRU-кэше.
+"""
+
+from collections import OrderedDict
+from typing import Any
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QPersistentModelIndex, Qt
+
+from .finance_ledger import Ledger, format_minor, from_epoch_day
+from .finance_view import COLUMNS, LedgerView, ViewFilter
+
+# Строк, добавляемых в модель за один fetchMore
+FETCH_BATCH = 2000
+# Операций с готовыми строками: с запасом на несколько экранов прокрутки
+CACHE_SIZE = 4096
+
+_HEADERS = ("Дата", "Сумма, ₽", "Счёт", "Категория", "Описание")
+
+
+class TransactionTableModel(QAbstractTableModel):
+    """Таблица операций: только чтение, сортировка по заголовку, фильтр по тексту."""
+
+    def __init__(self, ledger: Ledger, parent=None):
+        super().__init__(parent)
+        self._view = LedgerView(ledger)
+        self._loaded = 0  # строк, уже отданных представлению
+        self._cache: OrderedDict[int, tuple[str, ...]] = OrderedDict()
+        self._cache_version = ledger.edit_version
+
+    def get_view(self) -> LedgerView:
+        return self._view
+
+    # --- Размеры и подгрузка ---
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def canFetchMore(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        self._view.sync()
+        return self._loaded < len(self._view)
+
+    def fetchMore(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        count = min(FETCH_BATCH, len(self._view) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    # --- Данные ---
+
+    def _strings(self, tx_index: int) -> tuple[str, ...]:
+        cached = self._cache.get(tx_index)
+        if cached is not None:
+            self._cache.move_to_end(tx_index)
+            return cached
+        ledger = self._view.ledger
+        strings = (
+            from_epoch_day(ledger.days[tx_index]).strftime("%d.%m.%Y"),
+            format_minor(ledger.amounts[tx_index]),
+            ledger.accounts.values[ledger.account_ids[tx_index]],
+            ledger.categories.values[ledger.category_ids[tx_index]],
+            ledger.descriptions[tx_index],
+        )
+        self._cache[tx_index] = strings
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return strings
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._strings(self._view.row(index.row()))[index.column()]
+        if role == Qt.ItemDataRole.TextAlignmentRole and COLUMNS[index.column()] == "amount":
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return _HEADERS[section]
+        return None
+
+    def transaction_index(self, row: int) -> int:
+        """Номер операции в журнале для строки таблицы."""
+        return self._view.row(row)
+
+    # --- Сортировка, фильтр, обновление ---
+
+    def _reset(self, change) -> None:
+        self.beginResetModel()
+        change()
+        self._loaded = min(FETCH_BATCH, len(self._view))
+        self.endResetModel()
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        descending = order == Qt.SortOrder.DescendingOrder
+        self._reset(lambda: self._view.set_sort(COLUMNS[column] if column >= 0 else None, descending))
+
+    def set_filter(self, flt: ViewFilter) -> None:
+        self._reset(lambda: self._view.set_filter(flt))
+
+    def set_ledger(self, ledger: Ledger) -> None:
+        """Новый журнал (после открытия файла): сортировка и фильтр сохраняются."""
+        sort_key, flt = self._view.sort_key, self._view.filter
+
+        def change() -> None:
+            self._cache.clear()
+            self._cache_version = ledger.edit_version
+            self._view = LedgerView(ledger)
+            if sort_key is not None:
+                self._view.set_sort(*sort_key)
+            self._view.set_filter(flt)
+
+        self._reset(change)
+
+    def ledger_changed(self, reorder: bool = True) -> None:
+        """
+        Операции добавлены, изменены или удалены. В порядке добавления новые строки
+        придут через fetchMore; отсортированный вид пересчитывается, только если reorder
+        (во время импорта — нет, чтобы таблица не прыгала на каждой пачке).
+        После изменений и удалений вид пересчитывается всегда.
+        """
+        ledger = self._view.ledger
+        if ledger.edit_version != self._cache_version:
+            self._cache_version = ledger.edit_version
+            self._cache.clear()
+            self._reset(self._view.rebuild)
+        elif self._view.is_identity():
+            self._view.sync()
+            if self._loaded < FETCH_BATCH:
+                self.fetchMore()
+        elif reorder:
+            self._reset(self._view.rebuild)
@@ -3,6 +3,16 @@
 load_module("pomodoro") загружает этот файл и находит класс PomodoroModule.
 """
 
+# Метаданные модуля (единственный источник): панель навигации читает их без импорта
+# модуля, ModuleManager передаёт их экземпляру через apply_manifest()
+MANIFEST = {
+    "module_id": "pomodoro",
+    "name": "🍅 Pomodoro Timer",
+    "short_name": "Pomodoro",
+    "icon": "🍅",
+    "version": "0.1.0",
+}
+
 try:
     from src.modules.pomodoro.pomodoro_module import PomodoroModule
 except ImportError:
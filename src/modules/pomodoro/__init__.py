@@ -1,6 +1,24 @@
 # Модуль Pomodoro Timer для Personal Dashboard
+# Ленивый экспорт: импорт подмодулей пакета (хранилище, статистика) не загружает виджеты
 
-from .pomodoro_module import PomodoroModule
-from .pomodoro_widget import PomodoroWidget
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .pomodoro_module import PomodoroModule
+    from .pomodoro_widget import PomodoroWidget
+
+_LAZY = {
+    "PomodoroModule": ".pomodoro_module",
+    "PomodoroWidget": ".pomodoro_widget",
+}
 
 __all__ = ["PomodoroModule", "PomodoroWidget"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,13 +4,24 @@
 Цвета: работа (зелёный→оранжевый→красный), перерыв (синий→голубой).
 """
 
-from PySide6.QtCore import Qt, QRectF
-from PySide6.QtGui import QColor, QPainter, QPen, QBrush, QConicalGradient
+import math
+
+from PySide6.QtCore import Qt, QPointF, QRect, QRectF
+from PySide6.QtGui import QColor, QPainter, QPen, QBrush, QConicalGradient, QPixmap
 from PySide6.QtWidgets import QWidget
 
+_MARGIN = 12
+_PEN_WIDTH = 14
+
 
 class CircularProgressWidget(QWidget):
-    """Виджет круговой диаграммы прогресса (прошедшее/оставшееся время)."""
+    """
+    Виджет круговой диаграммы прогресса (прошедшее/оставшееся время).
+    Статические слои (фоновое кольцо и полное кольцо с градиентом текущего режима)
+    рисуются один раз в QPixmap и пересоздаются только при смене размера, DPR,
+    режима или паузы; на тике копируется фон и дорисовывается дуга текстурным пером,
+    а перерисовывается только изменившийся сектор дуги.
+    """
 
     def __init__(self, parent: QWidget | None = None):
         super().__init__(parent)
@@ -19,64 +30,132 @@ class CircularProgressWidget(QWidget):
         self._elapsed_seconds = 0.0
         self._is_work_mode = True
         self._is_paused = False
+        self._background_cache: QPixmap | None = None
+        self._progress_pen: QPen | None = None
+        self._cache_key: tuple | None = None
 
     def set_progress(self, total_seconds: int, elapsed_seconds: float) -> None:
+        old_span = self._span()
+        old_total = self._total_seconds
         self._total_seconds = max(1, total_seconds)
         self._elapsed_seconds = max(0.0, min(elapsed_seconds, self._total_seconds))
-        self.update()
+        new_span = self._span()
+        if new_span == old_span and self._total_seconds == old_total:
+            return
+        if self._total_seconds == old_total and new_span > old_span:
+            self.update(self._arc_update_rect(old_span, new_span))
+        else:
+            self.update()
 
     def set_work_mode(self, work: bool) -> None:
+        if work == self._is_work_mode:
+            return
         self._is_work_mode = work
+        self._progress_pen = None
         self.update()
 
     def set_paused(self, paused: bool) -> None:
+        if paused == self._is_paused:
+            return
         self._is_paused = paused
+        self._progress_pen = None
         self.update()
 
-    def paintEvent(self, event) -> None:
-        super().paintEvent(event)
-        if self._total_seconds <= 0:
-            return
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._cache_key = None
 
-        w, h = self.width(), self.height()
-        side = min(w, h)
-        margin = 12
-        rect = QRectF(margin, margin, side - 2 * margin, side - 2 * margin)
+    def _span(self) -> int:
+        """Длина дуги прогресса в 1/16 градуса (единицы QPainter.drawArc)."""
+        return int(360 * 16 * self._elapsed_seconds / self._total_seconds)
 
-        # Фоновый круг (оставшееся время)
-        bg_color = QColor(60, 60, 60)
-        painter.setPen(QPen(bg_color, 14, Qt.PenStyle.SolidLine))
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.drawArc(rect, 90 * 16, 360 * 16)
+    def _ring_rect(self) -> QRectF:
+        side = min(self.width(), self.height())
+        return QRectF(_MARGIN, _MARGIN, side - 2 * _MARGIN, side - 2 * _MARGIN)
 
-        # Прогресс (прошедшее время), старт с верха (12 часов)
-        progress = self._elapsed_seconds / self._total_seconds
-        span = int(360 * 16 * progress)
+    def _arc_update_rect(self, from_span: int, to_span: int) -> QRect:
+        """Ограничивающий прямоугольник сектора дуги между двумя длинами (с толщиной пера)."""
+        rect = self._ring_rect()
+        cx, cy = rect.center().x(), rect.center().y()
+        r = rect.width() / 2
+        # Дуга идёт по часовой стрелке от 12 часов: угол в градусах от оси X
+        a0 = 90 - from_span / 16
+        a1 = 90 - to_span / 16
+        angles = [a0, a1]
+        # Крайние точки окружности (0°, 90°, 180°, 270°), попавшие в сектор
+        k = math.floor(a0 / 90)
+        while k * 90 >= a1:
+            if k * 90 <= a0:
+                angles.append(k * 90)
+            k -= 1
+        xs = [cx + r * math.cos(math.radians(a)) for a in angles]
+        ys = [cy - r * math.sin(math.radians(a)) for a in angles]
+        # Квадратный конец пера выступает на полширины и вдоль дуги, и поперёк
+        pad = _PEN_WIDTH + 2
+        return QRectF(
+            QPointF(min(xs) - pad, min(ys) - pad),
+            QPointF(max(xs) + pad, max(ys) + pad),
+        ).toAlignedRect()
 
-        if span <= 0:
-            return
+    def _ensure_caches(self) -> None:
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr)
+        if key != self._cache_key:
+            self._cache_key = key
+            self._background_cache = self._render_layer(dpr, self._background_pen())
+            self._progress_pen = None
+        if self._progress_pen is None:
+            ring = self._render_layer(dpr, self._mode_pen())
+            self._progress_pen = QPen(QBrush(ring), _PEN_WIDTH, Qt.PenStyle.SolidLine)
+
+    def _render_layer(self, dpr: float, pen: QPen) -> QPixmap:
+        """Полное кольцо заданным пером в прозрачный QPixmap размера виджета."""
+        pixmap = QPixmap(max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawArc(self._ring_rect(), 90 * 16, 360 * 16)
+        painter.end()
+        return pixmap
+
+    def _background_pen(self) -> QPen:
+        # Фоновый круг (оставшееся время)
+        return QPen(QColor(60, 60, 60), _PEN_WIDTH, Qt.PenStyle.SolidLine)
 
+    def _mode_pen(self) -> QPen:
+        rect = self._ring_rect()
         if self._is_paused:
-            pen_color = QColor(255, 193, 7)
-            painter.setPen(QPen(pen_color, 14, Qt.PenStyle.SolidLine))
-        elif self._is_work_mode:
+            return QPen(QColor(255, 193, 7), _PEN_WIDTH, Qt.PenStyle.SolidLine)
+        gradient = QConicalGradient(rect.center(), 90)
+        if self._is_work_mode:
             # Работа: градиент зелёный → оранжевый → красный по прогрессу
-            gradient = QConicalGradient(rect.center(), 90)
             gradient.setColorAt(0.0, QColor(76, 175, 80))
             gradient.setColorAt(0.5, QColor(255, 152, 0))
             gradient.setColorAt(1.0, QColor(244, 67, 54))
-            painter.setPen(QPen(QBrush(gradient), 14, Qt.PenStyle.SolidLine))
         else:
             # Перерыв: синий → голубой
-            gradient = QConicalGradient(rect.center(), 90)
             gradient.setColorAt(0.0, QColor(33, 150, 243))
             gradient.setColorAt(1.0, QColor(0, 188, 212))
-            painter.setPen(QPen(QBrush(gradient), 14, Qt.PenStyle.SolidLine))
+        return QPen(QBrush(gradient), _PEN_WIDTH, Qt.PenStyle.SolidLine)
 
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.drawArc(rect, 90 * 16, -span)
+    def paintEvent(self, event) -> None:
+        super().paintEvent(event)
+        if self._total_seconds <= 0:
+            return
+        self._ensure_caches()
+        painter = QPainter(self)
+        painter.setClipRect(event.rect())
+        painter.drawPixmap(0, 0, self._background_cache)
+
+        # Прогресс (прошедшее время), старт с верха (12 часов)
+        span = self._span()
+        if span > 0:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(self._progress_pen)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawArc(self._ring_rect(), 90 * 16, -span)
 
         painter.end()
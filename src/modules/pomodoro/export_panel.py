@@ -0,0 +1,74 @@
+"""
+Панель параметров экспорта истории Pomodoro: период и режимы интервалов.
+"""
+
+from datetime import datetime, time, timedelta
+
+from PySide6.QtCore import QDate
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QDateEdit,
+    QFormLayout,
+    QGroupBox,
+    QVBoxLayout,
+    QWidget,
+)
+
+from .pomodoro_export import BREAK_MODES, ExportFilter
+
+# (подпись, режимы) — None означает все режимы
+_MODE_CHOICES = (
+    ("Все интервалы", None),
+    ("Только работа", ("work",)),
+    ("Только перерывы", BREAK_MODES),
+)
+
+
+class ExportPanel(QWidget):
+    """Виджет фильтров экспорта: весь период или диапазон дат, режимы."""
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self._setup_ui()
+
+    def _setup_ui(self) -> None:
+        layout = QVBoxLayout(self)
+
+        period = QGroupBox("Период")
+        form = QFormLayout(period)
+        self._all_time_check = QCheckBox("Вся история")
+        self._all_time_check.setChecked(True)
+        self._all_time_check.toggled.connect(self._on_all_time_toggled)
+        form.addRow(self._all_time_check)
+
+        today = QDate.currentDate()
+        self._from_edit = QDateEdit(today.addMonths(-1))
+        self._from_edit.setCalendarPopup(True)
+        form.addRow("С:", self._from_edit)
+        self._to_edit = QDateEdit(today)
+        self._to_edit.setCalendarPopup(True)
+        form.addRow("По (включительно):", self._to_edit)
+        layout.addWidget(period)
+
+        modes = QGroupBox("Интервалы")
+        modes_layout = QVBoxLayout(modes)
+        self._mode_combo = QComboBox()
+        for label, value in _MODE_CHOICES:
+            self._mode_combo.addItem(label, value)
+        modes_layout.addWidget(self._mode_combo)
+        layout.addWidget(modes)
+
+        self._on_all_time_toggled(True)
+
+    def _on_all_time_toggled(self, checked: bool) -> None:
+        self._from_edit.setEnabled(not checked)
+        self._to_edit.setEnabled(not checked)
+
+    def get_filter(self) -> ExportFilter:
+        modes = self._mode_combo.currentData()
+        if self._all_time_check.isChecked():
+            return ExportFilter(modes=modes)
+        start = datetime.combine(self._from_edit.date().toPython(), time.min)
+        end = datetime.combine(self._to_edit.date().toPython(), time.min) + timedelta(days=1)
+        return ExportFilter(start=start, end=end, modes=modes)
@@ -0,0 +1,266 @@
+"""
+Потоковый экспорт истории Pomodoro: CSV, JSON, сжатый JSON Lines (gzip, zstd)
+и колоночные форматы для аналитики (Arrow IPC, Parquet).
+Записи читаются из хранилища пакетами и сразу пишутся в файл — в памяти
+не больше одного пакета. Фильтры по датам и режимам, прогресс и отмена;
+файл пишется во временный и переименовывается только при успехе.
+zstd и Arrow/Parquet доступны, если установлены zstandard и pyarrow.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from .pomodoro_storage import ITER_BATCH_SIZE, HistoryStore
+
+EXPORT_FIELDS = ("started_at", "finished_at", "duration_seconds", "mode", "task_name")
+BREAK_MODES = ("short_break", "long_break")
+
+
+class ExportUnavailable(Exception):
+    """Формат требует необязательной зависимости, которая не установлена."""
+
+
+class ExportCancelled(Exception):
+    """Экспорт остановлен по запросу; файл назначения не изменён."""
+
+
+@dataclass(frozen=True)
+class ExportFilter:
+    """start <= started_at < end (границы необязательны) и режим из modes (None — все)."""
+
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    modes: Optional[tuple[str, ...]] = None
+
+    def query(self) -> tuple[Optional[str], Optional[str], Optional[tuple[str, ...]]]:
+        return (
+            self.start.isoformat() if self.start is not None else None,
+            self.end.isoformat() if self.end is not None else None,
+            self.modes,
+        )
+
+
+def _row(record: dict) -> dict:
+    return {
+        "started_at": record.get("started_at", ""),
+        "finished_at": record.get("finished_at", ""),
+        "duration_seconds": record.get("duration_seconds", 0),
+        "mode": record.get("mode", "work"),
+        "task_name": record.get("task_name", ""),
+    }
+
+
+def _epoch_ms(value: str) -> Optional[int]:
+    """ISO-время (локальное, как пишет виджет) → миллисекунды Unix-времени."""
+    try:
+        return round(datetime.fromisoformat(value).timestamp() * 1000)
+    except (TypeError, ValueError):
+        return None
+
+
+class _CsvWriter:
+    def __init__(self, path: Path):
+        self._f = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._f, fieldnames=EXPORT_FIELDS)
+        self._writer.writeheader()
+
+    def write_batch(self, batch: list[dict]) -> None:
+        self._writer.writerows(_row(r) for r in batch)
+
+    def finish(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _JsonWriter:
+    """Массив объектов с отступом 2 — тот же вид, что у прежнего json.dumps(indent=2)."""
+
+    def __init__(self, path: Path):
+        self._f = open(path, "w", encoding="utf-8")
+        self._first = True
+        self._f.write("[")
+
+    def write_batch(self, batch: list[dict]) -> None:
+        parts = []
+        for r in batch:
+            text = json.dumps(_row(r), ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            parts.append(("\n  " if self._first else ",\n  ") + text)
+            self._first = False
+        self._f.write("".join(parts))
+
+    def finish(self) -> None:
+        self._f.write("]" if self._first else "\n]")
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _JsonLinesWriter:
+    """Одна компактная запись на строку; поверх gzip или zstd."""
+
+    def __init__(self, path: Path, compression: str):
+        if compression == "gzip":
+            self._f = gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+        else:
+            try:
+                import zstandard
+            except ImportError:
+                raise ExportUnavailable("Для zstd нужен пакет zstandard") from None
+            self._raw = open(path, "wb")
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(self._raw, closefd=False)
+            self._f = io.TextIOWrapper(stream, encoding="utf-8")
+
+    def write_batch(self, batch: list[dict]) -> None:
+        self._f.write("".join(
+            json.dumps(_row(r), ensure_ascii=False, separators=(",", ":")) + "\n" for r in batch
+        ))
+
+    def finish(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._f.close()
+        raw = getattr(self, "_raw", None)
+        if raw is not None:
+            raw.close()
+
+
+class _ColumnarWriter:
+    """
+    Arrow IPC (поток) или Parquet через pyarrow. started_at/finished_at — int64
+    миллисекунды Unix-времени (timestamp[ms, UTC]), mode и task_name — словарные
+    столбцы. Словарь общий для всего файла и только растёт: в Arrow IPC новые
+    значения уходят дельтами, без повторной передачи словаря.
+    """
+
+    def __init__(self, path: Path, kind: str):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ExportUnavailable("Для Arrow/Parquet нужен пакет pyarrow") from None
+        self._pa = pa
+        self._kind = kind
+        self._dicts: dict[str, dict[str, int]] = {"mode": {}, "task_name": {}}
+        self._schema = pa.schema([
+            ("started_at", pa.timestamp("ms", tz="UTC")),
+            ("finished_at", pa.timestamp("ms", tz="UTC")),
+            ("duration_seconds", pa.int32()),
+            ("mode", pa.dictionary(pa.int32(), pa.string())),
+            ("task_name", pa.dictionary(pa.int32(), pa.string())),
+        ])
+        if kind == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(str(path), self._schema, compression="zstd")
+        else:
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True, compression="zstd")
+            self._writer = pa.ipc.new_stream(str(path), self._schema, options=options)
+
+    def _encode(self, column: str, values: list[str]):
+        pa = self._pa
+        codes = self._dicts[column]
+        indices = [codes.setdefault(v, len(codes)) for v in values]
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, pa.int32()), pa.array(list(codes), pa.string())
+        )
+
+    def write_batch(self, batch: list[dict]) -> None:
+        pa = self._pa
+        rows = [_row(r) for r in batch]
+        ts = pa.timestamp("ms", tz="UTC")
+        arrays = [
+            pa.array([_epoch_ms(r["started_at"]) for r in rows], pa.int64()).cast(ts),
+            pa.array([_epoch_ms(r["finished_at"]) for r in rows], pa.int64()).cast(ts),
+            pa.array([int(r["duration_seconds"]) for r in rows], pa.int32()),
+            self._encode("mode", [r["mode"] for r in rows]),
+            self._encode("task_name", [r["task_name"] or "" for r in rows]),
+        ]
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self._schema))
+
+    def finish(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+# Формат → (фабрика писателя, расширение файла, подпись для диалога)
+FORMATS: dict[str, tuple[Callable, str, str]] = {
+    "csv": (_CsvWriter, ".csv", "CSV"),
+    "json": (_JsonWriter, ".json", "JSON"),
+    "jsonl.gz": (lambda p: _JsonLinesWriter(p, "gzip"), ".jsonl.gz", "JSON Lines, gzip"),
+    "jsonl.zst": (lambda p: _JsonLinesWriter(p, "zstd"), ".jsonl.zst", "JSON Lines, zstd"),
+    "arrow": (lambda p: _ColumnarWriter(p, "arrow"), ".arrows", "Arrow IPC"),
+    "parquet": (lambda p: _ColumnarWriter(p, "parquet"), ".parquet", "Parquet"),
+}
+
+_REQUIRES = {"jsonl.zst": "zstandard", "arrow": "pyarrow", "parquet": "pyarrow"}
+
+
+def available_formats() -> list[str]:
+    """Форматы, для которых установлены нужные пакеты (без их импорта)."""
+    from importlib.util import find_spec
+
+    return [f for f in FORMATS if f not in _REQUIRES or find_spec(_REQUIRES[f]) is not None]
+
+
+def format_for_path(file_path: Path) -> str:
+    """Формат по расширению файла (самое длинное совпадение); иначе CSV."""
+    name = Path(file_path).name.lower()
+    matches = [(len(ext), fmt) for fmt, (_, ext, _) in FORMATS.items() if name.endswith(ext)]
+    return max(matches)[1] if matches else "csv"
+
+
+def export_history(
+    store: HistoryStore,
+    file_path: Path,
+    fmt: Optional[str] = None,
+    flt: ExportFilter = ExportFilter(),
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    batch_size: int = ITER_BATCH_SIZE,
+) -> int:
+    """
+    Пишет отфильтрованную историю в file_path и возвращает число записей.
+    fmt — ключ FORMATS (по умолчанию — по расширению файла).
+    progress(сделано, всего) вызывается после каждого пакета (из потока экспорта);
+    установленный cancel прерывает экспорт исключением ExportCancelled.
+    """
+    file_path = Path(file_path)
+    fmt = fmt or format_for_path(file_path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат экспорта: {fmt}")
+    start, end, modes = flt.query()
+    total = store.count_matching(start, end, modes) if progress is not None else 0
+    done = 0
+    tmp = file_path.with_name(file_path.name + ".tmp")
+    try:
+        writer = FORMATS[fmt][0](tmp)
+        try:
+            if progress is not None:
+                progress(0, total)
+            for batch in store.iter_batches(start, end, modes, batch_size):
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled()
+                writer.write_batch(batch)
+                done += len(batch)
+                if progress is not None:
+                    progress(done, max(total, done))
+            writer.finish()
+        finally:
+            writer.close()
+        os.replace(tmp, file_path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return done
@@ -10,6 +10,9 @@ except ImportError:
 
 from PySide6.QtWidgets import QWidget
 
+from .pomodoro_settings import load_settings
+from .pomodoro_sounds import _ensure_sounds
+from .pomodoro_stats import get_aggregator, set_backend
 from .pomodoro_widget import PomodoroWidget
 
 
@@ -18,21 +21,18 @@ class PomodoroModule(BaseModule):
 
     def __init__(self):
         super().__init__()
-        self._module_id = "pomodoro"
-        self._version = "0.1.0"
         self._author = "Personal Dashboard"
         self._description = "Таймер Pomodoro: 25 минут работы, 5 минут перерыва"
         self._requires_confirmation = True
         self._widget: QWidget | None = None
 
-    def get_name(self) -> str:
-        return "🍅 Pomodoro Timer"
-
-    def get_icon(self) -> str:
-        return "🍅"
-
-    def get_short_name(self) -> str:
-        return "Pomodoro"
+    @classmethod
+    def warm_up(cls) -> None:
+        # Звуки, настройки, история и дневные итоги — всё, что читает PomodoroWidget
+        _ensure_sounds()
+        settings = load_settings()
+        set_backend(settings.history_backend)
+        get_aggregator()
 
     def get_widget(self) -> QWidget:
         if self._widget is None:
@@ -0,0 +1,177 @@
+"""
+Представления записей истории Pomodoro.
+PomodoroRecord — запись-объект (dataclass со __slots__); RecordColumns — компактное
+хранение многих записей столбцами: время — int64-микросекунды, длительность — int32,
+режим — код из таблицы режимов, задача — номер в таблице интернированных строк.
+"""
+
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Union
+
+MODES = ("work", "short_break", "long_break")
+
+# Время хранится как «настенное» (без часового пояса, как его пишет виджет)
+# число микросекунд от 1970-01-01T00:00: перевод без учёта перехода на летнее время
+# и точный в обе стороны.
+_EPOCH = datetime(1970, 1, 1)
+_US = timedelta(microseconds=1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+# Метка «время не разобрано» — исходная строка лежит в отдельном словаре
+INVALID_TIME = -(2 ** 63)
+
+
+@dataclass(slots=True)
+class PomodoroRecord:
+    """Одна запись: один завершённый интервал (работа или перерыв)."""
+
+    started_at: str
+    finished_at: str
+    duration_seconds: int
+    mode: str  # "work" | "short_break" | "long_break"
+    task_name: str = ""
+
+
+def iso_to_us(value: str) -> int:
+    """ISO-время → микросекунды от 1970-01-01 (часовой пояс, если указан, переводится в UTC)."""
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is not None:
+        dt = (dt - dt.utcoffset()).replace(tzinfo=None)
+    return (dt - _EPOCH) // _US
+
+
+def us_to_iso(value: int) -> str:
+    return (_EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+def _canonical_to_us(value: str) -> int:
+    """
+    Быстрый путь для строк вида datetime.isoformat() без пояса:
+    "YYYY-MM-DDTHH:MM:SS" или "YYYY-MM-DDTHH:MM:SS.ffffff" (дробь не нулевая) —
+    us_to_iso() восстановит их побайтно. Иначе INVALID_TIME.
+    """
+    n = len(value) if isinstance(value, str) else 0
+    if not (n == 19 or n == 26 and value[19] == "." and not value.endswith(".000000")) or value[10] != "T":
+        return INVALID_TIME
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return INVALID_TIME
+    seconds = (dt.toordinal() - _EPOCH_ORDINAL) * 86400 + dt.hour * 3600 + dt.minute * 60 + dt.second
+    return seconds * 1_000_000 + dt.microsecond
+
+
+class RecordColumns:
+    """
+    Записи истории столбцами (struct of arrays). Порядок — порядок добавления.
+    Строки времени, которые не восстанавливаются из числа побайтно
+    (другая точность, часовой пояс, мусор), хранятся как есть — без потерь.
+    Индексация и перебор создают PomodoroRecord по требованию.
+    """
+
+    __slots__ = (
+        "started_us", "finished_us", "durations", "mode_codes", "task_ids",
+        "modes", "tasks", "_mode_index", "_task_index", "_raw_times",
+    )
+
+    def __init__(self, records: Iterable[Union[dict, PomodoroRecord]] = ()):
+        self.started_us = array("q")
+        self.finished_us = array("q")
+        self.durations = array("i")
+        self.mode_codes = array("B")
+        self.task_ids = array("I")
+        self.modes: list[str] = list(MODES)
+        self.tasks: list[str] = [""]
+        self._mode_index = {m: i for i, m in enumerate(self.modes)}
+        self._task_index = {"": 0}
+        # (столбец, номер записи) → исходная строка времени
+        self._raw_times: dict[tuple[int, int], str] = {}
+        self.extend(records)
+
+    def __len__(self) -> int:
+        return len(self.started_us)
+
+    def _slow_time(self, column: int, index: int, value: str) -> int:
+        """Нестандартная строка времени: число — по возможности, строка — как есть."""
+        self._raw_times[(column, index)] = value
+        try:
+            return iso_to_us(value)
+        except (TypeError, ValueError):
+            return INVALID_TIME
+
+    def append(self, record: Union[dict, PomodoroRecord]) -> None:
+        self.extend((record,))
+
+    def extend(self, records: Iterable[Union[dict, PomodoroRecord]]) -> None:
+        # Горячий цикл загрузки истории: всё нужное — в локальных переменных
+        started_us, finished_us = self.started_us, self.finished_us
+        durations, mode_codes, task_ids = self.durations, self.mode_codes, self.task_ids
+        mode_index, task_index = self._mode_index, self._task_index
+        to_us, slow_time = _canonical_to_us, self._slow_time
+        i = len(started_us)
+        for record in records:
+            if isinstance(record, PomodoroRecord):
+                started, finished = record.started_at, record.finished_at
+                duration, mode, task = record.duration_seconds, record.mode, record.task_name
+            else:
+                get = record.get
+                started, finished = get("started_at", ""), get("finished_at", "")
+                duration, mode, task = get("duration_seconds", 0), get("mode", "work"), get("task_name", "")
+            us = to_us(started)
+            started_us.append(us if us != INVALID_TIME else slow_time(0, i, started))
+            us = to_us(finished)
+            finished_us.append(us if us != INVALID_TIME else slow_time(1, i, finished))
+            durations.append(int(duration))
+            code = mode_index.get(mode)
+            if code is None:
+                code = mode_index[mode] = len(self.modes)
+                self.modes.append(mode)
+            mode_codes.append(code)
+            task = task or ""
+            code = task_index.get(task)
+            if code is None:
+                code = task_index[task] = len(self.tasks)
+                self.tasks.append(task)
+            task_ids.append(code)
+            i += 1
+
+    def started_at(self, index: int) -> str:
+        raw = self._raw_times.get((0, index))
+        return raw if raw is not None else us_to_iso(self.started_us[index])
+
+    def finished_at(self, index: int) -> str:
+        raw = self._raw_times.get((1, index))
+        return raw if raw is not None else us_to_iso(self.finished_us[index])
+
+    def __getitem__(self, index: int) -> PomodoroRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("RecordColumns index out of range")
+        return PomodoroRecord(
+            started_at=self.started_at(index),
+            finished_at=self.finished_at(index),
+            duration_seconds=self.durations[index],
+            mode=self.modes[self.mode_codes[index]],
+            task_name=self.tasks[self.task_ids[index]],
+        )
+
+    def __iter__(self) -> Iterator[PomodoroRecord]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def mode_code(self, mode: str) -> int:
+        """Код режима или -1, если таких записей нет."""
+        return self._mode_index.get(mode, -1)
+
+    def count_mode(self, mode: str) -> int:
+        code = self.mode_code(mode)
+        return self.mode_codes.count(code) if code >= 0 else 0
+
+    def nbytes(self) -> int:
+        """Размер столбцов в байтах (без таблиц строк)."""
+        return sum(
+            a.itemsize * len(a)
+            for a in (self.started_us, self.finished_us, self.durations, self.mode_codes, self.task_ids)
+        )
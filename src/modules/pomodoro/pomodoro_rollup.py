@@ -0,0 +1,174 @@
+"""
+Дневные итоги Pomodoro: число рабочих интервалов и перерывов, секунды фокуса
+и секунды по задачам за каждый день. Хранятся рядом с историей (history_rollup.json)
+и обновляются при каждой новой записи, поэтому итоги за любой диапазон дат
+читают не больше строк, чем дней в диапазоне.
+
+Пересборка из сырой истории:
+    python -m src.modules.pomodoro.pomodoro_rollup --data-dir <папка Pomodoro> [--backend sqlite]
+"""
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    from src.core.app_files import write_text_atomic
+except ImportError:
+    from core.app_files import write_text_atomic
+
+ROLLUP_NAME = "history_rollup.json"
+ROLLUP_VERSION = 1
+
+
+@dataclass
+class DayTotals:
+    """Итоги за день (или сумма за диапазон дней)."""
+
+    work_count: int = 0
+    break_count: int = 0
+    focus_seconds: int = 0
+    tasks: dict[str, int] = field(default_factory=dict)
+
+    def add_record(self, record: dict) -> None:
+        duration = int(record.get("duration_seconds", 0))
+        if record.get("mode", "work") == "work":
+            self.work_count += 1
+            self.focus_seconds += duration
+            task = record.get("task_name", "") or ""
+            self.tasks[task] = self.tasks.get(task, 0) + duration
+        else:
+            self.break_count += 1
+
+    def merge(self, other: "DayTotals") -> None:
+        self.work_count += other.work_count
+        self.break_count += other.break_count
+        self.focus_seconds += other.focus_seconds
+        for task, seconds in other.tasks.items():
+            self.tasks[task] = self.tasks.get(task, 0) + seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "work_count": self.work_count,
+            "break_count": self.break_count,
+            "focus_seconds": self.focus_seconds,
+            "tasks": self.tasks,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DayTotals":
+        return cls(
+            work_count=int(data.get("work_count", 0)),
+            break_count=int(data.get("break_count", 0)),
+            focus_seconds=int(data.get("focus_seconds", 0)),
+            tasks={str(k): int(v) for k, v in data.get("tasks", {}).items()},
+        )
+
+
+def _record_day(record: dict) -> Optional[date]:
+    try:
+        return datetime.fromisoformat(record.get("started_at", "")).date()
+    except (TypeError, ValueError):
+        return None
+
+
+class DailyRollup:
+    """
+    Таблица «день → DayTotals» в памяти с сохранением в JSON.
+    record_count — сколько записей истории свёрнуто; расхождение с хранилищем
+    означает, что итоги устарели и их надо пересобрать.
+    """
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        self._days: dict[date, DayTotals] = {}
+        self.record_count = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "DailyRollup":
+        """Читает итоги из файла; при отсутствии или ошибке — пустые (record_count = -1)."""
+        rollup = cls(path)
+        rollup.record_count = -1
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            if data.get("version") != ROLLUP_VERSION:
+                return rollup
+            rollup._days = {
+                date.fromisoformat(day): DayTotals.from_dict(totals)
+                for day, totals in data.get("days", {}).items()
+            }
+            rollup.record_count = int(data.get("records", 0))
+        except Exception:
+            rollup._days = {}
+        return rollup
+
+    def save(self) -> None:
+        data = {
+            "version": ROLLUP_VERSION,
+            "records": self.record_count,
+            "days": {day.isoformat(): t.to_dict() for day, t in sorted(self._days.items())},
+        }
+        write_text_atomic(self._path, json.dumps(data, ensure_ascii=False))
+
+    def add(self, record: dict) -> None:
+        """Учитывает одну новую запись истории (без сохранения на диск)."""
+        day = _record_day(record)
+        if day is not None:
+            self._days.setdefault(day, DayTotals()).add_record(record)
+        self.record_count += 1
+
+    def rebuild(self, records: Iterable[dict]) -> None:
+        """Пересобирает итоги из сырой истории."""
+        self._days = {}
+        self.record_count = 0
+        for r in records:
+            self.add(r)
+
+    def day(self, day: date) -> DayTotals:
+        return self._days.get(day) or DayTotals()
+
+    def days(self, start: date, end: date) -> list[tuple[date, DayTotals]]:
+        """Строки за дни [start, end] включительно, только непустые дни, по порядку."""
+        if end < start:
+            return []
+        span = (end - start).days + 1
+        if span <= len(self._days):
+            found = ((start + timedelta(days=i)) for i in range(span))
+            return [(d, self._days[d]) for d in found if d in self._days]
+        return sorted((d, t) for d, t in self._days.items() if start <= d <= end)
+
+    def totals(self, start: date, end: date) -> DayTotals:
+        """Сумма итогов за дни [start, end] включительно."""
+        out = DayTotals()
+        for _, t in self.days(start, end):
+            out.merge(t)
+        return out
+
+    def work_count(self, start: date, end: date) -> int:
+        return sum(t.work_count for _, t in self.days(start, end))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from .pomodoro_stats import open_store
+
+    parser = argparse.ArgumentParser(description="Пересборка дневных итогов Pomodoro из истории")
+    parser.add_argument("--data-dir", required=True, type=Path, help="папка с history.jsonl / history.sqlite3")
+    parser.add_argument("--backend", default="journal", choices=("journal", "sqlite"))
+    args = parser.parse_args(argv)
+
+    store = open_store(args.backend, args.data_dir)
+    try:
+        rollup = DailyRollup(args.data_dir / ROLLUP_NAME)
+        rollup.rebuild(store.load())
+        rollup.save()
+    finally:
+        store.close()
+    print(f"Пересобрано: {rollup.record_count} записей, {len(rollup.days(date.min, date.max))} дней")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,11 +6,17 @@ from dataclasses import dataclass, field
 from pathlib import Path
 import json
 
+try:
+    from src.core.app_files import config_dir, write_text_atomic
+except ImportError:
+    from core.app_files import config_dir, write_text_atomic
+
 
 WORK_OPTIONS = (20 * 60, 25 * 60, 30 * 60)
 SHORT_BREAK_OPTIONS = (3 * 60, 5 * 60, 10 * 60)
 LONG_BREAK_OPTIONS = (15 * 60, 20 * 60, 25 * 60, 30 * 60)
 DEFAULT_TOMATOES_UNTIL_LONG = 4
+HISTORY_BACKENDS = ("journal", "sqlite")
 
 
 @dataclass
@@ -23,6 +29,7 @@ class PomodoroSettings:
     tomatoes_until_long_break: int = 4
     sound_enabled: bool = True
     sound_volume: float = 0.7
+    history_backend: str = "journal"
 
     def validate(self) -> None:
         if self.work_seconds not in WORK_OPTIONS:
@@ -33,6 +40,8 @@ class PomodoroSettings:
             self.long_break_seconds = 15 * 60
         self.tomatoes_until_long_break = max(1, min(10, self.tomatoes_until_long_break))
         self.sound_volume = max(0.0, min(1.0, self.sound_volume))
+        if self.history_backend not in HISTORY_BACKENDS:
+            self.history_backend = "journal"
 
     def to_dict(self) -> dict:
         return {
@@ -42,6 +51,7 @@ class PomodoroSettings:
             "tomatoes_until_long_break": self.tomatoes_until_long_break,
             "sound_enabled": self.sound_enabled,
             "sound_volume": self.sound_volume,
+            "history_backend": self.history_backend,
         }
 
     @classmethod
@@ -53,17 +63,14 @@ class PomodoroSettings:
             tomatoes_until_long_break=data.get("tomatoes_until_long_break", 4),
             sound_enabled=data.get("sound_enabled", True),
             sound_volume=data.get("sound_volume", 0.7),
+            history_backend=data.get("history_backend", "journal"),
         )
         s.validate()
         return s
 
 
 def _config_path() -> Path:
-    from PySide6.QtCore import QStandardPaths
-    loc = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppConfigLocation)
-    folder = Path(loc) / "Personal_Dashboard" / "Pomodoro"
-    folder.mkdir(parents=True, exist_ok=True)
-    return folder / "settings.json"
+    return config_dir("Pomodoro") / "settings.json"
 
 
 def load_settings() -> PomodoroSettings:
@@ -78,6 +85,4 @@ def load_settings() -> PomodoroSettings:
 
 
 def save_settings(settings: PomodoroSettings) -> None:
-    p = _config_path()
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(settings.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+    write_text_atomic(_config_path(), json.dumps(settings.to_dict(), ensure_ascii=False, indent=2))
@@ -1,96 +1,299 @@
 """
-Звуковые уведомления: QSoundEffect, WAV-файлы (генерируются тонами при первом запуске).
+Звуковые уведомления: QSoundEffect, WAV-файлы (синтезируются тонами при первом запуске).
+QtMultimedia загружается при первом воспроизведении: с выключенным звуком не загружается вовсе.
+Отсчёты тона считаются векторно в NumPy (зависимость из requirements.txt); запасной
+путь без NumPy — поотсчётный цикл в array. Готовые WAV-байты кэшируются в памяти,
+файлы на диске — по ключу параметров тона.
 """
 
+import hashlib
 import math
 import struct
+import sys
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from PySide6.QtCore import QUrl
-from PySide6.QtMultimedia import QSoundEffect
+try:
+    from src.core.app_files import config_dir, write_bytes_atomic
+except ImportError:
+    from core.app_files import config_dir, write_bytes_atomic
+
+if TYPE_CHECKING:
+    from PySide6.QtMultimedia import QSoundEffect
+
+SAMPLE_RATE = 44100
+# Меняется при изменении синтеза или формата файла: старые файлы пересоздаются
+FORMAT_VERSION = 2
+
+
+@dataclass(frozen=True)
+class ToneProfile:
+    """
+    Тон звука: основная частота, длительность, громкость и обертоны
+    (множитель частоты, относительная амплитуда). Огибающая — линейное затухание.
+    """
+
+    frequency: float
+    duration_ms: int
+    volume: float = 0.5
+    harmonics: tuple[tuple[float, float], ...] = ()
+
+    def cache_key(self) -> str:
+        """Ключ файла на диске: параметры тона, частота дискретизации и версия формата."""
+        raw = repr((self.frequency, self.duration_ms, self.volume, self.harmonics, SAMPLE_RATE, FORMAT_VERSION))
+        return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+DEFAULT_TONES: dict[str, ToneProfile] = {
+    "start_work": ToneProfile(880, 150),
+    "end_work": ToneProfile(660, 300),
+    "start_break": ToneProfile(523, 150),
+    "end_break": ToneProfile(440, 200),
+}
+
+# Файлы звуков создают и прогрев модуля, и загрузка виджета — из разных потоков
+_files_lock = threading.Lock()
 
 
 def _sounds_dir() -> Path:
-    from PySide6.QtCore import QStandardPaths
-    loc = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppConfigLocation)
-    folder = Path(loc) / "Personal_Dashboard" / "Pomodoro" / "sounds"
-    folder.mkdir(parents=True, exist_ok=True)
-    return folder
-
-
-def _generate_wav(file_path: Path, frequency: float = 880, duration_ms: int = 200, volume: float = 0.5) -> None:
-    """Генерирует простой WAV-файл (моно, 44100 Hz, 16 bit)."""
-    sample_rate = 44100
-    n_samples = int(sample_rate * duration_ms / 1000)
-    max_amplitude = 32767 * volume
-    with open(file_path, "wb") as f:
-        # WAV header
-        f.write(b"RIFF")
-        f.write(struct.pack("<I", 36 + n_samples * 2))
-        f.write(b"WAVE")
-        f.write(b"fmt ")
-        f.write(struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16))
-        f.write(b"data")
-        f.write(struct.pack("<I", n_samples * 2))
-        for i in range(n_samples):
-            t = i / sample_rate
-            sample = max_amplitude * math.sin(2 * math.pi * frequency * t) * (1 - i / n_samples)
-            f.write(struct.pack("<h", int(sample)))
-
-
-def _ensure_sounds() -> dict[str, Path]:
+    return config_dir("Pomodoro", "sounds")
+
+
+def _components(tone: ToneProfile) -> list[tuple[float, float]]:
+    """(частота, амплитуда) всех составляющих; сумма амплитуд нормирована к volume."""
+    parts = [(1.0, 1.0), *tone.harmonics]
+    norm = sum(abs(a) for _, a in parts) or 1.0
+    peak = 32767 * max(0.0, min(1.0, tone.volume))
+    return [(tone.frequency * mult, peak * amp / norm) for mult, amp in parts]
+
+
+def _synthesize_numpy(np, tone: ToneProfile, n_samples: int) -> bytes:
+    i = np.arange(n_samples, dtype=np.float64)
+    signal = np.zeros(n_samples, dtype=np.float64)
+    for freq, amp in _components(tone):
+        signal += amp * np.sin((2 * math.pi * freq / SAMPLE_RATE) * i)
+    signal *= 1 - i / n_samples
+    return signal.astype("<i2").tobytes()
+
+
+def _synthesize_array(tone: ToneProfile, n_samples: int) -> bytes:
+    """Запасной путь без NumPy: тот же звук, но примерно в 15 раз медленнее."""
+    sin = math.sin
+    inv_n = 1 / n_samples
+    comps = [(2 * math.pi * freq / SAMPLE_RATE, amp) for freq, amp in _components(tone)]
+    if len(comps) == 1:
+        (w, amp), = comps
+        samples = array("h", [int(amp * sin(w * i) * (1 - i * inv_n)) for i in range(n_samples)])
+    else:
+        samples = array("h", [
+            int(sum(amp * sin(w * i) for w, amp in comps) * (1 - i * inv_n)) for i in range(n_samples)
+        ])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def synthesize_pcm(tone: ToneProfile) -> bytes:
+    """PCM-отсчёты тона: моно, 16 бит, little-endian."""
+    n_samples = int(SAMPLE_RATE * tone.duration_ms / 1000)
+    if n_samples <= 0:
+        return b""
+    try:
+        import numpy as np
+    except ImportError:
+        return _synthesize_array(tone, n_samples)
+    return _synthesize_numpy(np, tone, n_samples)
+
+
+@lru_cache(maxsize=32)
+def wav_bytes(tone: ToneProfile) -> bytes:
+    """Готовый WAV-файл тона (моно, 44100 Hz, 16 bit); кэшируется в памяти."""
+    pcm = synthesize_pcm(tone)
+    header = b"RIFF" + struct.pack("<I", 36 + len(pcm)) + b"WAVE"
+    header += b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16)
+    header += b"data" + struct.pack("<I", len(pcm))
+    return header + pcm
+
+
+def _is_sound_file_of(path: Path, key: str) -> bool:
+    """<key>.wav (прежний формат) или <key>_<12 hex>.wav."""
+    stem = path.stem
+    if stem == key:
+        return True
+    suffix = stem[len(key) + 1:]
+    return stem.startswith(key + "_") and len(suffix) == 12 and all(c in "0123456789abcdef" for c in suffix)
+
+
+def _ensure_sounds(tones: dict[str, ToneProfile] | None = None) -> dict[str, Path]:
+    """
+    WAV-файлы для тонов: <событие>_<ключ>.wav. Файл с другим ключом (старые
+    параметры или версия формата, прежний <событие>.wav) удаляется и пересоздаётся.
+    Потокобезопасна; файл пишется во временный с уникальным именем и переименовывается,
+    так что недописанный WAV не окажется на месте готового.
+    """
     d = _sounds_dir()
-    names = {
-        "start_work": (880, 150),
-        "end_work": (660, 300),
-        "start_break": (523, 150),
-        "end_break": (440, 200),
-    }
     paths = {}
-    for key, (freq, dur) in names.items():
-        p = d / f"{key}.wav"
-        if not p.exists():
-            _generate_wav(p, frequency=freq, duration_ms=dur)
-        paths[key] = p
+    with _files_lock:
+        for key, tone in (tones or DEFAULT_TONES).items():
+            p = d / f"{key}_{tone.cache_key()}.wav"
+            if not p.exists():
+                for stale in d.glob(f"{key}*.wav"):
+                    if _is_sound_file_of(stale, key):
+                        stale.unlink(missing_ok=True)
+                write_bytes_atomic(p, wav_bytes(tone))
+            paths[key] = p
     return paths
 
 
+@dataclass
+class PlaybackLatency:
+    """Задержка от события (дедлайн интервала, нажатие) до фактического начала звука."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.last_ms = ms
+
+
 class PomodoroSounds:
-    """Воспроизведение звуков событий Pomodoro."""
+    """
+    Воспроизведение звуков событий Pomodoro. На каждое событие — небольшой пул
+    QSoundEffect: warm_up() заранее загружает их, чтобы первый звук не ждал
+    декодирования и открытия аудиоустройства, а звуки подряд не обрывали друг друга.
+    """
+
+    POOL_SIZE = 2
 
-    def __init__(self):
-        self._paths = _ensure_sounds()
-        self._effects: dict[str, QSoundEffect] = {}
+    def __init__(self, paths: dict[str, Path] | None = None, tones: dict[str, ToneProfile] | None = None):
+        # Без путей файлы звуков проверяются/создаются при первом воспроизведении
+        self._paths = paths
+        self._tones = tones
+        self._pools: dict[str, list["QSoundEffect"]] = {}
+        self._next_in_pool: dict[str, int] = {}
+        # Эффект → момент события, которое он озвучивает (до сигнала playingChanged)
+        self._pending: dict[int, tuple[str, float]] = {}
+        self._latency: dict[str, PlaybackLatency] = {}
         self._volume = 0.7
         self._enabled = True
 
+    def set_paths(self, paths: dict[str, Path]) -> None:
+        """Пути WAV-файлов, подготовленные заранее (например, в фоновом потоке)."""
+        if paths != self._paths:
+            self._paths = paths
+            self._pools.clear()
+            self._pending.clear()
+
+    def set_tones(self, tones: dict[str, ToneProfile] | None) -> None:
+        """Свои тоны событий (None — стандартные); файлы пересоздаются при следующем звуке."""
+        self._tones = tones
+        self._paths = None
+        self._pools.clear()
+        self._pending.clear()
+
     def set_enabled(self, enabled: bool) -> None:
         self._enabled = enabled
 
     def set_volume(self, volume: float) -> None:
         self._volume = max(0.0, min(1.0, volume))
-        for e in self._effects.values():
-            e.setVolume(self._volume)
+        for pool in self._pools.values():
+            for e in pool:
+                e.setVolume(self._volume)
 
-    def _play(self, key: str) -> None:
-        if not self._enabled or key not in self._paths:
+    def warm_up(self) -> None:
+        """
+        Создаёт и загружает пулы эффектов для всех событий. Вызывается из GUI-потока
+        после показа модуля; загрузка файлов в QSoundEffect идёт асинхронно.
+        """
+        if not self._enabled:
+            return
+        if self._paths is None:
+            self._paths = _ensure_sounds(self._tones)
+        for key in self._paths:
+            self._pool(key)
+
+    def is_warm(self) -> bool:
+        """Все эффекты загружены и готовы к мгновенному воспроизведению."""
+        from PySide6.QtMultimedia import QSoundEffect
+
+        return bool(self._pools) and all(
+            e.status() == QSoundEffect.Status.Ready for pool in self._pools.values() for e in pool
+        )
+
+    def latency_stats(self) -> dict[str, PlaybackLatency]:
+        """Задержка событие → звук по событиям (мс)."""
+        return dict(self._latency)
+
+    def _pool(self, key: str) -> list["QSoundEffect"]:
+        pool = self._pools.get(key)
+        if pool is None:
+            from PySide6.QtCore import QUrl
+            from PySide6.QtMultimedia import QSoundEffect
+
+            url = QUrl.fromLocalFile(str(self._paths[key]))
+            pool = []
+            for _ in range(self.POOL_SIZE):
+                effect = QSoundEffect()
+                effect.setSource(url)
+                effect.setVolume(self._volume)
+                effect.playingChanged.connect(lambda e=effect: self._on_playing_changed(e))
+                pool.append(effect)
+            self._pools[key] = pool
+            self._next_in_pool[key] = 0
+        return pool
+
+    def _on_playing_changed(self, effect: "QSoundEffect") -> None:
+        if not effect.isPlaying():
+            return
+        pending = self._pending.pop(id(effect), None)
+        if pending is not None:
+            key, event_at = pending
+            ms = max(0.0, (time.monotonic() - event_at) * 1000)
+            self._latency.setdefault(key, PlaybackLatency()).add(ms)
+
+    def _play(self, key: str, event_at: float | None = None) -> None:
+        """event_at — момент события по time.monotonic() (по умолчанию — сейчас)."""
+        if not self._enabled:
+            return
+        if event_at is None:
+            event_at = time.monotonic()
+        if self._paths is None:
+            self._paths = _ensure_sounds(self._tones)
+        if key not in self._paths:
             return
-        path = self._paths[key]
-        if key not in self._effects:
-            effect = QSoundEffect()
-            effect.setSource(QUrl.fromLocalFile(str(path)))
-            effect.setVolume(self._volume)
-            self._effects[key] = effect
-        self._effects[key].play()
+        pool = self._pool(key)
+        # Свободный эффект из пула; если все звучат — по кругу, начиная с самого старого
+        effect = next((e for e in pool if not e.isPlaying()), None)
+        if effect is None:
+            i = self._next_in_pool[key]
+            effect = pool[i]
+            self._next_in_pool[key] = (i + 1) % len(pool)
+            effect.stop()
+        self._pending[id(effect)] = (key, event_at)
+        effect.play()
 
-    def play_start_work(self) -> None:
-        self._play("start_work")
+    def play_start_work(self, event_at: float | None = None) -> None:
+        self._play("start_work", event_at)
 
-    def play_end_work(self) -> None:
-        self._play("end_work")
+    def play_end_work(self, event_at: float | None = None) -> None:
+        self._play("end_work", event_at)
 
-    def play_start_break(self) -> None:
-        self._play("start_break")
+    def play_start_break(self, event_at: float | None = None) -> None:
+        self._play("start_break", event_at)
 
-    def play_end_break(self) -> None:
-        self._play("end_break")
+    def play_end_break(self, event_at: float | None = None) -> None:
+        self._play("end_break", event_at)
@@ -0,0 +1,216 @@
+"""
+SQLite-хранилище истории Pomodoro (необязательный бэкенд).
+Индексы по started_at и (mode, started_at): выборки за период, подсчёты
+и суммы по задачам выполняются индексными запросами, а не просмотром всей истории.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Collection, Iterator, Optional
+
+from .pomodoro_storage import ITER_BATCH_SIZE, HistoryStore, JournalHistoryStore
+
+DB_NAME = "history.sqlite3"
+
+_FIELDS = ("started_at", "finished_at", "duration_seconds", "mode", "task_name")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT NOT NULL,
+    duration_seconds INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    task_name TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_records_started ON records(started_at);
+CREATE INDEX IF NOT EXISTS idx_records_mode_started ON records(mode, started_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _row_values(record: dict) -> tuple:
+    return (
+        record.get("started_at", ""),
+        record.get("finished_at", ""),
+        int(record.get("duration_seconds", 0)),
+        record.get("mode", "work"),
+        record.get("task_name", "") or "",
+    )
+
+
+class SqliteHistoryStore(HistoryStore):
+    """История в одной таблице records; meta хранит отметки об импорте."""
+
+    def __init__(self, db_path: Path):
+        self._db_path = Path(db_path)
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Соединение может открыть фоновый прогрев модуля, а использовать — GUI-поток;
+        # обращения сериализуются блокировкой
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _fetchall(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _rows(self, where: str = "", params: tuple = ()) -> list[dict]:
+        sql = f"SELECT {', '.join(_FIELDS)} FROM records {where} ORDER BY id"
+        return [dict(row) for row in self._fetchall(sql, params)]
+
+    def load(self) -> list[dict]:
+        return self._rows()
+
+    def append(self, record: dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO records ({', '.join(_FIELDS)}) VALUES (?, ?, ?, ?, ?)",
+                _row_values(record),
+            )
+
+    def count(self) -> int:
+        return int(self._fetchall("SELECT COUNT(*) FROM records")[0][0])
+
+    def records_from(self, cutoff: str) -> list[dict]:
+        return self._rows("WHERE started_at >= ?", (cutoff,))
+
+    def records_between(self, start: str, end: str, mode: Optional[str] = None) -> list[dict]:
+        if mode is None:
+            return self._rows("WHERE started_at >= ? AND started_at < ?", (start, end))
+        return self._rows(
+            "WHERE mode = ? AND started_at >= ? AND started_at < ?", (mode, start, end)
+        )
+
+    def count_from(self, cutoff: str, mode: Optional[str] = None) -> int:
+        if mode is None:
+            rows = self._fetchall("SELECT COUNT(*) FROM records WHERE started_at >= ?", (cutoff,))
+        else:
+            rows = self._fetchall(
+                "SELECT COUNT(*) FROM records WHERE mode = ? AND started_at >= ?",
+                (mode, cutoff),
+            )
+        return int(rows[0][0])
+
+    def count_between(self, start: str, end: str, mode: Optional[str] = None) -> int:
+        return self.count_matching(start, end, (mode,) if mode is not None else None)
+
+    @staticmethod
+    def _filter_sql(
+        start: Optional[str],
+        end: Optional[str],
+        modes: Optional[Collection[str]],
+    ) -> tuple[list[str], list]:
+        conditions: list[str] = []
+        params: list = []
+        if modes is not None:
+            modes = list(modes)
+            conditions.append(f"mode IN ({', '.join('?' * len(modes))})" if modes else "0")
+            params.extend(modes)
+        if start is not None:
+            conditions.append("started_at >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("started_at < ?")
+            params.append(end)
+        return conditions, params
+
+    def iter_batches(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        modes: Optional[Collection[str]] = None,
+        batch_size: int = ITER_BATCH_SIZE,
+    ) -> Iterator[list[dict]]:
+        # Постраничная выборка по id: каждый пакет — отдельный короткий запрос,
+        # соединение не занято между пакетами и запись в историю не ждёт экспорта
+        conditions, params = self._filter_sql(start, end, modes)
+        last_id = 0
+        while True:
+            where = " AND ".join(["id > ?", *conditions])
+            rows = self._fetchall(
+                f"SELECT id, {', '.join(_FIELDS)} FROM records WHERE {where} ORDER BY id LIMIT ?",
+                (last_id, *params, batch_size),
+            )
+            if not rows:
+                return
+            last_id = rows[-1]["id"]
+            yield [{f: row[f] for f in _FIELDS} for row in rows]
+            if len(rows) < batch_size:
+                return
+
+    def count_matching(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        modes: Optional[Collection[str]] = None,
+    ) -> int:
+        conditions, params = self._filter_sql(start, end, modes)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return int(self._fetchall(f"SELECT COUNT(*) FROM records {where}", tuple(params))[0][0])
+
+    def task_totals(self, cutoff: str) -> dict[str, int]:
+        rows = self._fetchall(
+            "SELECT task_name, SUM(duration_seconds) FROM records "
+            "WHERE mode = 'work' AND started_at >= ? GROUP BY task_name",
+            (cutoff,),
+        )
+        return {row[0]: int(row[1]) for row in rows}
+
+    def sync_journal(self, journal: JournalHistoryStore) -> tuple[int, int]:
+        """См. sync_with_journal()."""
+        with self._lock:
+            meta = {row[0]: row[1] for row in self._fetchall("SELECT key, value FROM meta")}
+            if "sync:journal_count" in meta:
+                journal_count = int(meta["sync:journal_count"])
+                exported_id = int(meta["sync:exported_id"])
+            else:
+                # Прежний однократный импорт журнала шёл сразу после создания базы:
+                # его записи получили id 1..N
+                journal_count = exported_id = int(meta.get("imported:journal", 0))
+            journal_records = journal.load()
+            to_sqlite = [r for r in journal_records[journal_count:] if isinstance(r, dict)]
+            to_journal = [
+                {f: row[f] for f in _FIELDS}
+                for row in self._fetchall(
+                    f"SELECT {', '.join(_FIELDS)} FROM records WHERE id > ? ORDER BY id", (exported_id,)
+                )
+            ]
+            # Сначала журнал: при сбое до отметок в meta перенос повторится (дубли), а не потеряется
+            journal.append_many(to_journal)
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT INTO records ({', '.join(_FIELDS)}) VALUES (?, ?, ?, ?, ?)",
+                    (_row_values(r) for r in to_sqlite),
+                )
+                last_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM records").fetchone()[0]
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    (
+                        ("sync:journal_count", str(len(journal_records) + len(to_journal))),
+                        ("sync:exported_id", str(last_id)),
+                    ),
+                )
+            return len(to_sqlite), len(to_journal)
+
+
+def sync_with_journal(store: SqliteHistoryStore, journal: JournalHistoryStore) -> tuple[int, int]:
+    """
+    Досинхронизация SQLite и журнального хранилища при смене бэкенда.
+    Отметки в meta: journal_count — сколько первых записей журнала уже есть в SQLite,
+    exported_id — до какого id записи SQLite уже есть в журнале. Записи, добавленные
+    при активном SQLite, дописываются в журнал, добавленные при активном журнале —
+    в SQLite, так что история видна целиком при любом выбранном бэкенде.
+    Возвращает (перенесено в SQLite, перенесено в журнал).
+    """
+    return store.sync_journal(journal)
@@ -1,121 +1,462 @@
 """
-История помидоров: сохранение, статистика за день/неделю/месяц, экспорт CSV/JSON.
+История помидоров: сохранение, статистика за день/неделю/месяц, дневные итоги
+за произвольный диапазон дат, экспорт CSV/JSON.
 """
 
-import csv
-import json
-from dataclasses import asdict, dataclass
-from datetime import datetime, timedelta
+import atexit
+import threading
+from bisect import bisect_left, insort
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, time, timedelta
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
+try:
+    from src.core.app_files import config_dir
+except ImportError:
+    from core.app_files import config_dir
+
+from .pomodoro_records import PomodoroRecord, RecordColumns
+from .pomodoro_rollup import ROLLUP_NAME, DailyRollup, DayTotals
+from .pomodoro_storage import HistoryStore, JournalHistoryStore
+
+if TYPE_CHECKING:
+    # Экспортёр (csv, json, форматы) — ~90 мс импорта: загружается при первом экспорте
+    from .pomodoro_export import ExportFilter
+
+
+def _data_dir() -> Path:
+    return config_dir("Pomodoro")
+
+
+_backend = "journal"
+_store: Optional[HistoryStore] = None
+# Хранилище, итоги и агрегатор могут создаваться фоновым прогревом модуля
+_lock = threading.RLock()
+
+
+def set_backend(name: str) -> None:
+    """
+    Выбор хранилища истории: "journal" (по умолчанию) или "sqlite".
+    При смене бэкенда агрегатор статистики пересоздаётся при следующем обращении.
+    """
+    global _backend, _store, _rollup, _aggregator
+    with _lock:
+        if name == _backend:
+            return
+        _backend = name
+        if _store is not None:
+            _store.close()
+        _store = None
+        _rollup = None
+        _aggregator = None
+
+
+def open_store(name: str, folder: Path) -> HistoryStore:
+    """
+    Хранилище бэкенда name. Перед открытием записи, сделанные при другом бэкенде,
+    переносятся в выбранный (журнал заодно переносит старый history.json).
+    """
+    from .pomodoro_sqlite import DB_NAME, SqliteHistoryStore, sync_with_journal
+
+    journal = JournalHistoryStore(folder)
+    if name == "sqlite":
+        store = SqliteHistoryStore(folder / DB_NAME)
+        sync_with_journal(store, journal)
+        return store
+    if (folder / DB_NAME).exists():
+        sqlite_store = SqliteHistoryStore(folder / DB_NAME)
+        try:
+            sync_with_journal(sqlite_store, journal)
+        finally:
+            sqlite_store.close()
+    return journal
 
-@dataclass
-class PomodoroRecord:
-    """Одна запись: один завершённый интервал (работа или перерыв)."""
 
-    started_at: str
-    finished_at: str
-    duration_seconds: int
-    mode: str  # "work" | "short_break" | "long_break"
-    task_name: str = ""
+def _get_store() -> HistoryStore:
+    """Хранилище истории выбранного бэкенда рядом с бывшим history.json."""
+    global _store
+    with _lock:
+        if _store is None:
+            _store = open_store(_backend, _data_dir())
+        return _store
 
 
-def _data_path() -> Path:
-    from PySide6.QtCore import QStandardPaths
-    loc = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppConfigLocation)
-    folder = Path(loc) / "Personal_Dashboard" / "Pomodoro"
-    folder.mkdir(parents=True, exist_ok=True)
-    return folder / "history.json"
+_rollup: Optional[DailyRollup] = None
+
+
+def _get_rollup() -> DailyRollup:
+    """Дневные итоги; если они не сходятся с историей по числу записей — пересборка."""
+    global _rollup
+    with _lock:
+        if _rollup is None:
+            store = _get_store()
+            rollup = DailyRollup.load(_data_dir() / ROLLUP_NAME)
+            if rollup.record_count != store.count():
+                rollup.rebuild(store.load())
+                rollup.save()
+            _rollup = rollup
+        return _rollup
+
+
+def rebuild_rollup() -> None:
+    """Пересобирает дневные итоги из сырой истории текущего хранилища."""
+    global _aggregator
+    with _lock:
+        rollup = _get_rollup()
+        rollup.rebuild(_get_store().load())
+        rollup.save()
+        _aggregator = None
 
 
 def _load_history() -> list[dict]:
-    p = _data_path()
-    if not p.exists():
-        return []
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
-        return data if isinstance(data, list) else []
+        return _get_store().load()
     except Exception:
         return []
 
 
-def _save_history(records: list[dict]) -> None:
-    p = _data_path()
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+# Очередь новых записей: в историю и итоги их пишет фоновый поток, поэтому
+# add_record() из GUI-потока не ждёт ни fsync, ни загрузку и пересборку итогов
+_pending: list[dict] = []
+_pending_changed = threading.Condition()
+_writer: Optional[threading.Thread] = None
+last_write_error: Optional[Exception] = None
 
 
 def add_record(record: PomodoroRecord) -> None:
-    records = _load_history()
-    records.append(asdict(record))
-    _save_history(records)
+    """Ставит запись в очередь на сохранение и сразу возвращается."""
+    global _writer
+    with _pending_changed:
+        _pending.append(asdict(record))
+        if _writer is None:
+            _writer = threading.Thread(target=_run_writer, name="pomodoro-history", daemon=True)
+            _writer.start()
+            atexit.register(flush_records)
+        _pending_changed.notify_all()
+
+
+def flush_records(timeout: Optional[float] = None) -> bool:
+    """Ждёт, пока очередь записей сохранится (выход из приложения); False — не дождались."""
+    with _pending_changed:
+        return _pending_changed.wait_for(lambda: not _pending, timeout)
+
+
+def _run_writer() -> None:
+    global last_write_error
+    while True:
+        with _pending_changed:
+            _pending_changed.wait_for(lambda: _pending)
+            batch = list(_pending)
+        try:
+            _write_records(batch)
+            last_write_error = None
+        except Exception as e:
+            # Хранилище не открылось или диск недоступен: записи пачки потеряны
+            last_write_error = e
+        with _pending_changed:
+            del _pending[:len(batch)]
+            _pending_changed.notify_all()
+
+
+def _write_records(records: list[dict]) -> None:
+    with _lock:
+        store = _get_store()
+        rollup = _get_rollup()
+        for data in records:
+            if _aggregator is not None:
+                # Агрегатор учитывает запись до того, как она попадёт в историю, и не
+                # отпускает блокировку до записи: иначе при сдвиге окна он прочитает
+                # её из хранилища и посчитает дважды.
+                with _aggregator.lock:
+                    _aggregator.add(data["started_at"], data["mode"])
+                    store.append(data)
+            else:
+                store.append(data)
+            rollup.add(data)
+        try:
+            rollup.save()
+        except OSError:
+            # Итоги разойдутся с историей по числу записей и пересоберутся при запуске
+            pass
+
+
+def _records_from(cutoff: str) -> list[dict]:
+    try:
+        return _get_store().records_from(cutoff)
+    except Exception:
+        return []
+
+
+def _to_record(r: dict) -> PomodoroRecord:
+    return PomodoroRecord(
+        started_at=r["started_at"],
+        finished_at=r["finished_at"],
+        duration_seconds=r["duration_seconds"],
+        mode=r.get("mode", "work"),
+        task_name=r.get("task_name", ""),
+    )
 
 
 def get_records_from(dt: datetime) -> list[PomodoroRecord]:
-    cutoff = dt.isoformat()
-    records = _load_history()
+    return [_to_record(r) for r in _records_from(dt.isoformat())]
+
+
+def get_records_between(start: datetime, end: datetime, mode: Optional[str] = None) -> list[PomodoroRecord]:
+    """Записи с start <= started_at < end (при mode — только этого режима)."""
+    try:
+        records = _get_store().records_between(start.isoformat(), end.isoformat(), mode)
+    except Exception:
+        return []
+    return [_to_record(r) for r in records]
+
+
+def get_count_between(start: datetime, end: datetime, mode: Optional[str] = "work") -> int:
+    """Число записей в [start, end) без создания PomodoroRecord (по умолчанию — рабочих)."""
+    try:
+        return _get_store().count_between(start.isoformat(), end.isoformat(), mode)
+    except Exception:
+        return 0
+
+
+def get_count_from(dt: datetime, mode: Optional[str] = "work") -> int:
+    """Число записей начиная с dt (по умолчанию — рабочих интервалов)."""
+    try:
+        return _get_store().count_from(dt.isoformat(), mode)
+    except Exception:
+        return 0
+
+
+def get_task_totals(dt: datetime) -> dict[str, int]:
+    """Секунды работы по задачам начиная с dt."""
+    try:
+        return _get_store().task_totals(dt.isoformat())
+    except Exception:
+        return {}
+
+
+def _parse_dt(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class _RollingWindow:
+    """Окно «с cutoff до сейчас»: граничный день читается из истории, остальные — из итогов."""
+
+    day: date = date.min
+    starts: list[datetime] = field(default_factory=list)
+    pos: int = 0
+    count: int = 0
+
+
+class PomodoroStatsAggregator:
+    """
+    Счётчики рабочих помидоров за сегодня / 7 дней / 30 дней в памяти.
+    Целые дни окна берутся из дневных итогов, сырые записи читаются только за
+    граничный день окна. Дальше add() обновляет счётчики инкрементально, а границы
+    окон сдвигаются вперёд курсором (через полночь — переходом на следующий
+    граничный день), поэтому counts() — амортизированно O(1).
+    add() и counts() идут под lock: запись добавляет фоновый поток, счётчики
+    читает интерфейс.
+    """
+
+    WEEK_DAYS = 7
+    MONTH_DAYS = 30
+
+    def __init__(
+        self,
+        rollup: DailyRollup,
+        day_work_starts: Callable[[date], list[datetime]],
+        now_func: Callable[[], datetime] = datetime.now,
+    ):
+        self._rollup = rollup
+        self._day_work_starts = day_work_starts
+        self._now = now_func
+        self.lock = threading.RLock()
+        self._windows = [_RollingWindow(), _RollingWindow(), _RollingWindow()]
+        now = self._now()
+        for window, cutoff in zip(self._windows, self._cutoffs(now)):
+            self._reset(window, cutoff, now)
+
+    def _cutoffs(self, now: datetime) -> tuple[datetime, datetime, datetime]:
+        return (
+            now.replace(hour=0, minute=0, second=0, microsecond=0),
+            now - timedelta(days=self.WEEK_DAYS),
+            now - timedelta(days=self.MONTH_DAYS),
+        )
+
+    def _load_day(self, window: _RollingWindow, day: date) -> None:
+        window.day = day
+        window.starts = sorted(self._day_work_starts(day))
+        window.pos = 0
+
+    def _reset(self, window: _RollingWindow, cutoff: datetime, now: datetime) -> None:
+        """Полный пересчёт окна: граничный день из истории + целые дни из итогов."""
+        self._load_day(window, cutoff.date())
+        window.pos = bisect_left(window.starts, cutoff)
+        window.count = len(window.starts) - window.pos + self._rollup.work_count(
+            window.day + timedelta(days=1), now.date()
+        )
+
+    def _advance(self, now: datetime) -> tuple[datetime, datetime, datetime]:
+        """Сдвигает окна к текущему моменту. Границы окон только растут."""
+        cutoffs = self._cutoffs(now)
+        for window, cutoff in zip(self._windows, cutoffs):
+            cutoff_day = cutoff.date()
+            if cutoff_day != window.day:
+                gap = (cutoff_day - window.day).days
+                if gap < 0 or gap > self.MONTH_DAYS:
+                    self._reset(window, cutoff, now)
+                    continue
+                # Граничный день целиком вышел из окна, пропущенные дни — тоже
+                window.count -= len(window.starts) - window.pos
+                window.count -= self._rollup.work_count(
+                    window.day + timedelta(days=1), cutoff_day - timedelta(days=1)
+                )
+                self._load_day(window, cutoff_day)
+            starts = window.starts
+            while window.pos < len(starts) and starts[window.pos] < cutoff:
+                window.pos += 1
+                window.count -= 1
+        return cutoffs
+
+    def add(self, started_at: str, mode: str) -> None:
+        """Учитывает новую запись истории; вызывать до её записи в хранилище и итоги."""
+        if mode != "work":
+            return
+        started = _parse_dt(started_at)
+        if started is None:
+            return
+        with self.lock:
+            cutoffs = self._advance(self._now())
+            for window, cutoff in zip(self._windows, cutoffs):
+                if started.date() == window.day:
+                    insort(window.starts, started)
+                    if started < cutoff:
+                        window.pos += 1
+                if started >= cutoff:
+                    window.count += 1
+
+    def counts(self) -> tuple[int, int, int]:
+        """(сегодня, неделя, месяц) — число завершённых рабочих интервалов."""
+        with self.lock:
+            self._advance(self._now())
+            today, week, month = self._windows
+            return today.count, week.count, month.count
+
+    def today_count(self) -> int:
+        return self.counts()[0]
+
+    def week_count(self) -> int:
+        return self.counts()[1]
+
+    def month_count(self) -> int:
+        return self.counts()[2]
+
+
+_aggregator: Optional[PomodoroStatsAggregator] = None
+
+
+def _day_work_starts(store: HistoryStore, day: date) -> list[datetime]:
+    # Без модульной _lock: счётчики не ждут запись и пересборку, хранилище само потокобезопасно
+    start = datetime.combine(day, time.min)
+    end = start + timedelta(days=1)
+    try:
+        records = store.records_between(start.isoformat(), end.isoformat(), "work")
+    except Exception:
+        return []
     out = []
     for r in records:
-        if r.get("started_at", "") >= cutoff:
-            out.append(PomodoroRecord(
-                started_at=r["started_at"],
-                finished_at=r["finished_at"],
-                duration_seconds=r["duration_seconds"],
-                mode=r.get("mode", "work"),
-                task_name=r.get("task_name", ""),
-            ))
+        started = _parse_dt(r.get("started_at", ""))
+        if started is not None:
+            out.append(started)
     return out
 
 
+def get_aggregator() -> PomodoroStatsAggregator:
+    """Общий агрегатор статистики; создаётся при первом обращении."""
+    global _aggregator
+    with _lock:
+        if _aggregator is None:
+            _aggregator = PomodoroStatsAggregator(_get_rollup(), partial(_day_work_starts, _get_store()))
+        return _aggregator
+
+
+def get_range_totals(start: date, end: date) -> DayTotals:
+    """Итоги за дни [start, end] включительно (не больше одной строки на день)."""
+    with _lock:
+        return _get_rollup().totals(start, end)
+
+
+def get_daily_totals(start: date, end: date) -> list[tuple[date, DayTotals]]:
+    """Итоги по дням [start, end] — для графиков; пустые дни пропускаются."""
+    with _lock:
+        return _get_rollup().days(start, end)
+
+
 def get_today_count() -> int:
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    records = get_records_from(today)
-    return sum(1 for r in records if r.mode == "work")
+    return get_aggregator().today_count()
 
 
 def get_week_count() -> int:
-    week_ago = datetime.now() - timedelta(days=7)
-    records = get_records_from(week_ago)
-    return sum(1 for r in records if r.mode == "work")
+    return get_aggregator().week_count()
 
 
 def get_month_count() -> int:
-    month_ago = datetime.now() - timedelta(days=30)
-    records = get_records_from(month_ago)
-    return sum(1 for r in records if r.mode == "work")
+    return get_aggregator().month_count()
 
 
 def get_all_records() -> list[PomodoroRecord]:
-    records = _load_history()
-    return [
-        PomodoroRecord(
-            started_at=r["started_at"],
-            finished_at=r["finished_at"],
-            duration_seconds=r["duration_seconds"],
-            mode=r.get("mode", "work"),
-            task_name=r.get("task_name", ""),
-        )
-        for r in records
-    ]
+    return list(get_record_columns())
+
+
+def get_record_columns(flt: Optional["ExportFilter"] = None) -> RecordColumns:
+    """
+    История (с фильтром по датам и режимам; None — вся) в компактном столбцовом виде.
+    Записи читаются из хранилища пакетами, без промежуточного списка всех словарей.
+    """
+    columns = RecordColumns()
+    query = flt.query() if flt is not None else ()
+    try:
+        for batch in _get_store().iter_batches(*query):
+            columns.extend(batch)
+    except Exception:
+        pass
+    return columns
+
+
+def export_history(
+    file_path: Path,
+    fmt: Optional[str] = None,
+    flt: Optional["ExportFilter"] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> int:
+    """
+    Потоковый экспорт истории (CSV/JSON) с фильтрами; можно вызывать из рабочего потока.
+    Возвращает число записей; ошибки и ExportCancelled пробрасываются вызывающему.
+    """
+    from .pomodoro_export import ExportFilter
+    from .pomodoro_export import export_history as _export_history
+
+    return _export_history(_get_store(), file_path, fmt, flt or ExportFilter(), progress, cancel)
 
 
-def export_csv(file_path: Path) -> bool:
+def export_csv(file_path: Path, flt: Optional["ExportFilter"] = None) -> bool:
     try:
-        records = _load_history()
-        with open(file_path, "w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=["started_at", "finished_at", "duration_seconds", "mode", "task_name"])
-            w.writeheader()
-            w.writerows(records)
+        export_history(file_path, "csv", flt)
         return True
     except Exception:
         return False
 
 
-def export_json(file_path: Path) -> bool:
+def export_json(file_path: Path, flt: Optional["ExportFilter"] = None) -> bool:
     try:
-        records = _load_history()
-        file_path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+        export_history(file_path, "json", flt)
         return True
     except Exception:
         return False
@@ -0,0 +1,407 @@
+"""
+Хранилище истории Pomodoro: снимок + журнал только на добавление (JSON Lines).
+Новая запись дописывается одной строкой в журнал с fsync — O(1) вместо
+перезаписи всего файла. Журнал периодически сворачивается в снимок атомарно
+(временный файл + os.replace), старый history.json переносится при первом запуске.
+Выборки по периоду в журнальном хранилище — бинарным поиском по индексу времени.
+"""
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Collection, Iterator, Optional
+
+try:
+    from src.core.app_files import write_lines_atomic
+except ImportError:
+    from core.app_files import write_lines_atomic
+
+from .pomodoro_records import INVALID_TIME, iso_to_us
+
+SNAPSHOT_NAME = "history.jsonl"
+# Размер пакета записей при потоковом чтении (экспорт)
+ITER_BATCH_SIZE = 1000
+JOURNAL_NAME = "history.journal"
+LEGACY_NAME = "history.json"
+FORMAT_VERSION = 1
+
+
+class HistoryStore(ABC):
+    """Абстрактное хранилище записей истории (словари полей PomodoroRecord)."""
+
+    @abstractmethod
+    def load(self) -> list[dict]:
+        """Возвращает все записи в порядке добавления."""
+        pass
+
+    @abstractmethod
+    def append(self, record: dict) -> None:
+        """Добавляет одну запись."""
+        pass
+
+    def close(self) -> None:
+        """Освобождает ресурсы хранилища (файлы, соединения)."""
+        pass
+
+    # Запросы по диапазону; по умолчанию — просмотр всех записей,
+    # хранилища с индексами переопределяют их.
+
+    def count(self) -> int:
+        """Общее число записей."""
+        return len(self.load())
+
+    def records_from(self, cutoff: str) -> list[dict]:
+        """Записи с started_at >= cutoff (ISO-строка)."""
+        return [r for r in self.load() if r.get("started_at", "") >= cutoff]
+
+    def records_between(self, start: str, end: str, mode: Optional[str] = None) -> list[dict]:
+        """Записи с start <= started_at < end, при mode — только этого режима."""
+        return [
+            r
+            for r in self.load()
+            if start <= r.get("started_at", "") < end
+            and (mode is None or r.get("mode", "work") == mode)
+        ]
+
+    def count_from(self, cutoff: str, mode: Optional[str] = None) -> int:
+        """Число записей с started_at >= cutoff, при mode — только этого режима."""
+        return sum(
+            1
+            for r in self.records_from(cutoff)
+            if mode is None or r.get("mode", "work") == mode
+        )
+
+    def count_between(self, start: str, end: str, mode: Optional[str] = None) -> int:
+        """Число записей с start <= started_at < end, при mode — только этого режима."""
+        return len(self.records_between(start, end, mode))
+
+    def iter_batches(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        modes: Optional[Collection[str]] = None,
+        batch_size: int = ITER_BATCH_SIZE,
+    ) -> Iterator[list[dict]]:
+        """
+        Записи с start <= started_at < end (границы необязательны) и режимом из modes,
+        пакетами по batch_size в порядке добавления — для потоковой обработки.
+        """
+        batch: list[dict] = []
+        for r in self.load():
+            started = r.get("started_at", "")
+            if start is not None and started < start:
+                continue
+            if end is not None and started >= end:
+                continue
+            if modes is not None and r.get("mode", "work") not in modes:
+                continue
+            batch.append(r)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def count_matching(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        modes: Optional[Collection[str]] = None,
+    ) -> int:
+        """Число записей, которые вернёт iter_batches с теми же фильтрами."""
+        return sum(len(b) for b in self.iter_batches(start, end, modes))
+
+    def task_totals(self, cutoff: str) -> dict[str, int]:
+        """Секунды работы по задачам для записей с started_at >= cutoff."""
+        totals: dict[str, int] = {}
+        for r in self.records_from(cutoff):
+            if r.get("mode", "work") != "work":
+                continue
+            task = r.get("task_name", "")
+            totals[task] = totals.get(task, 0) + int(r.get("duration_seconds", 0))
+        return totals
+
+
+def _read_lines(path: Path) -> tuple[Optional[dict], list[dict], int]:
+    """
+    Читает файл JSON Lines: (заголовок, записи, число битых строк).
+    Битая строка — обычно недописанный хвост после сбоя; она пропускается.
+    """
+    if not path.exists():
+        return None, [], 0
+    header: Optional[dict] = None
+    records: list[dict] = []
+    bad = 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for i, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                bad += 1
+                continue
+            if not isinstance(obj, dict):
+                bad += 1
+            elif i == 0 and "journal" in obj:
+                header = obj
+            else:
+                records.append(obj)
+    return header, records, bad
+
+
+def _bound(value: Optional[str]) -> Optional[int]:
+    """Граница выборки (ISO-строка) в микросекундах; None — не разбирается или не задана."""
+    if value is None:
+        return None
+    try:
+        return iso_to_us(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _TimeIndex:
+    """
+    Отсортированный индекс started_at: время (мкс) и номер записи, общий и по режимам.
+    Записи приходят почти всегда по порядку — тогда добавление в конец за O(1);
+    запись «из прошлого» вставляется на своё место.
+    """
+
+    def __init__(self):
+        self._times = array("q")
+        self._positions = array("q")
+        self._mode_times: dict[str, array] = {}
+        self._mode_positions: dict[str, array] = {}
+
+    @staticmethod
+    def _insert(times: array, positions: array, t: int, position: int) -> None:
+        if not times or t >= times[-1]:
+            times.append(t)
+            positions.append(position)
+        else:
+            i = bisect_right(times, t)
+            times.insert(i, t)
+            positions.insert(i, position)
+
+    def add(self, record: dict, position: int) -> None:
+        try:
+            t = iso_to_us(record.get("started_at", ""))
+        except (TypeError, ValueError):
+            # Неразборчивое время попадает только в выборки без нижней границы
+            t = INVALID_TIME
+        self._insert(self._times, self._positions, t, position)
+        mode = record.get("mode", "work")
+        if mode not in self._mode_times:
+            self._mode_times[mode] = array("q")
+            self._mode_positions[mode] = array("q")
+        self._insert(self._mode_times[mode], self._mode_positions[mode], t, position)
+
+    def _arrays(self, mode: Optional[str]) -> tuple[array, array]:
+        if mode is None:
+            return self._times, self._positions
+        return self._mode_times.get(mode, array("q")), self._mode_positions.get(mode, array("q"))
+
+    def _range(self, times: array, start: Optional[int], end: Optional[int]) -> tuple[int, int]:
+        lo = bisect_left(times, start) if start is not None else 0
+        hi = bisect_left(times, end) if end is not None else len(times)
+        return lo, max(lo, hi)
+
+    def positions(self, start: Optional[int], end: Optional[int], mode: Optional[str] = None) -> array:
+        times, positions = self._arrays(mode)
+        lo, hi = self._range(times, start, end)
+        return positions[lo:hi]
+
+    def count(self, start: Optional[int], end: Optional[int], mode: Optional[str] = None) -> int:
+        lo, hi = self._range(self._arrays(mode)[0], start, end)
+        return hi - lo
+
+
+class JournalHistoryStore(HistoryStore):
+    """
+    Снимок history.jsonl + журнал history.journal.
+    Заголовок журнала хранит номер поколения, заголовок снимка — номер уже
+    свёрнутого поколения: если сбой произошёл между заменой снимка и очисткой
+    журнала, журнал с тем же номером при загрузке игнорируется (без дублей).
+    Методы потокобезопасны: запись идёт из фонового потока, пока интерфейс
+    и экспорт читают историю.
+    """
+
+    # Сколько записей журнала копить до сворачивания в снимок
+    COMPACT_THRESHOLD = 200
+
+    def __init__(self, folder: Path):
+        self._folder = Path(folder)
+        self._snapshot_path = self._folder / SNAPSHOT_NAME
+        self._journal_path = self._folder / JOURNAL_NAME
+        self._legacy_path = self._folder / LEGACY_NAME
+        self._records: Optional[list[dict]] = None
+        self._index: Optional[_TimeIndex] = None
+        self._generation = 1
+        self._journal_count = 0
+        self._journal_ready = False
+        self._lock = threading.RLock()
+
+    def load(self) -> list[dict]:
+        with self._lock:
+            return list(self._ensure_loaded())
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._ensure_loaded())
+
+    def append(self, record: dict) -> None:
+        with self._lock:
+            records = self._ensure_loaded()
+            if not self._journal_ready:
+                self._folder.mkdir(parents=True, exist_ok=True)
+                self._start_journal()
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            with open(self._journal_path, "a", encoding="utf-8", newline="\n") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            records.append(record)
+            if self._index is not None:
+                self._index.add(record, len(records) - 1)
+            self._journal_count += 1
+            if self._journal_count >= self.COMPACT_THRESHOLD:
+                self.compact()
+
+    def append_many(self, records: list[dict]) -> None:
+        """Дописывает пачку записей (перенос из другого хранилища): одна перезапись снимка."""
+        if not records:
+            return
+        with self._lock:
+            self._ensure_loaded().extend(records)
+            self._index = None
+            self.compact()
+
+    def _ensure_index(self) -> "_TimeIndex":
+        records = self._ensure_loaded()
+        if self._index is None:
+            index = _TimeIndex()
+            for position, record in enumerate(records):
+                index.add(record, position)
+            self._index = index
+        return self._index
+
+    def _positions(self, start: Optional[str], end: Optional[str], mode: Optional[str] = None) -> list[int]:
+        """Номера записей в диапазоне, в порядке добавления; O(log N + k)."""
+        with self._lock:
+            positions = self._ensure_index().positions(_bound(start), _bound(end), mode)
+        return sorted(positions)
+
+    def records_from(self, cutoff: str) -> list[dict]:
+        if _bound(cutoff) is None:
+            return super().records_from(cutoff)
+        with self._lock:
+            records = self._ensure_loaded()
+            return [records[i] for i in self._positions(cutoff, None)]
+
+    def records_between(self, start: str, end: str, mode: Optional[str] = None) -> list[dict]:
+        if _bound(start) is None or _bound(end) is None:
+            return super().records_between(start, end, mode)
+        with self._lock:
+            records = self._ensure_loaded()
+            return [records[i] for i in self._positions(start, end, mode)]
+
+    def count_from(self, cutoff: str, mode: Optional[str] = None) -> int:
+        if _bound(cutoff) is None:
+            return super().count_from(cutoff, mode)
+        with self._lock:
+            return self._ensure_index().count(_bound(cutoff), None, mode)
+
+    def count_between(self, start: str, end: str, mode: Optional[str] = None) -> int:
+        if _bound(start) is None or _bound(end) is None:
+            return super().count_between(start, end, mode)
+        with self._lock:
+            return self._ensure_index().count(_bound(start), _bound(end), mode)
+
+    def iter_batches(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        modes: Optional[Collection[str]] = None,
+        batch_size: int = ITER_BATCH_SIZE,
+    ) -> Iterator[list[dict]]:
+        if start is not None and _bound(start) is None or end is not None and _bound(end) is None:
+            yield from super().iter_batches(start, end, modes, batch_size)
+            return
+        with self._lock:
+            # Записи только дописываются: номера из индекса остаются верными и без блокировки
+            records = self._ensure_loaded()
+            positions = self._positions(start, end)
+        for i in range(0, len(positions), batch_size):
+            batch = [records[p] for p in positions[i:i + batch_size]]
+            if modes is not None:
+                batch = [r for r in batch if r.get("mode", "work") in modes]
+            if batch:
+                yield batch
+
+    def compact(self) -> None:
+        """Сворачивает журнал в снимок и начинает новое поколение журнала."""
+        with self._lock:
+            records = self._ensure_loaded()
+            self._folder.mkdir(parents=True, exist_ok=True)
+            header = {"format": FORMAT_VERSION, "journal": self._generation}
+            lines = [json.dumps(header) + "\n"]
+            lines.extend(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+            write_lines_atomic(self._snapshot_path, lines)
+            self._generation += 1
+            self._start_journal()
+
+    def _start_journal(self) -> None:
+        write_lines_atomic(self._journal_path, [json.dumps({"journal": self._generation}) + "\n"])
+        self._journal_count = 0
+        self._journal_ready = True
+
+    def _ensure_loaded(self) -> list[dict]:
+        if self._records is not None:
+            return self._records
+        if not self._snapshot_path.exists() and self._legacy_path.exists():
+            self._migrate_legacy()
+            return self._records
+
+        snap_header, records, snap_bad = _read_lines(self._snapshot_path)
+        consumed = int(snap_header.get("journal", 0)) if snap_header else 0
+        journal_header, journal_records, journal_bad = _read_lines(self._journal_path)
+        journal_gen = int(journal_header.get("journal", 0)) if journal_header else 0
+
+        if journal_header is not None and journal_gen <= consumed:
+            # Журнал уже свёрнут в снимок, но не успел очиститься
+            journal_records = []
+        records.extend(journal_records)
+        self._records = records
+        self._index = None
+        self._generation = max(journal_gen, consumed + 1)
+        self._journal_count = len(journal_records)
+
+        needs_compact = (
+            snap_bad
+            or journal_bad
+            or journal_header is None and journal_records
+            or self._journal_count >= self.COMPACT_THRESHOLD
+        )
+        if needs_compact:
+            self.compact()
+        else:
+            # Устаревший или отсутствующий журнал пересоздаётся при первой записи
+            self._journal_ready = journal_header is not None and journal_gen > consumed
+        return self._records
+
+    def _migrate_legacy(self) -> None:
+        """Однократный перенос history.json в снимок; исходник остаётся как .bak."""
+        try:
+            data = json.loads(self._legacy_path.read_text(encoding="utf-8"))
+        except Exception:
+            data = []
+        self._records = [r for r in data if isinstance(r, dict)] if isinstance(data, list) else []
+        self._index = None
+        self._generation = 1
+        self.compact()
+        os.replace(self._legacy_path, self._legacy_path.with_name(LEGACY_NAME + ".bak"))
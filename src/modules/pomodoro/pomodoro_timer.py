@@ -0,0 +1,80 @@
+"""
+Движок таймера Pomodoro без накопления ошибки.
+Оставшееся и прошедшее время вычисляются от дедлайна по монотонным часам,
+а не подсчётом тиков, поэтому точность не зависит от загрузки GUI-потока.
+Часы передаются в конструктор — движок тестируется без Qt и без ожидания.
+"""
+
+import math
+import time
+from typing import Callable
+
+
+class TimerEngine:
+    """Обратный отсчёт интервала по дедлайну time.monotonic()."""
+
+    # Запас, чтобы тик гарантированно пришёлся после границы секунды
+    _WAKE_SLACK_MS = 2
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._total_seconds = 0
+        self._remaining_at_pause = 0.0
+        self._deadline: float | None = None
+
+    @property
+    def total_seconds(self) -> int:
+        return self._total_seconds
+
+    @property
+    def is_running(self) -> bool:
+        return self._deadline is not None
+
+    @property
+    def deadline(self) -> float | None:
+        """Момент окончания интервала по часам движка; None, если отсчёт не идёт."""
+        return self._deadline
+
+    def reset(self, total_seconds: int) -> None:
+        """Останавливает отсчёт и выставляет новый интервал целиком."""
+        self._total_seconds = max(1, int(total_seconds))
+        self._remaining_at_pause = float(self._total_seconds)
+        self._deadline = None
+
+    def start(self) -> None:
+        """Запускает (или продолжает после паузы) отсчёт с текущего остатка."""
+        if self._deadline is None:
+            self._deadline = self._clock() + self._remaining_at_pause
+
+    def pause(self) -> None:
+        """Замораживает остаток; повторный start() продолжит с него."""
+        if self._deadline is not None:
+            self._remaining_at_pause = self.remaining()
+            self._deadline = None
+
+    def remaining(self) -> float:
+        """Оставшееся время в секундах (не меньше нуля)."""
+        if self._deadline is None:
+            return self._remaining_at_pause
+        return max(0.0, self._deadline - self._clock())
+
+    def elapsed(self) -> float:
+        """Прошедшее время интервала в секундах."""
+        return self._total_seconds - self.remaining()
+
+    def remaining_display(self) -> int:
+        """Остаток для отображения MM:SS: округление вверх, 25:00 → 24:59 ровно через секунду."""
+        return math.ceil(self.remaining())
+
+    def is_finished(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def ms_until_next_second(self) -> int:
+        """Задержка до следующей смены remaining_display() — для единственного тика."""
+        remaining = self.remaining()
+        if remaining <= 0.0:
+            return 0
+        fraction = remaining - math.floor(remaining)
+        if fraction == 0.0:
+            fraction = 1.0
+        return math.ceil(fraction * 1000) + self._WAKE_SLACK_MS
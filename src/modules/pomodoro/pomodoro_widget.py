@@ -3,12 +3,16 @@
 звуки, текущая задача, статистика, горячие клавиши, экспорт.
 """
 
+import math
+import threading
 from datetime import datetime
 from pathlib import Path
 
-from PySide6.QtCore import QTimer, Qt, Signal
+from PySide6.QtCore import QEvent, QObject, QTimer, Qt, Signal
 from PySide6.QtGui import QFont, QKeySequence, QShortcut
 from PySide6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
     QFileDialog,
     QGridLayout,
     QGroupBox,
@@ -16,26 +20,29 @@ from PySide6.QtWidgets import (
     QLabel,
     QLineEdit,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QVBoxLayout,
     QWidget,
 )
 
 from .circular_progress import CircularProgressWidget
+from .export_panel import ExportPanel
+from .pomodoro_export import FORMATS, ExportCancelled, ExportFilter, available_formats
 from .pomodoro_settings import (
     load_settings,
     save_settings,
     PomodoroSettings,
 )
-from .pomodoro_sounds import PomodoroSounds
+from .pomodoro_sounds import PlaybackLatency, PomodoroSounds, _ensure_sounds
+from .pomodoro_timer import TimerEngine
 from .pomodoro_stats import (
     PomodoroRecord,
+    PomodoroStatsAggregator,
     add_record,
-    get_today_count,
-    get_week_count,
-    get_month_count,
-    export_csv,
-    export_json,
+    get_aggregator,
+    export_history,
+    set_backend,
 )
 from .settings_panel import SettingsPanel
 
@@ -45,6 +52,11 @@ class PomodoroWidget(QWidget):
 
     timer_finished = Signal()
     mode_changed = Signal(str)
+    # (поколение загрузки, агрегатор статистики, пути звуков) из фонового потока
+    _data_loaded = Signal(int, object, object)
+    # Экспорт из рабочего потока: (сделано, всего) и (записей или -1, ошибка, путь)
+    _export_progress = Signal(int, int)
+    _export_finished = Signal(int, str, str)
 
     def __init__(self, parent: QWidget | None = None):
         super().__init__(parent)
@@ -58,9 +70,8 @@ class PomodoroWidget(QWidget):
         self._long_break_seconds = self._settings.long_break_seconds
         self._tomatoes_until_long = self._settings.tomatoes_until_long_break
 
-        self._total_seconds = self._work_seconds
-        self._remaining_seconds = self._work_seconds
-        self._elapsed_in_interval = 0.0
+        self._engine = TimerEngine()
+        self._engine.reset(self._work_seconds)
         self._is_work_mode = True
         self._is_long_break = False
         self._is_running = False
@@ -69,16 +80,71 @@ class PomodoroWidget(QWidget):
         self._pomodoro_in_session = 0
         self._current_task = ""
         self._interval_started_at: datetime | None = None
-
-        self._timer_sec = QTimer(self)
-        self._timer_sec.timeout.connect(self._tick_sec)
-        self._timer_smooth = QTimer(self)
-        self._timer_smooth.timeout.connect(self._tick_smooth)
+        self._style_state: str | None = None
+        set_backend(self._settings.history_backend)
+        # История, дневные итоги и звуки читаются в фоне: виджет показывается сразу
+        self._period_stats: PomodoroStatsAggregator | None = None
+        self._period_counts: tuple[int, int, int] | None = None
+        self._data_generation = 0
+        self._data_loaded.connect(self._on_data_loaded)
+        self._export_cancel: threading.Event | None = None
+        self._export_progress_dialog: QProgressDialog | None = None
+        self._export_progress.connect(self._on_export_progress)
+        self._export_finished.connect(self._on_export_finished)
+
+        # Один тик: на экране — на границе каждой секунды, в фоне — только
+        # к концу интервала (звук и запись в историю), без обновления интерфейса
+        self._watched_window: QWidget | None = None
+        self._tick_timer = QTimer(self)
+        self._tick_timer.setSingleShot(True)
+        self._tick_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._tick_timer.timeout.connect(self._on_tick)
 
         self._setup_ui()
         self._setup_hotkeys()
         self._update_display()
         self._apply_state_style()
+        self._start_data_loading()
+
+    def _start_data_loading(self) -> None:
+        """Запускает фоновую загрузку статистики и звуков (после смены настроек — заново)."""
+        self._data_generation += 1
+        threading.Thread(
+            target=self._load_data,
+            args=(self._data_generation,),
+            name="pomodoro-data",
+            daemon=True,
+        ).start()
+
+    def _load_data(self, generation: int) -> None:
+        """Фоновый поток: ничего не трогает в интерфейсе, результат — через сигнал."""
+        try:
+            paths = _ensure_sounds()
+        except OSError:
+            paths = None
+        try:
+            aggregator = get_aggregator()
+        except Exception:
+            # Хранилище не открылось (диск, повреждённая база): статистика недоступна
+            aggregator = None
+        try:
+            self._data_loaded.emit(generation, aggregator, paths)
+        except RuntimeError:
+            # Виджет уже удалён, пока шла загрузка
+            pass
+
+    def _on_data_loaded(self, generation: int, aggregator, paths) -> None:
+        if paths is not None:
+            self._sounds.set_paths(paths)
+            # Прогрев эффектов — отдельным оборотом цикла, после показа модуля
+            QTimer.singleShot(0, self._sounds.warm_up)
+        if generation != self._data_generation:
+            return
+        self._period_stats = aggregator
+        self._period_counts = None
+        if aggregator is None:
+            self._period_stats_label.setText("Статистика недоступна")
+        self._update_display()
 
     def _setup_ui(self) -> None:
         layout = QVBoxLayout(self)
@@ -167,7 +233,7 @@ class PomodoroWidget(QWidget):
         extra.addWidget(self._btn_settings)
 
         self._btn_export = QPushButton("📤 Экспорт")
-        self._btn_export.setToolTip("Экспорт статистики в CSV или JSON")
+        self._btn_export.setToolTip("Экспорт статистики: CSV, JSON, сжатый JSON Lines, Arrow/Parquet (период, режимы)")
         self._btn_export.clicked.connect(self._on_export)
         extra.addWidget(self._btn_export)
 
@@ -180,7 +246,7 @@ class PomodoroWidget(QWidget):
         self._stats_label.setToolTip("Помидоров завершено в текущей сессии (до длинного перерыва)")
         layout.addWidget(self._stats_label)
 
-        self._period_stats_label = QLabel("Сегодня: 0 | Неделя: 0 | Месяц: 0")
+        self._period_stats_label = QLabel("Сегодня: … | Неделя: … | Месяц: …")
         self._period_stats_label.setObjectName("periodStatsLabel")
         self._period_stats_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self._period_stats_label.setToolTip("Статистика за период")
@@ -192,7 +258,12 @@ class PomodoroWidget(QWidget):
     def _get_base_styles(self) -> str:
         return """
             #pomodoroWidget { border-radius: 12px; border: 1px solid #404040; }
-            #modeLabel { }
+            #pomodoroWidget[state="work"] { background-color: #1b3d1f; border-color: #2e7d32; }
+            #pomodoroWidget[state="break"] { background-color: #0d2137; border-color: #1565c0; }
+            #pomodoroWidget[state="paused"] { background-color: #3d3d00; border-color: #ffc107; }
+            #modeLabel[state="work"] { color: #81c784; }
+            #modeLabel[state="break"] { color: #64b5f6; }
+            #modeLabel[state="paused"] { color: #ffc107; }
             #timeLabel { color: #ffffff; letter-spacing: 2px; }
             #btnStart { background-color: #2e7d32; color: white; border: none; border-radius: 8px; padding: 10px 16px; font-weight: bold; }
             #btnStart:hover { background-color: #388e3c; }
@@ -212,31 +283,27 @@ class PomodoroWidget(QWidget):
         """
 
     def _set_styles(self) -> None:
+        self.setStyleSheet(self._base_styles)
         self._apply_state_style()
 
     def _apply_state_style(self) -> None:
         if self._is_paused:
-            self._mode_label.setText("ПАУЗА")
-            style = (
-                "#pomodoroWidget { background-color: #3d3d00; border-color: #ffc107; }\n"
-                "#modeLabel { color: #ffc107; }"
-            )
+            state = "paused"
+            text = "ПАУЗА"
         elif self._is_work_mode:
-            self._mode_label.setText("РЕЖИМ РАБОТЫ")
-            style = (
-                "#pomodoroWidget { background-color: #1b3d1f; border-color: #2e7d32; }\n"
-                "#modeLabel { color: #81c784; }"
-            )
+            state = "work"
+            text = "РЕЖИМ РАБОТЫ"
         else:
-            if self._is_long_break:
-                self._mode_label.setText("ДЛИННЫЙ ПЕРЕРЫВ")
-            else:
-                self._mode_label.setText("РЕЖИМ ОТДЫХА")
-            style = (
-                "#pomodoroWidget { background-color: #0d2137; border-color: #1565c0; }\n"
-                "#modeLabel { color: #64b5f6; }"
-            )
-        self.setStyleSheet(self._base_styles + style)
+            state = "break"
+            text = "ДЛИННЫЙ ПЕРЕРЫВ" if self._is_long_break else "РЕЖИМ ОТДЫХА"
+        self._mode_label.setText(text)
+        if state != self._style_state:
+            # Таблица стилей задана один раз; перепроверяются только два виджета
+            self._style_state = state
+            for w in (self, self._mode_label):
+                w.setProperty("state", state)
+                w.style().unpolish(w)
+                w.style().polish(w)
         self._circle.set_work_mode(self._is_work_mode)
         self._circle.set_paused(self._is_paused)
 
@@ -252,41 +319,91 @@ class PomodoroWidget(QWidget):
             self._on_start()
 
     def _update_display(self) -> None:
-        m = self._remaining_seconds // 60
-        s = self._remaining_seconds % 60
+        remaining = self._engine.remaining_display()
+        m = remaining // 60
+        s = remaining % 60
         self._time_label.setText(f"{m:02d}:{s:02d}")
         self._stats_label.setText(f"Завершено в сессии: {self._pomodoro_in_session} (всего: {self._pomodoro_count})")
-        self._period_stats_label.setText(
-            f"Сегодня: {get_today_count()} | Неделя: {get_week_count()} | Месяц: {get_month_count()}"
-        )
-        total = self._total_seconds
-        elapsed = total - self._remaining_seconds + self._elapsed_in_interval
-        self._circle.set_progress(total, elapsed)
+        counts = self._period_stats.counts() if self._period_stats is not None else None
+        if counts is not None and counts != self._period_counts:
+            self._period_counts = counts
+            today, week, month = counts
+            self._period_stats_label.setText(f"Сегодня: {today} | Неделя: {week} | Месяц: {month}")
+        self._circle.set_progress(self._engine.total_seconds, self._engine.elapsed())
+
+    def _is_on_screen(self) -> bool:
+        """Виджет показан в стеке и окно не свёрнуто."""
+        return self.isVisible() and not self.window().isMinimized()
+
+    def _schedule_tick(self) -> None:
+        if not self._engine.is_running:
+            self._tick_timer.stop()
+            return
+        if self._is_on_screen():
+            self._tick_timer.start(self._engine.ms_until_next_second())
+        else:
+            self._tick_timer.start(math.ceil(self._engine.remaining() * 1000))
+
+    def _start_ticking(self) -> None:
+        self._engine.start()
+        self._schedule_tick()
+
+    def _stop_ticking(self) -> None:
+        self._engine.pause()
+        self._tick_timer.stop()
 
-    def _tick_sec(self) -> None:
-        self._remaining_seconds -= 1
-        if self._remaining_seconds <= 0:
+    def _on_tick(self) -> None:
+        if self._engine.is_finished():
             self._finish_interval()
             return
-        self._update_display()
+        if self._is_on_screen():
+            self._update_display()
+        self._schedule_tick()
 
-    def _tick_smooth(self) -> None:
-        self._elapsed_in_interval += 0.1
-        self._update_display()
+    def _on_visibility_changed(self) -> None:
+        """Переход между экраном и фоном: догоняем отображение и перевзводим тик."""
+        if self._engine.is_running and self._engine.is_finished():
+            self._finish_interval()
+            return
+        if self._is_on_screen():
+            self._update_display()
+        self._schedule_tick()
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        window = self.window()
+        if window is not self and window is not self._watched_window:
+            if self._watched_window is not None:
+                self._watched_window.removeEventFilter(self)
+            window.installEventFilter(self)
+            self._watched_window = window
+        self._on_visibility_changed()
+
+    def hideEvent(self, event) -> None:
+        super().hideEvent(event)
+        self._on_visibility_changed()
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if watched is self._watched_window and event.type() == QEvent.Type.WindowStateChange:
+            self._on_visibility_changed()
+        return super().eventFilter(watched, event)
 
     def _finish_interval(self) -> None:
-        self._timer_sec.stop()
-        self._timer_smooth.stop()
+        # Момент события для звука — дедлайн интервала, а не момент срабатывания тика
+        event_at = self._engine.deadline
+        self._stop_ticking()
         self._is_running = False
         self._btn_start.setEnabled(True)
         self._btn_pause.setEnabled(False)
 
         finished_at = datetime.now().isoformat()
         started_at = self._interval_started_at.isoformat() if self._interval_started_at else finished_at
-        duration = self._total_seconds
+        duration = self._engine.total_seconds
         task_name = self._task_edit.text().strip() or ""
 
         if self._is_work_mode:
+            # Звук — до записи в историю (запись ждёт fsync)
+            self._sounds.play_end_work(event_at)
             self._pomodoro_count += 1
             self._pomodoro_in_session += 1
             add_record(PomodoroRecord(
@@ -296,10 +413,10 @@ class PomodoroWidget(QWidget):
                 mode="work",
                 task_name=task_name,
             ))
-            self._sounds.play_end_work()
             self.timer_finished.emit()
             self._switch_to_break()
         else:
+            self._sounds.play_end_break(event_at)
             add_record(PomodoroRecord(
                 started_at=started_at,
                 finished_at=finished_at,
@@ -307,7 +424,6 @@ class PomodoroWidget(QWidget):
                 mode="long_break" if self._is_long_break else "short_break",
                 task_name="",
             ))
-            self._sounds.play_end_break()
             if self._is_long_break:
                 self._pomodoro_in_session = 0
             self._switch_to_work()
@@ -321,21 +437,18 @@ class PomodoroWidget(QWidget):
     def _switch_to_break(self) -> None:
         if self._pomodoro_in_session >= self._tomatoes_until_long:
             self._is_long_break = True
-            self._total_seconds = self._long_break_seconds
+            self._engine.reset(self._long_break_seconds)
             self._sounds.play_start_break()
         else:
             self._is_long_break = False
-            self._total_seconds = self._short_break_seconds
+            self._engine.reset(self._short_break_seconds)
             self._sounds.play_start_break()
         self._is_work_mode = False
-        self._remaining_seconds = self._total_seconds
-        self._elapsed_in_interval = 0.0
         self._interval_started_at = datetime.now()
         self._update_display()
         self._apply_state_style()
         self.mode_changed.emit("break")
-        self._timer_sec.start(1000)
-        self._timer_smooth.start(100)
+        self._start_ticking()
         self._is_running = True
         self._btn_start.setEnabled(False)
         self._btn_pause.setEnabled(True)
@@ -343,18 +456,17 @@ class PomodoroWidget(QWidget):
     def _switch_to_work(self) -> None:
         self._is_work_mode = True
         self._is_long_break = False
-        self._total_seconds = self._work_seconds
-        self._remaining_seconds = self._work_seconds
-        self._elapsed_in_interval = 0.0
+        self._engine.reset(self._work_seconds)
         self._interval_started_at = None
         self._update_display()
         self._apply_state_style()
         self.mode_changed.emit("work")
 
     def _on_start(self) -> None:
+        # После паузы интервал продолжается и сохраняет исходное время начала
+        if not self._is_paused or self._interval_started_at is None:
+            self._interval_started_at = datetime.now()
         self._is_paused = False
-        self._interval_started_at = datetime.now()
-        self._elapsed_in_interval = 0.0
         if self._is_work_mode:
             self._sounds.play_start_work()
         else:
@@ -362,25 +474,24 @@ class PomodoroWidget(QWidget):
         self._is_running = True
         self._btn_start.setEnabled(False)
         self._btn_pause.setEnabled(True)
-        self._timer_sec.start(1000)
-        self._timer_smooth.start(100)
+        self._start_ticking()
+        self._apply_state_style()
 
     def _on_pause(self) -> None:
         self._is_running = False
         self._is_paused = True
-        self._timer_sec.stop()
-        self._timer_smooth.stop()
+        self._stop_ticking()
         self._btn_start.setEnabled(True)
         self._btn_pause.setEnabled(False)
+        self._update_display()
         self._apply_state_style()
 
     def _on_reset(self) -> None:
-        self._timer_sec.stop()
-        self._timer_smooth.stop()
+        self._stop_ticking()
         self._is_running = False
         self._is_paused = False
-        self._remaining_seconds = self._total_seconds
-        self._elapsed_in_interval = 0.0
+        self._engine.reset(self._engine.total_seconds)
+        self._interval_started_at = None
         self._btn_start.setEnabled(True)
         self._btn_pause.setEnabled(False)
         self._update_display()
@@ -389,8 +500,7 @@ class PomodoroWidget(QWidget):
     def _on_skip(self) -> None:
         was_running = self._is_running
         if self._is_running:
-            self._timer_sec.stop()
-            self._timer_smooth.stop()
+            self._stop_ticking()
             self._is_running = False
             self._btn_start.setEnabled(True)
             self._btn_pause.setEnabled(False)
@@ -403,22 +513,19 @@ class PomodoroWidget(QWidget):
         if was_running:
             self._btn_start.setEnabled(False)
             self._btn_pause.setEnabled(True)
-            self._timer_sec.start(1000)
-            self._timer_smooth.start(100)
+            self._start_ticking()
             self._is_running = True
 
     def _on_switch_break(self) -> None:
         was_running = self._is_running
         if self._is_running:
-            self._timer_sec.stop()
-            self._timer_smooth.stop()
+            self._stop_ticking()
             self._is_running = False
             self._btn_start.setEnabled(True)
             self._btn_pause.setEnabled(False)
         self._switch_to_break()
         if was_running:
-            self._timer_sec.start(1000)
-            self._timer_smooth.start(100)
+            self._start_ticking()
             self._is_running = True
             self._btn_start.setEnabled(False)
             self._btn_pause.setEnabled(True)
@@ -440,12 +547,16 @@ class PomodoroWidget(QWidget):
             self._tomatoes_until_long = self._settings.tomatoes_until_long_break
             self._sounds.set_enabled(self._settings.sound_enabled)
             self._sounds.set_volume(self._settings.sound_volume)
+            self._sounds.warm_up()
+            set_backend(self._settings.history_backend)
+            self._period_stats = None
+            self._period_counts = None
+            self._start_data_loading()
             if not self._is_running:
-                self._total_seconds = self._work_seconds if self._is_work_mode else (
+                self._engine.reset(self._work_seconds if self._is_work_mode else (
                     self._long_break_seconds if self._is_long_break else self._short_break_seconds
-                )
-                self._remaining_seconds = self._total_seconds
-                self._update_display()
+                ))
+            self._update_display()
             dialog.close()
         ok_btn.clicked.connect(apply_and_close)
         layout.addWidget(ok_btn)
@@ -453,26 +564,94 @@ class PomodoroWidget(QWidget):
         dialog.show()
 
     def _on_export(self) -> None:
-        path, _ = QFileDialog.getSaveFileName(
+        if self._export_cancel is not None:
+            return  # экспорт уже идёт
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Экспорт статистики")
+        layout = QVBoxLayout(dialog)
+        panel = ExportPanel()
+        layout.addWidget(panel)
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        flt = panel.get_filter()
+
+        # Форматы с необязательными зависимостями (zstd, Arrow, Parquet) — только если те установлены
+        filters = {
+            f"{FORMATS[fmt][2]} (*{FORMATS[fmt][1]})": fmt for fmt in available_formats()
+        }
+        path, selected = QFileDialog.getSaveFileName(
             self,
             "Экспорт статистики",
             "",
-            "CSV (*.csv);;JSON (*.json);;Все файлы (*)",
+            ";;".join(filters),
         )
         if not path:
             return
-        p = Path(path)
-        if p.suffix.lower() == ".json":
-            ok = export_json(p)
-        else:
-            ok = export_csv(p)
-        if ok:
-            QMessageBox.information(self, "Экспорт", f"Сохранено: {path}")
-        else:
-            QMessageBox.warning(self, "Ошибка", "Не удалось сохранить файл.")
+        fmt = filters.get(selected, "csv")
+        if not path.lower().endswith(FORMATS[fmt][1]):
+            path += FORMATS[fmt][1]
+
+        # Запись идёт в рабочем потоке; прогресс и итог — через сигналы
+        self._export_cancel = threading.Event()
+        self._export_progress_dialog = QProgressDialog("Экспорт истории…", "Отмена", 0, 0, self)
+        self._export_progress_dialog.setWindowTitle("Экспорт")
+        self._export_progress_dialog.setMinimumDuration(300)
+        self._export_progress_dialog.canceled.connect(self._export_cancel.set)
+        self._btn_export.setEnabled(False)
+        threading.Thread(
+            target=self._run_export,
+            args=(Path(path), fmt, flt, self._export_cancel),
+            name="pomodoro-export",
+            daemon=True,
+        ).start()
+
+    def _run_export(self, path: Path, fmt: str, flt: ExportFilter, cancel: threading.Event) -> None:
+        """Рабочий поток экспорта: интерфейс не трогает."""
+        try:
+            count = export_history(
+                path, fmt, flt=flt, progress=self._export_progress.emit, cancel=cancel
+            )
+            result = (count, "")
+        except ExportCancelled:
+            result = (-1, "")
+        except Exception as e:
+            result = (-1, str(e) or e.__class__.__name__)
+        try:
+            self._export_finished.emit(result[0], result[1], str(path))
+        except RuntimeError:
+            pass
+
+    def _on_export_progress(self, done: int, total: int) -> None:
+        dialog = self._export_progress_dialog
+        if dialog is not None and not dialog.wasCanceled():
+            dialog.setMaximum(total)
+            dialog.setValue(done)
+
+    def _on_export_finished(self, count: int, error: str, path: str) -> None:
+        if self._export_progress_dialog is not None:
+            self._export_progress_dialog.canceled.disconnect()
+            self._export_progress_dialog.close()
+            self._export_progress_dialog.deleteLater()
+            self._export_progress_dialog = None
+        self._export_cancel = None
+        self._btn_export.setEnabled(True)
+        if error:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось сохранить файл.\n{error}")
+        elif count >= 0:
+            QMessageBox.information(self, "Экспорт", f"Сохранено записей: {count}\n{path}")
 
     def get_pomodoro_count(self) -> int:
         return self._pomodoro_count
 
+    def get_sound_latency(self) -> dict[str, PlaybackLatency]:
+        """Задержка от конца интервала (или нажатия) до начала звука, по событиям."""
+        return self._sounds.latency_stats()
+
     def get_remaining_seconds(self) -> int:
-        return self._remaining_seconds
+        return self._engine.remaining_display()
@@ -16,12 +16,18 @@ from PySide6.QtWidgets import (
 )
 
 from .pomodoro_settings import (
+    HISTORY_BACKENDS,
     WORK_OPTIONS,
     SHORT_BREAK_OPTIONS,
     LONG_BREAK_OPTIONS,
     PomodoroSettings,
 )
 
+_BACKEND_LABELS = {
+    "journal": "Журнал (JSON Lines)",
+    "sqlite": "SQLite (быстрые выборки по периодам)",
+}
+
 
 def _format_min(sec: int) -> str:
     return f"{sec // 60} мин"
@@ -81,6 +87,16 @@ class SettingsPanel(QWidget):
         sound_layout.addLayout(vol_layout)
         layout.addWidget(sound_group)
 
+        # Хранилище истории
+        storage_group = QGroupBox("История")
+        storage_form = QFormLayout(storage_group)
+        self._backend_combo = QComboBox()
+        for key in HISTORY_BACKENDS:
+            self._backend_combo.addItem(_BACKEND_LABELS[key], key)
+        self._backend_combo.setToolTip("При переключении записи, сделанные в другом хранилище, переносятся автоматически")
+        storage_form.addRow("Хранилище:", self._backend_combo)
+        layout.addWidget(storage_group)
+
         layout.addStretch()
 
     def get_settings(self) -> PomodoroSettings:
@@ -91,6 +107,7 @@ class SettingsPanel(QWidget):
             tomatoes_until_long_break=self._tomatoes_combo.currentData(),
             sound_enabled=self._sound_check.isChecked(),
             sound_volume=self._volume_slider.value() / 100.0,
+            history_backend=self._backend_combo.currentData(),
         )
         s.validate()
         return s
@@ -113,3 +130,5 @@ class SettingsPanel(QWidget):
         self._tomatoes_combo.setCurrentIndex(idx)
         self._sound_check.setChecked(settings.sound_enabled)
         self._volume_slider.setValue(int(settings.sound_volume * 100))
+        idx = self._backend_combo.findData(settings.history_backend)
+        self._backend_combo.setCurrentIndex(max(0, idx))
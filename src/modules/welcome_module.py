@@ -6,6 +6,16 @@
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QLabel, QWidget
 
+# Метаданные модуля (единственный источник): панель навигации читает их без импорта
+# модуля, ModuleManager передаёт их экземпляру через apply_manifest()
+MANIFEST = {
+    "module_id": "welcome",
+    "name": "Приветствие",
+    "short_name": "Привет",
+    "icon": "👋",
+    "version": "0.1.0",
+}
+
 # Импорт при динамической загрузке: проект должен быть запущен из корня (см. main.py)
 try:
     from src.core.base_module import BaseModule
@@ -18,21 +28,10 @@ class WelcomeModule(BaseModule):
 
     def __init__(self):
         super().__init__()
-        self._module_id = "welcome"
-        self._version = "0.1.0"
         self._author = "Personal Dashboard"
         self._description = "Приветственный блок дашборда"
         self._widget: QWidget | None = None
 
-    def get_name(self) -> str:
-        return "Приветствие"
-
-    def get_icon(self) -> str:
-        return "👋"
-
-    def get_short_name(self) -> str:
-        return "Привет"
-
     def get_widget(self) -> QWidget:
         if self._widget is None:
             self._widget = QLabel("Добро пожаловать в Personal Dashboard!")
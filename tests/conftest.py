@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Тесты импортируют пакет src из корня проекта (как benchmarks/)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def stats_dir(tmp_path, monkeypatch):
+    """Модульное состояние pomodoro_stats с папкой данных tmp_path."""
+    from src.modules.pomodoro import pomodoro_stats
+
+    monkeypatch.setattr(pomodoro_stats, "_data_dir", lambda: tmp_path)
+    monkeypatch.setattr(pomodoro_stats, "_backend", "journal")
+    monkeypatch.setattr(pomodoro_stats, "_store", None)
+    monkeypatch.setattr(pomodoro_stats, "_rollup", None)
+    monkeypatch.setattr(pomodoro_stats, "_aggregator", None)
+    yield tmp_path
+    pomodoro_stats.flush_records()
+    if pomodoro_stats._store is not None:
+        pomodoro_stats._store.close()
@@ -0,0 +1,26 @@
+"""Атомарная запись файлов: при ошибке прежнее содержимое и никаких временных файлов."""
+
+import pytest
+
+from src.core.app_files import atomic_file, write_bytes_atomic, write_lines_atomic, write_text_atomic
+
+
+def test_writes_replace_content(tmp_path):
+    path = tmp_path / "nested" / "state.json"
+    write_text_atomic(path, "первый\n")
+    write_lines_atomic(path, ["a\n", "б\n"])
+    assert path.read_bytes() == "a\nб\n".encode("utf-8")
+    write_bytes_atomic(path, b"\x00\x01")
+    assert path.read_bytes() == b"\x00\x01"
+    assert [p.name for p in path.parent.iterdir()] == ["state.json"]
+
+
+def test_error_keeps_previous_file(tmp_path):
+    path = tmp_path / "settings.json"
+    write_text_atomic(path, "прежнее")
+    with pytest.raises(RuntimeError):
+        with atomic_file(path) as f:
+            f.write("недописанное")
+            raise RuntimeError("сбой")
+    assert path.read_text(encoding="utf-8") == "прежнее"
+    assert [p.name for p in tmp_path.iterdir()] == ["settings.json"]
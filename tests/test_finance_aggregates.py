@@ -0,0 +1,77 @@
+"""LedgerAggregates: итоги против прямого подсчёта и память при далёких датах."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.modules.finance.finance_aggregates import CHUNK_DAYS, FenwickTree, LedgerAggregates
+from src.modules.finance.finance_ledger import MAX_DATE, MIN_DATE, Ledger, Transaction, to_epoch_day
+
+
+def test_fenwick_prefix():
+    values = [5, -3, 0, 7, 2, -8, 1]
+    tree = FenwickTree(values)
+    tree.add(3, 10)
+    values[3] += 10
+    assert [tree.prefix(i) for i in range(len(values) + 2)] == [
+        sum(values[:i]) for i in range(len(values) + 2)
+    ]
+
+
+def test_totals_match_brute_force():
+    rnd = random.Random(7)
+    rows = [
+        (18_000 + rnd.randrange(2_000), rnd.randrange(-50_000, 50_000), rnd.randrange(3), rnd.randrange(5))
+        for _ in range(3_000)
+    ]
+    bulk, single = LedgerAggregates(), LedgerAggregates()
+    bulk.extend(*(list(column) for column in zip(*rows[:2_000])))
+    for row in rows[:2_000]:
+        single.add(*row)
+    for row in rows[2_000:]:
+        bulk.add(*row)
+        single.add(*row)
+    for day in (17_000, 18_000, 18_777, 19_000 + CHUNK_DAYS // 2, 25_000):
+        expected = {}
+        for d, amount, account, _ in rows:
+            if d < day:
+                expected[account] = expected.get(account, 0) + amount
+        assert {k: v for k, v in bulk.account_balances(day).items() if v} == expected
+        assert bulk.account_balances(day) == single.account_balances(day)
+    start, end = 18_300, 19_100
+    expenses = {}
+    for d, amount, _, category in rows:
+        if start <= d < end and amount < 0:
+            expenses[category] = expenses.get(category, 0) + amount
+    assert {k: v for k, v in bulk.category_totals(start, end, -1).items() if v} == expenses
+
+
+def test_outlier_date_does_not_grow_every_series():
+    ledger = Ledger()
+    day0 = date(2024, 1, 1)
+    for i in range(61):
+        ledger.add(day0 + timedelta(days=i), -100, f"Счёт {i % 3}", f"Категория {i % 10}")
+    before = ledger._aggregates.memory_bytes()
+    ledger.add(MIN_DATE, -1, "Счёт 0", "Категория 0")
+    ledger.add(MAX_DATE, -1, "Счёт 1", "Категория 1")
+    # Далёкая дата — по одному куску счёту и категории, а не всем рядам
+    assert ledger._aggregates.memory_bytes() - before <= 4 * 8 * CHUNK_DAYS
+    assert ledger.balance(until=date(2000, 1, 1)) == -1
+    assert ledger.balance() == -61 * 100 - 2
+
+
+def test_dates_outside_window_rejected():
+    ledger = Ledger()
+    with pytest.raises(ValueError):
+        ledger.add(date(1, 1, 1), 100, "Карта", "Прочее")
+    with pytest.raises(ValueError):
+        ledger.extend_epoch_days([(to_epoch_day(date(2024, 1, 1)), 5, "Карта", "Прочее", ""),
+                                  (to_epoch_day(date(9999, 1, 1)), 7, "Карта", "Прочее", "")])
+    # Строка до ошибочной сохранена и учтена в итогах
+    assert len(ledger) == 1
+    assert ledger.balance() == 5
+    index = ledger.add(date(2024, 1, 2), 1, "Карта", "Прочее")
+    with pytest.raises(ValueError):
+        ledger.update(index, Transaction(date(1800, 1, 1), 1, "Карта", "Прочее"))
+    assert ledger.balance() == 6
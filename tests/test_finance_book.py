@@ -0,0 +1,142 @@
+"""
+FinanceBook: изменение и удаление операций — итоги в памяти, блоки журнала
+и их воспроизведение после повторного открытия.
+"""
+
+import threading
+from datetime import date
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from src.modules.finance import finance_journal
+from src.modules.finance.finance_journal import FinanceBook
+from src.modules.finance.finance_ledger import Transaction
+
+PASSWORD = "test password"
+
+
+@pytest.fixture(autouse=True)
+def fast_scrypt(monkeypatch):
+    # Параметры scrypt пишутся в заголовок файла: для тестов — быстрый вывод ключа
+    monkeypatch.setattr(finance_journal, "SCRYPT_LOG2_N", 10)
+
+
+def _state(book: FinanceBook):
+    ledger = book.ledger
+    return (
+        ledger.live_count(),
+        ledger.account_balances(),
+        ledger.category_totals(),
+        ledger.category_totals(date(2024, 1, 1), date(2024, 1, 6), sign=-1),
+        ledger.balance(until=date(2024, 1, 5)),
+    )
+
+
+@pytest.fixture
+def book(tmp_path):
+    book = FinanceBook(tmp_path)
+    book.open(PASSWORD)
+    book.add_many(
+        Transaction(date(2024, 1, day), -100 * day, "Карта", "Кафе" if day % 2 else "Продукты", f"#{day}")
+        for day in range(1, 11)
+    )
+    book.add(Transaction(date(2024, 2, 1), 50_000, "Карта", "Зарплата"))
+    yield book
+    book.close()
+
+
+def _reopen(book: FinanceBook, folder) -> FinanceBook:
+    book.close()
+    reopened = FinanceBook(folder)
+    reopened.open(PASSWORD)
+    return reopened
+
+
+def test_update_moves_totals(book):
+    book.update(2, Transaction(date(2024, 1, 3), -1_000, "Наличные", "Продукты", "правка"))
+    ledger = book.ledger
+    assert ledger.account_balances() == {"Карта": -5_500 + 300 + 50_000, "Наличные": -1_000}
+    assert ledger.category_totals() == {"Кафе": -2_500 + 300, "Продукты": -3_000 - 1_000, "Зарплата": 50_000}
+    assert ledger.balance(until=date(2024, 1, 4)) == -100 - 200 - 1_000
+
+
+def test_delete_removes_from_totals(book):
+    book.delete(0)
+    book.delete(-1)
+    ledger = book.ledger
+    assert ledger.live_count() == 10 - 1
+    assert len(ledger) == 11
+    assert ledger.balance() == -5_500 + 100
+    assert "Зарплата" not in ledger.category_totals()
+    with pytest.raises(KeyError):
+        book.update(0, Transaction(date(2024, 1, 1), -1, "Карта", "Кафе"))
+
+
+def test_edits_survive_reopen(book, tmp_path):
+    book.update(4, Transaction(date(2024, 1, 20), 777, "Вклад", "Проценты"))
+    book.delete(1)
+    expected = _state(book)
+    reopened = _reopen(book, tmp_path)
+    assert _state(reopened) == expected
+    assert reopened.journal.edit_blocks == 2
+    reopened.close()
+
+
+def test_compact_keeps_numbers(book, tmp_path):
+    book.delete(3)
+    book.compact()
+    # После сворачивания номера прежние: правка по старому номеру
+    book.update(5, Transaction(date(2024, 1, 6), -1, "Карта", "Кафе"))
+    expected = _state(book)
+    reopened = _reopen(book, tmp_path)
+    assert _state(reopened) == expected
+    assert reopened.ledger.is_deleted(3)
+    reopened.close()
+
+
+def test_open_compacts_many_edits(book, tmp_path, monkeypatch):
+    monkeypatch.setattr(finance_journal, "COMPACT_AFTER_EDITS", 3)
+    for index in (0, 2, 4):
+        book.delete(index)
+    expected = _state(book)
+    reopened = _reopen(book, tmp_path)
+    # Удалённые операции выброшены, итоги те же
+    assert len(reopened.ledger) == 8
+    assert not reopened.ledger.deleted
+    assert reopened.journal.edit_blocks == 0
+    assert _state(reopened) == expected
+    reopened.close()
+
+
+def test_concurrent_add_and_compact(book, tmp_path):
+    def writer():
+        for _ in range(200):
+            book.add(Transaction(date(2024, 3, 1), -1, "Карта", "Продукты"))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    for _ in range(20):
+        book.compact()
+    thread.join()
+    expected = _state(book)
+    reopened = _reopen(book, tmp_path)
+    assert _state(reopened) == expected
+    assert reopened.ledger.live_count() == 211
+    reopened.close()
+
+
+def test_open_compacts_single_row_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(finance_journal, "COMPACT_MIN_BLOCKS", 16)
+    book = FinanceBook(tmp_path)
+    book.open(PASSWORD)
+    for day in range(1, 29):
+        book.add(Transaction(date(2024, 2, day), -day, "Карта", "Кафе"))
+    assert book.journal.block_count == 28
+    expected = _state(book)
+    reopened = _reopen(book, tmp_path)
+    # Одиночные добавления свёрнуты в крупные блоки; номера и итоги прежние
+    assert reopened.journal.block_count == 1
+    assert _state(reopened) == expected
+    reopened.close()
@@ -0,0 +1,122 @@
+"""Ledger: итоги после изменения и удаления операций против прямого подсчёта."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.modules.finance.finance_aggregates import CHUNK_DAYS
+from src.modules.finance.finance_ledger import Ledger, Transaction
+
+ACCOUNTS = ("Карта", "Наличные", "Вклад")
+CATEGORIES = ("Продукты", "Зарплата", "Транспорт", "Кафе", "Прочее")
+DAY0 = date(2023, 6, 1)
+
+
+def _random_tx(rnd: random.Random) -> Transaction:
+    # Даты на два с лишним куска итогов: изменения переносят суммы между кусками
+    return Transaction(
+        day=DAY0 + timedelta(days=rnd.randrange(3 * CHUNK_DAYS)),
+        amount=rnd.choice((-1, 1)) * rnd.randrange(1, 100_000),
+        account=rnd.choice(ACCOUNTS),
+        category=rnd.choice(CATEGORIES),
+    )
+
+
+def _assert_totals(ledger: Ledger) -> None:
+    live = list(ledger)
+    assert len(live) == ledger.live_count()
+    for until in (None, DAY0, DAY0 + timedelta(days=CHUNK_DAYS + 3), DAY0 + timedelta(days=700)):
+        expected: dict[str, int] = {}
+        for tx in live:
+            if until is None or tx.day < until:
+                expected[tx.account] = expected.get(tx.account, 0) + tx.amount
+        balances = {k: v for k, v in ledger.account_balances(until).items() if v}
+        assert balances == {k: v for k, v in expected.items() if v}
+        assert ledger.balance(until=until) == sum(expected.values())
+        assert ledger.balance("Карта", until) == expected.get("Карта", 0)
+
+    start, end = DAY0 + timedelta(days=100), DAY0 + timedelta(days=500)
+    for sign in (-1, 0, 1):
+        expected = {}
+        for tx in live:
+            if start <= tx.day < end and (sign == 0 or (tx.amount > 0) == (sign > 0)):
+                expected[tx.category] = expected.get(tx.category, 0) + tx.amount
+        assert ledger.category_totals(start, end, sign) == {k: v for k, v in expected.items() if v}
+
+    series = ledger.balance_series(start, start + timedelta(days=40), "Наличные")
+    for i in (0, 17, 39):
+        day = start + timedelta(days=i)
+        assert series[i] == sum(tx.amount for tx in live if tx.account == "Наличные" and tx.day <= day)
+
+
+def test_totals_after_random_updates_and_deletes():
+    rnd = random.Random(11)
+    ledger = Ledger()
+    ledger.extend(_random_tx(rnd) for _ in range(400))
+    for _ in range(100):
+        ledger.add_transaction(_random_tx(rnd))
+    _assert_totals(ledger)
+
+    for step in range(600):
+        index = rnd.randrange(len(ledger))
+        if ledger.is_deleted(index):
+            continue
+        if step % 4 == 0:
+            ledger.delete(index)
+        else:
+            ledger.update(index, _random_tx(rnd))
+        if step % 50 == 0:
+            _assert_totals(ledger)
+    _assert_totals(ledger)
+
+
+def test_update_moves_amount_between_series():
+    ledger = Ledger()
+    index = ledger.add(date(2024, 1, 10), -500, "Карта", "Кафе")
+    ledger.add(date(2024, 1, 12), 10_000, "Карта", "Зарплата")
+    version = ledger.edit_version
+
+    # Расход становится доходом другой категории на другом счёте и в другом куске
+    ledger.update(index, Transaction(date(2025, 3, 1), 700, "Наличные", "Кафе", "возврат"))
+    assert ledger.edit_version == version + 1
+    assert ledger[index] == Transaction(date(2025, 3, 1), 700, "Наличные", "Кафе", "возврат")
+    assert ledger.account_balances() == {"Карта": 10_000, "Наличные": 700}
+    assert ledger.category_totals(sign=-1) == {}
+    assert ledger.category_totals(sign=1) == {"Кафе": 700, "Зарплата": 10_000}
+    assert ledger.balance(until=date(2025, 1, 1)) == 10_000
+
+
+def test_delete_keeps_row_numbers():
+    ledger = Ledger()
+    for i in range(5):
+        ledger.add(date(2024, 2, 1 + i), -(i + 1) * 100, "Карта", "Продукты", str(i))
+    ledger.delete(1)
+    ledger.delete(-1)
+
+    assert len(ledger) == 5 and ledger.live_count() == 3
+    assert [tx.description for tx in ledger] == ["0", "2", "3"]
+    assert ledger[3].description == "3"
+    assert ledger.category_totals() == {"Продукты": -(100 + 300 + 400)}
+    assert ledger.balance_series(date(2024, 2, 1), date(2024, 2, 6)) == [-100, -100, -400, -800, -800]
+
+    with pytest.raises(KeyError):
+        ledger.delete(1)
+    with pytest.raises(KeyError):
+        ledger.update(4, Transaction(date(2024, 2, 1), 1, "Карта", "Продукты"))
+    with pytest.raises(IndexError):
+        ledger.delete(5)
+    # Неудачные попытки не меняют итоги
+    assert ledger.balance() == -800
+
+
+def test_delete_everything_leaves_zero_totals():
+    rnd = random.Random(5)
+    ledger = Ledger()
+    ledger.extend(_random_tx(rnd) for _ in range(50))
+    for index in range(len(ledger)):
+        ledger.delete(index)
+    assert ledger.live_count() == 0
+    assert ledger.balance() == 0
+    assert ledger.category_totals() == {}
+    assert set(ledger.balance_series(DAY0, DAY0 + timedelta(days=30))) == {0}
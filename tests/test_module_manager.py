@@ -0,0 +1,68 @@
+"""ModuleManager: метаданные модуля берутся из MANIFEST файла-загрузчика."""
+
+from src.core.module_manager import ModuleManager
+
+LOADER = '''
+MANIFEST = {
+    "module_id": "notes",
+    "name": "📝 Заметки",
+    "short_name": "Заметки",
+    "icon": "📝",
+    "version": "1.2.0",
+}
+
+from src.core.base_module import BaseModule
+
+
+class NotesModule(BaseModule):
+    def get_widget(self):
+        return None
+
+    def on_load(self):
+        pass
+
+    def on_unload(self):
+        pass
+'''
+
+PLAIN = '''
+from src.core.base_module import BaseModule
+
+
+class PlainModule(BaseModule):
+    def __init__(self):
+        super().__init__()
+        self._module_id = "plain"
+
+    def get_widget(self):
+        return None
+
+    def on_load(self):
+        pass
+
+    def on_unload(self):
+        pass
+'''
+
+
+def test_loaded_module_uses_manifest(tmp_path):
+    (tmp_path / "notes.py").write_text(LOADER, encoding="utf-8")
+    manager = ModuleManager(tmp_path)
+
+    manifest = manager.get_manifest("notes")
+    module = manager.get_module_by_id("notes")
+    assert module is not None
+    assert module.module_id == manifest.module_id == "notes"
+    assert module.version == "1.2.0"
+    assert (module.get_name(), module.get_short_name(), module.get_icon()) == (
+        manifest.name,
+        manifest.short_name,
+        manifest.icon,
+    )
+    assert manager.unload_module("notes")
+
+
+def test_module_without_manifest_falls_back_to_id(tmp_path):
+    (tmp_path / "plain.py").write_text(PLAIN, encoding="utf-8")
+    module = ModuleManager(tmp_path).load_module("plain")
+    assert (module.get_name(), module.get_short_name(), module.get_icon()) == ("plain", "plain", "")
@@ -0,0 +1,42 @@
+"""Смена бэкенда истории Pomodoro: записи из обоих хранилищ видны в любом из них."""
+
+from src.modules.pomodoro.pomodoro_stats import open_store
+
+
+def _record(day: int) -> dict:
+    return {
+        "started_at": f"2024-01-{day:02d}T10:00:00",
+        "finished_at": f"2024-01-{day:02d}T10:25:00",
+        "duration_seconds": 1500,
+        "mode": "work",
+        "task_name": str(day),
+    }
+
+
+def _tasks(store) -> list[str]:
+    return [r["task_name"] for r in store.load()]
+
+
+def test_switching_backends_keeps_history(tmp_path):
+    journal = open_store("journal", tmp_path)
+    journal.append(_record(1))
+
+    sqlite = open_store("sqlite", tmp_path)
+    sqlite.append(_record(2))
+    sqlite.close()
+
+    journal = open_store("journal", tmp_path)
+    assert _tasks(journal) == ["1", "2"]
+    journal.append(_record(3))
+
+    sqlite = open_store("sqlite", tmp_path)
+    assert _tasks(sqlite) == ["1", "2", "3"]
+    sqlite.append(_record(4))
+    sqlite.close()
+
+    assert _tasks(open_store("journal", tmp_path)) == ["1", "2", "3", "4"]
+    # Повторные переключения без новых записей ничего не дублируют
+    sqlite = open_store("sqlite", tmp_path)
+    assert sqlite.count() == 4
+    sqlite.close()
+    assert open_store("journal", tmp_path).count() == 4
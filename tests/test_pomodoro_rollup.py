@@ -0,0 +1,135 @@
+"""DailyRollup: пересборка, сохранение и восстановление при расхождении с историей."""
+
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.modules.pomodoro import pomodoro_stats
+from src.modules.pomodoro.pomodoro_rollup import ROLLUP_NAME, DailyRollup, main
+from src.modules.pomodoro.pomodoro_storage import JournalHistoryStore
+
+
+def _record(started: datetime, mode: str = "work", task: str = "a", seconds: int = 1500) -> dict:
+    return {
+        "started_at": started.isoformat(),
+        "finished_at": (started + timedelta(seconds=seconds)).isoformat(),
+        "duration_seconds": seconds,
+        "mode": mode,
+        "task_name": task,
+    }
+
+
+def _history() -> list[dict]:
+    first = datetime(2024, 2, 27, 9, 0)
+    records = []
+    for d in range(6):
+        day = first + timedelta(days=d * 2)
+        records.append(_record(day, task=f"t{d % 2}", seconds=60 * (d + 1)))
+        records.append(_record(day + timedelta(hours=1), mode="short_break", seconds=300))
+    records.append(_record(datetime(2024, 2, 29, 23, 59), task=""))
+    records.append({"started_at": "не дата", "mode": "work", "duration_seconds": 10})
+    return records
+
+
+def test_rebuild_matches_incremental_adds(tmp_path):
+    records = _history()
+    incremental = DailyRollup(tmp_path / ROLLUP_NAME)
+    for r in records:
+        incremental.add(r)
+    rebuilt = DailyRollup(tmp_path / ROLLUP_NAME)
+    rebuilt.add(_record(datetime(2020, 1, 1)))
+    rebuilt.rebuild(records)
+
+    assert rebuilt.record_count == incremental.record_count == len(records)
+    assert rebuilt.days(date.min, date.max) == incremental.days(date.min, date.max)
+    # Запись с неразборчивым временем учтена в числе записей, но не в днях
+    counted = sum(t.work_count + t.break_count for _, t in rebuilt.days(date.min, date.max))
+    assert counted == len(records) - 1
+
+
+def test_totals_and_days_over_ranges(tmp_path):
+    rollup = DailyRollup(tmp_path / ROLLUP_NAME)
+    rollup.rebuild(_history())
+
+    leap = rollup.day(date(2024, 2, 29))
+    assert (leap.work_count, leap.break_count) == (2, 1)
+    assert leap.tasks == {"t1": 120, "": 1500}
+    assert rollup.day(date(2024, 2, 28)).work_count == 0
+
+    # Короткий диапазон (перебор дней) и длинный (перебор итогов) — одинаковые строки
+    short = rollup.days(date(2024, 2, 28), date(2024, 3, 3))
+    assert [d for d, _ in short] == [date(2024, 2, 29), date(2024, 3, 2)]
+    assert rollup.days(date(2000, 1, 1), date(2030, 1, 1)) == rollup.days(date.min, date.max)
+    assert rollup.days(date(2024, 3, 3), date(2024, 3, 1)) == []
+
+    total = rollup.totals(date(2024, 2, 27), date(2024, 3, 4))
+    assert total.work_count == rollup.work_count(date(2024, 2, 27), date(2024, 3, 4)) == 5
+    assert total.break_count == 4
+    assert total.focus_seconds == 60 + 120 + 1500 + 180 + 240
+    assert total.tasks == {"t0": 60 + 180, "t1": 120 + 240, "": 1500}
+
+
+def test_save_load_roundtrip(tmp_path):
+    rollup = DailyRollup(tmp_path / ROLLUP_NAME)
+    rollup.rebuild(_history())
+    rollup.save()
+
+    loaded = DailyRollup.load(tmp_path / ROLLUP_NAME)
+    assert loaded.record_count == rollup.record_count
+    assert loaded.days(date.min, date.max) == rollup.days(date.min, date.max)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [None, "", "{не json", json.dumps({"version": 999, "records": 3, "days": {}}), "[]"],
+)
+def test_load_unusable_file_is_empty_and_stale(tmp_path, content):
+    path = tmp_path / ROLLUP_NAME
+    if content is not None:
+        path.write_text(content, encoding="utf-8")
+    rollup = DailyRollup.load(path)
+    assert rollup.record_count == -1
+    assert rollup.days(date.min, date.max) == []
+
+
+def test_count_mismatch_triggers_rebuild(stats_dir):
+    records = _history()
+    store = JournalHistoryStore(stats_dir)
+    store.append_many(records)
+    store.close()
+    # Итоги отстали: сохранены до последних записей (например, сбой записи файла)
+    stale = DailyRollup(stats_dir / ROLLUP_NAME)
+    stale.rebuild(records[:3])
+    stale.save()
+
+    rollup = pomodoro_stats._get_rollup()
+    assert rollup.record_count == len(records)
+    expected = DailyRollup(stats_dir / ROLLUP_NAME)
+    expected.rebuild(records)
+    assert rollup.days(date.min, date.max) == expected.days(date.min, date.max)
+    # Пересобранные итоги сохранены и при следующем запуске читаются без пересборки
+    assert DailyRollup.load(stats_dir / ROLLUP_NAME).record_count == len(records)
+
+
+def test_corrupt_rollup_rebuilt_and_kept_in_sync(stats_dir):
+    store = JournalHistoryStore(stats_dir)
+    store.append_many(_history())
+    store.close()
+    (stats_dir / ROLLUP_NAME).write_text("{обрыв", encoding="utf-8")
+
+    pomodoro_stats.add_record(pomodoro_stats._to_record(_record(datetime(2024, 3, 10, 8, 0))))
+    assert pomodoro_stats.flush_records(timeout=10)
+    saved = DailyRollup.load(stats_dir / ROLLUP_NAME)
+    assert saved.record_count == len(_history()) + 1
+    assert saved.day(date(2024, 3, 10)).work_count == 1
+
+
+def test_cli_rebuilds_from_history(tmp_path, capsys):
+    store = JournalHistoryStore(tmp_path)
+    store.append_many(_history())
+    store.close()
+
+    assert main(["--data-dir", str(tmp_path)]) == 0
+    assert DailyRollup.load(tmp_path / ROLLUP_NAME).record_count == len(_history())
+    assert "Пересобрано" in capsys.readouterr().out
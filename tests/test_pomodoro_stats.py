@@ -0,0 +1,163 @@
+"""PomodoroStatsAggregator: окна «сегодня / 7 дней / 30 дней» при движении часов."""
+
+import threading
+from datetime import date, datetime, timedelta
+
+from src.modules.pomodoro import pomodoro_stats
+from src.modules.pomodoro.pomodoro_records import PomodoroRecord
+from src.modules.pomodoro.pomodoro_rollup import ROLLUP_NAME, DailyRollup
+from src.modules.pomodoro.pomodoro_stats import PomodoroStatsAggregator
+
+
+class _History:
+    """Записи в памяти, дневные итоги по ним и поддельные часы."""
+
+    def __init__(self, tmp_path, now: datetime):
+        self.now = now
+        self.records: list[dict] = []
+        self.rollup = DailyRollup(tmp_path / "rollup.json")
+
+    def clock(self) -> datetime:
+        return self.now
+
+    def day_work_starts(self, day: date) -> list[datetime]:
+        return [
+            datetime.fromisoformat(r["started_at"])
+            for r in self.records
+            if r["mode"] == "work" and datetime.fromisoformat(r["started_at"]).date() == day
+        ]
+
+    def append(self, started: datetime, mode: str = "work", aggregator=None) -> None:
+        record = {
+            "started_at": started.isoformat(),
+            "finished_at": (started + timedelta(minutes=25)).isoformat(),
+            "duration_seconds": 1500,
+            "mode": mode,
+            "task_name": "",
+        }
+        # Тот же порядок, что в add_record: агрегатор, затем хранилище и итоги
+        if aggregator is not None:
+            aggregator.add(record["started_at"], mode)
+        self.records.append(record)
+        self.rollup.add(record)
+
+    def expected(self) -> tuple[int, int, int]:
+        now = self.now
+        cutoffs = (
+            now.replace(hour=0, minute=0, second=0, microsecond=0),
+            now - timedelta(days=7),
+            now - timedelta(days=30),
+        )
+        starts = [datetime.fromisoformat(r["started_at"]) for r in self.records if r["mode"] == "work"]
+        # Записи «из будущего» (часы переведены назад) считаются до конца текущего дня
+        return tuple(
+            sum(1 for s in starts if cutoff <= s and s.date() <= now.date()) for cutoff in cutoffs
+        )
+
+
+def _seed(history: _History, days: int) -> None:
+    """По несколько записей в день за days дней до history.now, включая перерывы."""
+    first = history.now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days)
+    for d in range(days):
+        day = first + timedelta(days=d)
+        for hour in (0, 9, 13, 23):
+            history.append(day + timedelta(hours=hour, minutes=d % 60))
+        history.append(day + timedelta(hours=10), mode="short_break")
+
+
+def test_initial_counts_from_rollup_and_boundary_days(tmp_path):
+    history = _History(tmp_path, datetime(2024, 3, 15, 11, 30))
+    _seed(history, 45)
+    history.append(datetime(2024, 3, 15, 8, 0))
+
+    aggregator = PomodoroStatsAggregator(history.rollup, history.day_work_starts, history.clock)
+    assert aggregator.counts() == history.expected()
+    assert aggregator.today_count() == 1
+
+
+def test_windows_follow_clock_across_midnight_week_and_month(tmp_path):
+    # Конец января, 29 февраля високосного года и начало марта
+    history = _History(tmp_path, datetime(2024, 1, 25, 22, 0))
+    _seed(history, 40)
+    aggregator = PomodoroStatsAggregator(history.rollup, history.day_work_starts, history.clock)
+
+    step = timedelta(hours=5, minutes=17)
+    end = datetime(2024, 3, 8)
+    i = 0
+    while history.now < end:
+        history.now += step
+        if i % 3 == 0:
+            history.append(history.now - timedelta(minutes=1), aggregator=aggregator)
+        if i % 7 == 0:
+            history.append(history.now, mode="long_break", aggregator=aggregator)
+        assert aggregator.counts() == history.expected(), history.now
+        i += 1
+
+
+def test_record_from_past_day_inside_windows(tmp_path):
+    history = _History(tmp_path, datetime(2024, 2, 1, 0, 5))
+    _seed(history, 35)
+    aggregator = PomodoroStatsAggregator(history.rollup, history.day_work_starts, history.clock)
+
+    # Вчерашняя запись (через полночь), граничный день недели и вне всех окон
+    for started in (
+        datetime(2024, 1, 31, 23, 50),
+        datetime(2024, 1, 25, 0, 10),
+        datetime(2024, 1, 25, 0, 1),
+        datetime(2023, 12, 1, 12, 0),
+    ):
+        history.append(started, aggregator=aggregator)
+        assert aggregator.counts() == history.expected(), started
+
+
+def test_clock_jumps_reset_windows(tmp_path):
+    history = _History(tmp_path, datetime(2024, 5, 31, 23, 59))
+    _seed(history, 90)
+    aggregator = PomodoroStatsAggregator(history.rollup, history.day_work_starts, history.clock)
+    assert aggregator.counts() == history.expected()
+
+    # Сон дольше месяца, затем перевод часов назад
+    history.now = datetime(2024, 7, 15, 9, 0)
+    history.append(datetime(2024, 7, 15, 8, 0), aggregator=aggregator)
+    assert aggregator.counts() == history.expected()
+    history.now = datetime(2024, 5, 20, 12, 0)
+    assert aggregator.counts() == history.expected()
+    assert aggregator.month_count() > 0
+
+
+def test_add_record_does_not_wait_for_rebuild(stats_dir):
+    aggregator = pomodoro_stats.get_aggregator()
+    today = datetime.now().replace(microsecond=0)
+    before = aggregator.today_count()
+    records = [
+        PomodoroRecord(today.isoformat(), today.isoformat(), 1500, "work", "a"),
+        PomodoroRecord(today.isoformat(), today.isoformat(), 300, "short_break", ""),
+    ]
+
+    # Пока другой поток держит модульную блокировку (загрузка, пересборка итогов),
+    # add_record() возвращается сразу, а счётчики читаются без ожидания
+    release = threading.Event()
+    holding = threading.Event()
+
+    def hold_lock():
+        with pomodoro_stats._lock:
+            holding.set()
+            release.wait(10)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    holding.wait(10)
+    try:
+        for record in records:
+            pomodoro_stats.add_record(record)
+        assert aggregator.today_count() == before
+        assert not pomodoro_stats.flush_records(timeout=0.05)
+    finally:
+        release.set()
+        holder.join()
+
+    assert pomodoro_stats.flush_records(timeout=10)
+    assert pomodoro_stats.last_write_error is None
+    assert aggregator.today_count() == before + 1
+    assert pomodoro_stats._get_store().count() == 2
+    assert DailyRollup.load(stats_dir / ROLLUP_NAME).record_count == 2
@@ -0,0 +1,135 @@
+"""Индекс времени журнала Pomodoro: выборки по диапазону совпадают с полным просмотром."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.modules.pomodoro.pomodoro_records import iso_to_us
+from src.modules.pomodoro.pomodoro_storage import HistoryStore, JournalHistoryStore, _TimeIndex
+
+MODES = ("work", "short_break", "long_break")
+
+
+class _ListStore(HistoryStore):
+    """Хранилище без индекса: запросы базового класса — эталон."""
+
+    def __init__(self, records: list[dict]):
+        self._records = records
+
+    def load(self) -> list[dict]:
+        return list(self._records)
+
+    def append(self, record: dict) -> None:
+        self._records.append(record)
+
+
+def _records(n: int, seed: int = 7) -> list[dict]:
+    """Почти упорядоченные записи: часть «из прошлого», повторы времени, без mode."""
+    rnd = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    out = []
+    for i in range(n):
+        started = start + timedelta(minutes=30 * i)
+        if rnd.random() < 0.15:
+            started -= timedelta(hours=rnd.randint(1, 200))
+        elif out and rnd.random() < 0.05:
+            started = datetime.fromisoformat(out[-1]["started_at"])
+        record = {"started_at": started.isoformat(), "duration_seconds": 60, "task_name": str(i)}
+        if rnd.random() < 0.9:
+            record["mode"] = rnd.choice(MODES)
+        out.append(record)
+    return out
+
+
+def _bounds(records: list[dict]) -> list[str]:
+    times = sorted(r["started_at"] for r in records)
+    # Границы между записями и за пределами истории
+    between = [
+        (datetime.fromisoformat(times[i]) + timedelta(seconds=1)).isoformat() for i in (5, len(times) // 2)
+    ]
+    outside = ["2023-12-31T00:00:00", "2025-01-01T00:00:00"]
+    return [times[0], times[len(times) // 3], times[-1]] + outside + between
+
+
+@pytest.fixture
+def stores(tmp_path):
+    records = _records(600)
+    journal = JournalHistoryStore(tmp_path)
+    journal.append_many(records[:500])
+    for r in records[500:]:
+        journal.append(r)
+    yield journal, _ListStore(records)
+    journal.close()
+
+
+def test_time_index_positions_and_counts():
+    index = _TimeIndex()
+    times = ["2024-01-01T10:00:00", "2024-01-01T09:00:00", "2024-01-01T10:00:00", "2024-01-01T11:00:00"]
+    for position, started in enumerate(times):
+        index.add({"started_at": started, "mode": "work" if position % 2 else "short_break"}, position)
+    index.add({"started_at": "испорчено"}, 4)
+
+    us = iso_to_us
+    assert list(index.positions(None, None)) == [4, 1, 0, 2, 3]
+    assert list(index.positions(us(times[0]), None)) == [0, 2, 3]
+    assert list(index.positions(None, us(times[0]))) == [4, 1]
+    assert list(index.positions(us(times[0]), us(times[3]), "short_break")) == [0, 2]
+    assert list(index.positions(us(times[3]), us(times[0]))) == []
+    assert index.count(us(times[1]), None, "work") == 2
+    assert index.count(None, None, "long_break") == 0
+    # Запись без mode относится к работе, неразборчивое время — только без нижней границы
+    assert index.count(None, None, "work") == 3
+    assert index.count(us("1970-01-01T00:00:00"), None) == 4
+
+
+def test_range_queries_match_full_scan(stores):
+    journal, reference = stores
+    bounds = _bounds(reference.load())
+    for start in bounds:
+        assert journal.records_from(start) == reference.records_from(start)
+        for mode in (None,) + MODES:
+            assert journal.count_from(start, mode) == reference.count_from(start, mode)
+        for end in bounds:
+            for mode in (None,) + MODES:
+                expected = reference.records_between(start, end, mode)
+                assert journal.records_between(start, end, mode) == expected
+                assert journal.count_between(start, end, mode) == len(expected)
+
+
+def test_batches_match_full_scan(stores):
+    journal, reference = stores
+    bounds = _bounds(reference.load())
+    for start, end in ((None, None), (bounds[1], None), (None, bounds[1]), (bounds[0], bounds[-1])):
+        for modes in (None, {"work"}, {"short_break", "long_break"}):
+            got = [r for batch in journal.iter_batches(start, end, modes, batch_size=37) for r in batch]
+            expected = [r for batch in reference.iter_batches(start, end, modes) for r in batch]
+            assert got == expected
+            assert journal.count_matching(start, end, modes) == len(expected)
+
+
+def test_index_follows_appends_and_reopen(tmp_path):
+    records = _records(120, seed=3)
+    journal = JournalHistoryStore(tmp_path)
+    journal.append_many(records[:60])
+    cutoff = records[30]["started_at"]
+    # Индекс построен до дописывания и обновляется на месте
+    before = journal.count_from(cutoff)
+    for r in records[60:]:
+        journal.append(r)
+    reference = _ListStore(records)
+    assert journal.count_from(cutoff) == reference.count_from(cutoff) > before
+    assert journal.records_from(cutoff) == reference.records_from(cutoff)
+    journal.close()
+
+    reopened = JournalHistoryStore(tmp_path)
+    assert reopened.records_from(cutoff) == reference.records_from(cutoff)
+    assert reopened.task_totals(cutoff) == reference.task_totals(cutoff)
+
+
+def test_unparsable_bound_falls_back_to_string_compare(stores):
+    journal, reference = stores
+    for bound in ("", "2024", "2024-02"):
+        assert journal.records_from(bound) == reference.records_from(bound)
+        expected = reference.count_between(bound, "2024-03", "work")
+        assert journal.count_between(bound, "2024-03", "work") == expected
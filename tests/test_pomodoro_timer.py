@@ -0,0 +1,128 @@
+"""TimerEngine с подменёнными часами: отсчёт, пауза, сброс, окончание и задержка тика."""
+
+import pytest
+
+from src.modules.pomodoro.pomodoro_timer import TimerEngine
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def engine(clock):
+    engine = TimerEngine(clock=clock)
+    engine.reset(25 * 60)
+    return engine
+
+
+def test_reset_sets_full_interval(engine):
+    assert not engine.is_running
+    assert engine.deadline is None
+    assert engine.remaining() == 1500
+    assert engine.remaining_display() == 1500
+    assert engine.elapsed() == 0
+
+
+def test_reset_clamps_to_one_second(clock):
+    engine = TimerEngine(clock=clock)
+    engine.reset(0)
+    assert engine.total_seconds == 1
+
+
+def test_start_counts_down_from_deadline(engine, clock):
+    engine.start()
+    assert engine.is_running
+    assert engine.deadline == clock.now + 1500
+    clock.advance(0.25)
+    # 25:00 сменяется на 24:59 ровно через секунду, не раньше
+    assert engine.remaining_display() == 1500
+    clock.advance(0.75)
+    assert engine.remaining_display() == 1499
+    assert engine.elapsed() == pytest.approx(1.0)
+
+
+def test_start_twice_keeps_deadline(engine, clock):
+    engine.start()
+    deadline = engine.deadline
+    clock.advance(5)
+    engine.start()
+    assert engine.deadline == deadline
+
+
+def test_pause_freezes_and_resume_continues(engine, clock):
+    engine.start()
+    clock.advance(10.5)
+    engine.pause()
+    assert not engine.is_running
+    clock.advance(600)
+    assert engine.remaining() == pytest.approx(1489.5)
+    engine.start()
+    clock.advance(0.5)
+    assert engine.remaining() == pytest.approx(1489.0)
+    assert engine.remaining_display() == 1489
+
+
+def test_reset_while_running_stops(engine, clock):
+    engine.start()
+    clock.advance(100)
+    engine.reset(300)
+    assert not engine.is_running
+    clock.advance(50)
+    assert engine.remaining() == 300
+
+
+def test_expiry(engine, clock):
+    engine.start()
+    clock.advance(1499.999)
+    assert not engine.is_finished()
+    clock.advance(0.001)
+    assert engine.is_finished()
+    clock.advance(30)
+    # Остаток не уходит в минус, прошедшее время — не больше интервала
+    assert engine.remaining() == 0.0
+    assert engine.elapsed() == 1500
+    assert engine.ms_until_next_second() == 0
+
+
+@pytest.mark.parametrize(
+    "advance, expected_ms",
+    [
+        (0.0, 1000 + TimerEngine._WAKE_SLACK_MS),  # ровно на границе — до следующей через секунду
+        (0.25, 750 + TimerEngine._WAKE_SLACK_MS),
+        (0.999, 1 + TimerEngine._WAKE_SLACK_MS),
+    ],
+)
+def test_next_boundary_delay(engine, clock, advance, expected_ms):
+    engine.start()
+    clock.advance(advance)
+    assert engine.ms_until_next_second() == expected_ms
+
+
+def test_tick_at_delay_changes_display(engine, clock):
+    engine.start()
+    clock.advance(0.3)
+    shown = engine.remaining_display()
+    clock.advance(engine.ms_until_next_second() / 1000)
+    assert engine.remaining_display() == shown - 1
+
+
+def test_paused_delay_uses_frozen_remaining(engine, clock):
+    engine.start()
+    clock.advance(0.4)
+    engine.pause()
+    delay = engine.ms_until_next_second()
+    clock.advance(100)
+    assert engine.ms_until_next_second() == delay